@@ -0,0 +1,62 @@
+"""Compara dois resultados de ``benchmarks.run`` e aponta regressões.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Sai com código 1 quando alguma medição piora mais que ``--threshold`` por
+cento em p50, p99 ou throughput.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# (métrica, True quando maior é melhor)
+METRICS: List[Tuple[str, bool]] = [
+    ("throughput", True),
+    ("p50_ms", False),
+    ("p99_ms", False),
+]
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    candidate: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    regressions = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        for metric, higher_is_better in METRICS:
+            old, new = baseline[key][metric], candidate[key][metric]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            marker = "  REGRESSION" if worse > threshold else ""
+            print(
+                f"{key:<28} {metric:<11} {old:>10.2f} -> {new:>10.2f} ({change:+.1f}%){marker}"
+            )
+            if marker:
+                regressions.append(f"{key} {metric}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara dois benchmarks.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    candidate = json.loads(args.candidate.read_text())["results"]
+
+    regressions = compare(baseline, candidate, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""Benchmark dos caminhos quentes da Store API.
+
+Mede create, get, lookup, query (primeira página e página profunda via
+cursor), update e delete no nível do usecase e no nível HTTP (app ASGI em processo,
+sem rede), para cada tamanho de dataset, e grava o resultado em JSON.
+
+    python -m benchmarks.run --sizes 1000 100000 --requests 2000
+    python -m benchmarks.compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+
+from store.core.cache import build_cache
+from store.core.pagination import encode_cursor
+from store.core.schemas.product import (
+    ProductIn,
+    ProductOut,
+    ProductQuery,
+    ProductSearch,
+    ProductUpdate,
+)
+from store.db.codecs import CODEC_OPTIONS
+from store.db.indexes import ensure_indexes
+from store.db.memory import MemoryClient
+from store.models.product import ProductModel
+from store.usecases.product import ProductUseCase
+from tests.factories import products_factory
+
+SEED_CHUNK = 10_000
+# Ids por chamada no cenário lookup (uma página de carrinho/pedido)
+LOOKUP_IDS = 50
+RESULTS_DIR = Path(__file__).parent / "results"
+
+Call = Callable[[], Awaitable[Any]]
+
+
+def percentile(values: List[float], q: float) -> float:
+    index = min(len(values) - 1, round(q / 100 * (len(values) - 1)))
+    return values[index]
+
+
+async def measure(calls: List[Call], concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    pending = iter(calls)
+
+    async def worker() -> None:
+        # O iterador é compartilhado: cada worker pega a próxima chamada livre
+        for call in pending:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+async def open_mongo(args: argparse.Namespace) -> Tuple[AsyncIOMotorCollection, Call]:
+    client = AsyncIOMotorClient(args.mongo_url)
+    database = client.get_database(args.database, codec_options=CODEC_OPTIONS)
+
+    async def close() -> None:
+        client.close()
+
+    return database.get_collection("products"), close
+
+
+async def open_memory(
+    args: argparse.Namespace,
+) -> Tuple[AsyncIOMotorCollection, Call]:
+    # Sem banco de verdade: isola o custo da API (validação, serialização,
+    # HTTP) do custo do MongoDB
+    database = MemoryClient().get_database(args.database)
+
+    async def close() -> None:
+        pass
+
+    return database.get_collection("products"), close
+
+
+BACKENDS = {"mongo": open_mongo, "memory": open_memory}
+
+
+async def seed(collection: AsyncIOMotorCollection, size: int) -> None:
+    # Reaproveita o dataset da execução anterior quando o tamanho bate
+    if await collection.count_documents({}) == size:
+        return
+
+    await collection.drop()
+    await ensure_indexes(collection.database)
+    for start in range(0, size, SEED_CHUNK):
+        chunk = products_factory(min(SEED_CHUNK, size - start), start=start)
+        await collection.insert_many(
+            [ProductModel(**data).model_dump() for data in chunk], ordered=False
+        )
+
+
+async def sample_ids(collection: AsyncIOMotorCollection, count: int) -> list:
+    pipeline = [{"$sample": {"size": count}}, {"$project": {"_id": 0, "id": 1}}]
+    return [item["id"] for item in await collection.aggregate(pipeline).to_list(None)]
+
+
+async def middle_cursor(collection: AsyncIOMotorCollection, size: int) -> str:
+    # O skip é pago uma vez só, aqui; a medição usa o cursor keyset
+    sort = [("created_at", 1), ("id", 1)]
+    item = await collection.find().sort(sort).skip(size // 2).limit(1).to_list(1)
+    return encode_cursor(sort, [item[0][field] for field, _ in sort])
+
+
+def lookup_ids(ids: list, i: int) -> list:
+    start = i * LOOKUP_IDS % len(ids)
+    return (ids[start:] + ids[:start])[:LOOKUP_IDS]
+
+
+async def bench_usecase(
+    usecase: ProductUseCase,
+    ids: list,
+    cursor: str,
+    size: int,
+    args: argparse.Namespace,
+) -> Dict[str, Dict[str, float]]:
+    n = args.requests
+    bodies = [ProductIn(**data) for data in products_factory(n, start=10**8)]
+    created: list = []
+
+    async def create(body: ProductIn) -> None:
+        created.append((await usecase.create(body=body)).id)
+
+    scenarios: Dict[str, Callable[[], List[Call]]] = {
+        "create": lambda: [lambda body=body: create(body) for body in bodies],
+        "get": lambda: [
+            lambda id=ids[i % len(ids)]: usecase.get(id=id) for i in range(n)
+        ],
+        "lookup": lambda: [
+            lambda i=i: usecase.lookup(ids=lookup_ids(ids, i)) for i in range(n)
+        ],
+        "query": lambda: [lambda: usecase.query() for _ in range(n)],
+        "query_deep": lambda: [
+            lambda: usecase.query(params=ProductQuery(cursor=cursor)) for _ in range(n)
+        ],
+        "search_text": lambda: [
+            lambda i=i: usecase.search(params=ProductSearch(q=f"{i * 7919 % size:07d}"))
+            for i in range(n)
+        ],
+        "search_prefix": lambda: [
+            lambda i=i: usecase.search(
+                params=ProductSearch(q=f"product {i % 1000:03d}", mode="prefix")
+            )
+            for i in range(n)
+        ],
+        "update": lambda: [
+            lambda i=i: usecase.update(
+                id=ids[i % len(ids)], body=ProductUpdate(quantity=1 + i % 100)
+            )
+            for i in range(n)
+        ],
+        "delete": lambda: [lambda id=id: usecase.delete(id=id) for id in created],
+    }
+    return {
+        name: await measure(build(), args.concurrency)
+        for name, build in scenarios.items()
+    }
+
+
+async def bench_http(
+    usecase: ProductUseCase,
+    ids: list,
+    cursor: str,
+    size: int,
+    args: argparse.Namespace,
+) -> Dict[str, Dict[str, float]]:
+    from store.controllers.product import get_product_usecase
+    from store.main import app
+
+    app.dependency_overrides[get_product_usecase] = lambda: usecase
+    n = args.requests
+    bodies = products_factory(n, start=2 * 10**8)
+    created: list = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def create(body: dict) -> None:
+            response = await client.post("/products/", json=body)
+            created.append(response.json()["id"])
+
+        scenarios: Dict[str, Callable[[], List[Call]]] = {
+            "create": lambda: [lambda body=body: create(body) for body in bodies],
+            "get": lambda: [
+                lambda id=ids[i % len(ids)]: client.get(f"/products/{id}")
+                for i in range(n)
+            ],
+            "lookup": lambda: [
+                lambda i=i: client.post(
+                    "/products/lookup", json=[str(id) for id in lookup_ids(ids, i)]
+                )
+                for i in range(n)
+            ],
+            "query": lambda: [lambda: client.get("/products/") for _ in range(n)],
+            "query_deep": lambda: [
+                lambda: client.get("/products/", params={"cursor": cursor})
+                for _ in range(n)
+            ],
+            "search_text": lambda: [
+                lambda i=i: client.get(
+                    "/products/search", params={"q": f"{i * 7919 % size:07d}"}
+                )
+                for i in range(n)
+            ],
+            "search_prefix": lambda: [
+                lambda i=i: client.get(
+                    "/products/search",
+                    params={"q": f"product {i % 1000:03d}", "mode": "prefix"},
+                )
+                for i in range(n)
+            ],
+            "update": lambda: [
+                lambda i=i: client.patch(
+                    f"/products/{ids[i % len(ids)]}", json={"quantity": 1 + i % 100}
+                )
+                for i in range(n)
+            ],
+            "delete": lambda: [
+                lambda id=id: client.delete(f"/products/{id}") for id in created
+            ],
+        }
+        results = {
+            name: await measure(build(), args.concurrency)
+            for name, build in scenarios.items()
+        }
+
+    app.dependency_overrides.clear()
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    collection, close = await BACKENDS[args.backend](args)
+    results: Dict[str, Any] = {}
+    try:
+        for size in args.sizes:
+            print(f"seeding {size} products ({args.backend})...")
+            await seed(collection, size)
+            ids = await sample_ids(collection, min(size, args.requests))
+            cursor = await middle_cursor(collection, size)
+
+            for level, bench in (("usecase", bench_usecase), ("http", bench_http)):
+                usecase = ProductUseCase(
+                    collection=collection,
+                    cache=build_cache(model=ProductOut, prefix="bench:product:"),
+                )
+                for name, stats in (
+                    await bench(usecase, ids, cursor, size, args)
+                ).items():
+                    key = f"{size}/{level}.{name}"
+                    results[key] = stats
+                    print(
+                        f"{key:<28} {stats['throughput']:>10.1f} ops/s"
+                        f"  p50 {stats['p50_ms']:>8.2f} ms"
+                        f"  p99 {stats['p99_ms']:>8.2f} ms"
+                    )
+    finally:
+        await close()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da Store API.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="mongo")
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="store_bench")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / (
+        datetime.now().strftime("%Y%m%d-%H%M%S") + f"-{report['meta']['revision']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Request, status
+
+from store.db.mongo import db_client
+
+router = APIRouter(tags=["health"])
+
+
+@router.get(path="/health", status_code=status.HTTP_200_OK)
+async def health(request: Request) -> dict:
+    cache = request.app.state.product_cache
+    return {
+        "status": "healthy",
+        "mongo": {"pool": db_client.pool_stats.snapshot()},
+        "cache": cache.snapshot() if cache is not None else None,
+    }
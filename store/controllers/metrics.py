@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Request, Response
+
+from store.core.admission import admission
+from store.core.metrics import CONTENT_TYPE, metrics
+from store.db.mongo import db_client
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(path="/metrics", response_class=Response)
+async def get_metrics(request: Request) -> Response:
+    gauges = [
+        (
+            "store_mongo_pool",
+            "Estado do pool de conexões do MongoDB.",
+            db_client.pool_stats.snapshot(),
+        )
+    ]
+    cache = request.app.state.product_cache
+    if cache is not None:
+        gauges.append(
+            ("store_cache", "Contadores do cache de produtos.", cache.snapshot())
+        )
+    usecase = request.app.state.product_usecase
+    for name, flights in (
+        ("get", usecase.get_flights),
+        ("query", usecase.query_flights),
+    ):
+        if flights is not None:
+            gauges.append(
+                (
+                    f"store_singleflight_{name}",
+                    "Leituras de produtos compartilhadas entre requisições.",
+                    flights.snapshot(),
+                )
+            )
+    content = metrics.render(gauges) + admission.render(metrics.labels)
+    return Response(content=content, media_type=CONTENT_TYPE)
@@ -1,54 +1,297 @@
-from typing import List
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from typing import Annotated, List, Literal, Optional, Union
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
-from store.core.exceptions import NotFoundException
+from store.core.config import settings
+from store.core.etag import etag_matches, if_match_versions, product_etag
+from store.core.export import FORMATS, to_sse
+from store.core.exceptions import (
+    EmptyUpdateException,
+    InsufficientStockException,
+    InvalidCursorException,
+    NotFoundException,
+    VersionConflictException,
+)
+from store.core.responses import FastJSONResponse
 
 from store.core.schemas.product import (
+    BulkResult,
+    ProductBulkUpdate,
+    ProductChangePage,
     ProductIn,
+    ProductLookupResult,
     ProductOut,
+    ProductPartialOut,
+    ProductQuery,
+    ProductSearch,
+    ProductStats,
+    ProductStockAdjustment,
     ProductUpdate,
     ProductUpdateOut,
+    StockAdjustment,
 )
-from store.usecases.product import ProductUseCase, get_usecase
+from store.usecases.changes import ProductChangeFeed
+from store.usecases.product import ProductUseCase
 
 router = APIRouter(tags=["products"])
 
 
-def get_product_usecase() -> ProductUseCase:
-    return get_usecase()
+def get_product_usecase(request: Request) -> ProductUseCase:
+    # Criado uma única vez no lifespan (store.main); nos testes pode ser
+    # substituído com app.dependency_overrides
+    return request.app.state.product_usecase
+
+
+def get_product_changes(request: Request) -> ProductChangeFeed:
+    return request.app.state.product_changes
 
 
-@router.post(path="/", status_code=status.HTTP_201_CREATED)
+# As rotas de escrita devolvem o modelo já serializado em bytes; o
+# response_model fica só na documentação e o FastAPI não revalida a saída
+@router.post(path="/", status_code=status.HTTP_201_CREATED, response_model=ProductOut)
 async def post(
     body: ProductIn = Body(...), usecase: ProductUseCase = Depends(get_product_usecase)
-) -> ProductOut:
-    return await usecase.create(body=body)
+) -> FastJSONResponse:
+    product = await usecase.create(body=body)
+    return FastJSONResponse(product, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    path="/bulk", status_code=status.HTTP_201_CREATED, response_model=BulkResult
+)
+async def bulk_post(
+    body: Annotated[
+        List[ProductIn], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    result = await usecase.bulk_create(bodies=body)
+    return FastJSONResponse(result, status_code=status.HTTP_201_CREATED)
+
+
+@router.patch(path="/bulk", status_code=status.HTTP_200_OK, response_model=BulkResult)
+async def bulk_patch(
+    body: Annotated[
+        List[ProductBulkUpdate],
+        Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ],
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    return FastJSONResponse(await usecase.bulk_update(bodies=body))
+
+
+@router.delete(path="/bulk", status_code=status.HTTP_200_OK, response_model=BulkResult)
+async def bulk_delete(
+    body: Annotated[
+        List[UUID4], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    return FastJSONResponse(await usecase.bulk_delete(ids=body))
+
+
+@router.post(path="/stock", status_code=status.HTTP_200_OK, response_model=BulkResult)
+async def bulk_adjust_stock(
+    body: Annotated[
+        List[ProductStockAdjustment],
+        Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ],
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    return FastJSONResponse(await usecase.adjust_stock_many(adjustments=body))
+
+
+@router.post(
+    path="/lookup", status_code=status.HTTP_200_OK, response_model=ProductLookupResult
+)
+async def lookup(
+    body: Annotated[
+        List[UUID4], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    return FastJSONResponse(await usecase.lookup(ids=body))
+
+
+@router.get(path="/export", status_code=status.HTTP_200_OK)
+async def export(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> StreamingResponse:
+    serializer, media_type = FORMATS[format]
+    return StreamingResponse(
+        serializer(usecase.export()),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=products.{format}"},
+    )
 
 
-@router.get(path="/{id}", status_code=status.HTTP_200_OK)
+def _conditional_headers(etag: str) -> dict:
+    # no-cache: o cliente pode guardar a resposta, mas revalida a cada uso
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+@router.get(path="/search", status_code=status.HTTP_200_OK)
+async def search(
+    params: Annotated[ProductSearch, Query()],
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> List[ProductOut]:
+    return await usecase.search(params=params)
+
+
+@router.get(path="/stats", status_code=status.HTTP_200_OK, response_model=ProductStats)
+async def stats(
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    return FastJSONResponse(await usecase.stats())
+
+
+@router.get(
+    path="/changes", status_code=status.HTTP_200_OK, response_model=ProductChangePage
+)
+async def changes(
+    request: Request,
+    since: Optional[str] = Query(None, description="Token from a previous response"),
+    limit: int = Query(
+        settings.PRODUCTS_PAGE_SIZE, ge=1, le=settings.PRODUCTS_MAX_PAGE_SIZE
+    ),
+    timeout: float = Query(
+        settings.CHANGES_MAX_WAIT_SECONDS,
+        ge=0,
+        le=settings.CHANGES_MAX_WAIT_SECONDS,
+        description="Seconds to wait for the first change (long-poll)",
+    ),
+    feed: ProductChangeFeed = Depends(get_product_changes),
+) -> Response:
+    since = since or request.headers.get("last-event-id")
+    try:
+        # Valida o token antes de começar a resposta em streaming
+        feed.parse(since)
+        if "text/event-stream" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                to_sse(feed.changes(since)),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+        page = await feed.read(since=since, limit=limit, timeout=timeout)
+    except InvalidCursorException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+
+    return FastJSONResponse(page)
+
+
+@router.get(path="/{id}", status_code=status.HTTP_200_OK, response_model=ProductOut)
 async def get(
-    id: UUID4 = Path(alias="id"), usecase: ProductUseCase = Depends(get_product_usecase)
-) -> ProductOut:
+    request: Request,
+    id: UUID4 = Path(alias="id"),
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> Response:
     try:
-        return await usecase.get(id=id)
+        product = await usecase.get(id=id)
     except NotFoundException as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
 
+    headers = _conditional_headers(product_etag(product.version))
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FastJSONResponse(product, headers=headers)
+
 
-@router.get(path="/", status_code=status.HTTP_200_OK)
+@router.get(
+    path="/",
+    status_code=status.HTTP_200_OK,
+    response_model=List[ProductPartialOut],
+    response_model_exclude_unset=True,
+)
 async def query(
+    request: Request,
+    response: Response,
+    params: Annotated[ProductQuery, Query()],
     usecase: ProductUseCase = Depends(get_product_usecase),
-) -> List[ProductOut]:
-    return await usecase.query()
+) -> Union[Response, List[ProductPartialOut]]:
+    try:
+        page = await usecase.query(params=params)
+    except InvalidCursorException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+
+    if page.etag:
+        headers = _conditional_headers(page.etag)
+        if etag_matches(request.headers.get("if-none-match"), page.etag):
+            # A lista não é serializada quando o cliente já tem esta versão
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    if page.next:
+        next_url = request.url.include_query_params(cursor=page.next)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = page.next
+
+    return page.items
 
 
-@router.patch(path="/{id}", status_code=status.HTTP_200_OK)
+@router.patch(
+    path="/{id}", status_code=status.HTTP_200_OK, response_model=ProductUpdateOut
+)
 async def patch(
+    request: Request,
     id: UUID4 = Path(alias="id"),
     body: ProductUpdate = Body(...),
     usecase: ProductUseCase = Depends(get_product_usecase),
-) -> ProductUpdateOut:
-    return await usecase.update(id=id, body=body)
+) -> FastJSONResponse:
+    # Com If-Match (ETag de GET /products/{id}) a escrita só acontece se o
+    # produto não mudou desde a leitura; "*" só exige que ele exista
+    if_match = request.headers.get("if-match")
+    versions = None
+    if if_match and if_match.strip() != "*":
+        versions = if_match_versions(if_match)
+        if not versions:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="If-Match must contain product ETags",
+            )
+
+    try:
+        product = await usecase.update(id=id, body=body, versions=versions)
+    except EmptyUpdateException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+    except NotFoundException as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
+    except VersionConflictException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=exc.message
+        )
+
+    return FastJSONResponse(
+        product, headers=_conditional_headers(product_etag(product.version))
+    )
+
+
+@router.post(
+    path="/{id}/stock", status_code=status.HTTP_200_OK, response_model=ProductOut
+)
+async def adjust_stock(
+    id: UUID4 = Path(alias="id"),
+    body: StockAdjustment = Body(...),
+    usecase: ProductUseCase = Depends(get_product_usecase),
+) -> FastJSONResponse:
+    try:
+        product = await usecase.adjust_stock(id=id, delta=body.delta)
+    except NotFoundException as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
+    except InsufficientStockException as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=exc.message)
+
+    return FastJSONResponse(product)
 
 
 @router.delete(path="/{id}", status_code=status.HTTP_204_NO_CONTENT)
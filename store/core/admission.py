@@ -0,0 +1,215 @@
+import asyncio
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from store.core.config import settings
+from store.core.metrics import Labels
+from store.core.responses import FastJSONResponse
+
+
+@dataclass
+class LimiterStats:
+    admitted: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    queued_max: int = 0
+
+
+class Limiter:
+    """Limite de requisições simultâneas com fila de espera limitada.
+
+    Até ``limit`` requisições passam direto; as seguintes esperam em ordem de
+    chegada, no máximo ``max_queue`` de cada vez. Quem encontra a fila cheia
+    é recusado na hora e quem não recebe vaga em ``timeout`` segundos
+    desiste. Ao liberar, a vaga passa direto para o primeiro da fila, então
+    quem chega depois não fura a fila.
+    """
+
+    def __init__(self, limit: int, max_queue: int) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.stats = LimiterStats()
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: Optional[float]) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.stats.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.stats.rejected += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self.stats.queued_max = max(self.stats.queued_max, len(self._waiters))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            self._give_back(future)
+            return False
+        except asyncio.CancelledError:
+            self._give_back(future)
+            raise
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+        self.stats.admitted += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            # Futures cancelados (timeout, cliente caiu) são pulados
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            **asdict(self.stats),
+        }
+
+    def _give_back(self, future: asyncio.Future) -> None:
+        # A vaga pode ter chegado junto com o timeout ou o cancelamento
+        if future.done() and not future.cancelled():
+            self.release()
+
+
+class AdmissionControl:
+    """Um ``Limiter`` por rota, criado no primeiro uso.
+
+    A rota é identificada por método e template (``GET /products/{id}``),
+    como nas métricas; ``route_limits`` sobrescreve o limite de rotas
+    específicas e as rotas de ``exempt`` nunca são limitadas.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        timeout: Optional[float],
+        retry_after: int,
+        route_limits: Optional[Mapping[str, int]] = None,
+        exempt: Iterable[str] = (),
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.route_limits = dict(route_limits or {})
+        self.exempt = set(exempt)
+        self.limiters: Dict[str, Limiter] = {}
+
+    def limiter(self, method: str, path: str) -> Optional[Limiter]:
+        if path in self.exempt:
+            return None
+        key = f"{method} {path}"
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            limit = self.route_limits.get(key, self.max_concurrency)
+            limiter = self.limiters[key] = Limiter(limit, self.max_queue)
+        return limiter
+
+    def render(self, labels: Labels = ()) -> str:
+        """Estado dos limiters no formato texto do Prometheus.
+
+        ``labels`` são acrescentados a todas as séries (``Metrics.labels``).
+        """
+        prefix = "".join(f'{name}="{value}",' for name, value in labels)
+        lines: List[str] = []
+        snapshots = {key: limiter.snapshot() for key, limiter in self.limiters.items()}
+        for field, kind, help in (
+            ("limit", "gauge", "Requisições simultâneas permitidas por rota."),
+            ("active", "gauge", "Requisições em atendimento por rota."),
+            ("queued", "gauge", "Requisições esperando vaga por rota."),
+            ("queued_max", "gauge", "Maior fila de espera observada por rota."),
+            ("admitted", "counter", "Requisições admitidas por rota."),
+            ("rejected", "counter", "Requisições recusadas com a fila cheia."),
+            ("timeouts", "counter", "Requisições que desistiram de esperar vaga."),
+        ):
+            name = f"store_admission_{field}"
+            if kind == "counter":
+                name += "_total"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, snapshot in snapshots.items():
+                method, route = key.split(" ", 1)
+                series = f'{prefix}method="{method}",route="{route}"'
+                lines.append(f"{name}{{{series}}} {snapshot[field]}")
+        return "\n".join(lines) + "\n"
+
+
+admission = AdmissionControl(
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    route_limits=settings.ADMISSION_ROUTE_LIMITS,
+    exempt=settings.ADMISSION_EXEMPT_PATHS,
+)
+
+
+class AdmissionMiddleware:
+    """Middleware ASGI que limita as requisições simultâneas de cada rota.
+
+    A rota é resolvida antes do roteamento, percorrendo as rotas do app, para
+    que a requisição recusada não chegue a ler o corpo nem a validar
+    parâmetros. Sem vaga, responde ``503`` com ``Retry-After`` na hora (fila
+    cheia) ou depois do timeout da fila, em vez de acumular requisições que
+    o banco não consegue atender. Requisições sem rota passam direto.
+    """
+
+    def __init__(self, app: ASGIApp, control: AdmissionControl = admission) -> None:
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = _match_route(scope)
+        limiter = None
+        if route is not None:
+            limiter = self.control.limiter(scope["method"], route.path)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire(self.control.timeout):
+            # Para que as métricas atribuam o 503 à rota
+            scope["route"] = route
+            response = FastJSONResponse(
+                {"detail": "Service overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.control.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def _match_route(scope: Scope) -> Any:
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route
+    return None
@@ -0,0 +1,160 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from store.core.config import settings
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class Cache:
+    """Interface dos backends de cache usados na frente dos usecases."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, **asdict(self.stats)}
+
+
+class MemoryCache(Cache):
+    """Cache em processo com TTL e descarte LRU.
+
+    A memória é limitada por ``max_entries``: ao passar do limite o item
+    menos usado recentemente é descartado. Cada worker tem a sua cópia, então
+    escritas feitas em outro processo só são vistas quando o TTL expira.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisCache(Cache):
+    """Cache compartilhado entre workers em um servidor compatível com Redis.
+
+    Os valores são gravados como JSON do ``model`` informado. Descartes por
+    falta de memória são feitos pelo próprio servidor (``maxmemory-policy``) e
+    não aparecem em ``evictions``.
+    """
+
+    def __init__(
+        self, url: str, ttl: float, model: Type[BaseModel], prefix: str = "store:"
+    ) -> None:
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requer o pacote 'redis' (poetry install --extras redis)"
+            ) from exc
+
+        super().__init__()
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.model = model
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return self.model.model_validate_json(value)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        # Um MGET em vez de uma ida ao servidor por chave
+        if not keys:
+            return []
+        values = await self.client.mget([self.prefix + key for key in keys])
+        hits = sum(value is not None for value in values)
+        self.stats.hits += hits
+        self.stats.misses += len(values) - hits
+        return [
+            None if value is None else self.model.model_validate_json(value)
+            for value in values
+        ]
+
+    async def set(self, key: str, value: BaseModel) -> None:
+        await self.client.set(
+            self.prefix + key, value.model_dump_json(), px=int(self.ttl * 1000)
+        )
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def build_cache(
+    model: Type[BaseModel], prefix: str, ttl: Optional[float] = None
+) -> Optional[Cache]:
+    ttl = settings.CACHE_TTL_SECONDS if ttl is None else ttl
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(ttl=ttl, max_entries=settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(
+            url=settings.CACHE_REDIS_URL, ttl=ttl, model=model, prefix=prefix
+        )
+    return None
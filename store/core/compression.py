@@ -0,0 +1,33 @@
+from fastapi import FastAPI
+from starlette.middleware.gzip import GZipMiddleware
+
+from store.core.config import settings
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # pragma: no cover - brotli-asgi é opcional
+    BrotliMiddleware = None
+
+
+def add_compression(app: FastAPI) -> None:
+    """Comprime respostas acima de ``COMPRESSION_MINIMUM_SIZE`` bytes.
+
+    O encoding é negociado pelo ``Accept-Encoding``: brotli quando o
+    ``brotli-asgi`` está instalado (com gzip de fallback), senão só gzip.
+    Respostas pequenas, como um único produto ou um 304, saem sem compressão.
+    """
+    if BrotliMiddleware is not None:
+        app.add_middleware(
+            BrotliMiddleware,
+            quality=settings.COMPRESSION_BROTLI_QUALITY,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            gzip_fallback=True,
+            # Igual ao GZipMiddleware, que não comprime text/event-stream
+            excluded_handlers=[r"^/products/changes$"],
+        )
+    else:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            compresslevel=settings.COMPRESSION_GZIP_LEVEL,
+        )
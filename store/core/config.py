@@ -1,3 +1,6 @@
+from decimal import Decimal
+from typing import Dict, List, Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +11,109 @@ class Settings(BaseSettings):
     ROOT_PATH: str = "/"
     DATABASE_URL: str = ""
     MONGO_URL: str = "mongodb://localhost:27017/store"
+    # "memory" troca o MongoDB pelo backend em processo de store.db.memory
+    # (testes, benchmarks e profiling sem mongod); os dados não persistem
+    DATABASE_BACKEND: Literal["mongo", "memory"] = "mongo"
+    MONGO_CREATE_INDEXES: bool = True
+
+    # Pool de conexões do Motor; None mantém o default do driver
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_CONNECT_TIMEOUT_MS: int = 20000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: str = ""
+    MONGO_READ_PREFERENCE: str = "primary"
+
+    PRODUCTS_PAGE_SIZE: int = 100
+    PRODUCTS_MAX_PAGE_SIZE: int = 1000
+    EXPORT_BATCH_SIZE: int = 1000
+    BULK_MAX_ITEMS: int = 1000
+
+    # Middleware de latência e /metrics no formato do Prometheus. Com
+    # METRICS_WORKER_LABEL as séries levam worker="<pid>": cada worker tem o
+    # próprio registro (o store-server liga quando sobe mais de um)
+    METRICS_ENABLED: bool = True
+    METRICS_WORKER_LABEL: bool = False
+
+    # Compressão das respostas; brotli só quando brotli-asgi está instalado
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # GET /products/search; o modo prefix compara pela collation do locale
+    # com strength 1 (ignora maiúsculas e acentos)
+    SEARCH_COLLATION_LOCALE: str = "pt"
+    SEARCH_PAGE_SIZE: int = 20
+    SEARCH_MAX_PAGE_SIZE: int = 100
+
+    # GET /products/stats: agregação no banco, guardada pelo TTL abaixo no
+    # backend de CACHE_BACKEND; limites inferiores das faixas de preço
+    STATS_CACHE_TTL_SECONDS: float = 60
+    STATS_PRICE_BUCKETS: List[Decimal] = [
+        Decimal(bound) for bound in (0, 10, 50, 100, 500, 1000, 5000, 10000)
+    ]
+
+    # Feed de alterações (GET /products/changes). "auto" usa change streams
+    # quando o servidor suporta (replica set) e cai para polling em updated_at.
+    # Alterações são datadas pelo MongoDB, mas criações, tombstones e o corte
+    # do polling usam o relógio da instância da API: o lag precisa cobrir a
+    # diferença entre os relógios (NTP) além da demora para confirmar escritas
+    CHANGES_BACKEND: Literal["auto", "change_stream", "polling"] = "auto"
+    CHANGES_POLL_INTERVAL_SECONDS: float = 1.0
+    CHANGES_POLL_LAG_SECONDS: float = 2.0
+    CHANGES_MAX_WAIT_SECONDS: float = 30
+    CHANGES_HEARTBEAT_SECONDS: float = 15
+    CHANGES_TOMBSTONE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Leituras iguais e simultâneas (get por id, query com os mesmos
+    # parâmetros) compartilham uma única consulta; quem chega depois espera
+    # no máximo o timeout antes de consultar por conta própria
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 5.0
+
+    # Controle de admissão: cada rota (método + template) atende no máximo
+    # ADMISSION_MAX_CONCURRENCY requisições ao mesmo tempo e enfileira até
+    # ADMISSION_MAX_QUEUE; sem vaga em ADMISSION_QUEUE_TIMEOUT_SECONDS (ou
+    # com a fila cheia) a resposta é 503 com Retry-After. Os limites por rota
+    # usam a chave "GET /products/export"; rotas isentas nunca esperam
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 64
+    ADMISSION_MAX_QUEUE: int = 256
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {
+        "GET /products/export": 8,
+        # Long polling e SSE ocupam a vaga enquanto a conexão fica aberta
+        "GET /products/changes": 1024,
+    }
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/health", "/metrics"]
+
+    # Launcher de produção (store-server). SERVER_WORKERS=None usa um worker
+    # por núcleo; "auto" usa uvloop e httptools quando estão instalados. No
+    # SIGTERM os workers param de aceitar conexões e esperam as requisições
+    # em andamento por até SERVER_GRACEFUL_SHUTDOWN_SECONDS
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: float = 30
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_ACCESS_LOG: bool = False
+
+    # Cache de leitura de GET /products/{id}
+    CACHE_BACKEND: Literal["none", "memory", "redis"] = "memory"
+    CACHE_TTL_SECONDS: float = 30
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # O store-server desliga só este cache com vários workers e CACHE_BACKEND
+    # memory: um PATCH não invalidaria a cópia dos outros workers. O cache de
+    # stats continua, porque já expira só pelo TTL
+    CACHE_PRODUCTS_ENABLED: bool = True
 
 
 settings = Settings()
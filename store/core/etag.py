@@ -0,0 +1,61 @@
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+
+def product_etag(version: int) -> str:
+    """ETag de um produto: a própria ``version``.
+
+    É fraca, como a da página, porque o middleware de compressão pode mudar
+    os bytes enviados sem mudar a ETag. Mesmo assim serve para ``If-Match``
+    no PATCH: a pré-condição é checada pela ``version``, não pelos bytes
+    (``if_match_versions``).
+    """
+    return f'W/"{version}"'
+
+
+def page_etag(versions: Iterable[Tuple[UUID, int]], next: Optional[str]) -> str:
+    """ETag de uma página de produtos a partir dos pares (id, version).
+
+    Muda quando qualquer item é alterado, entra ou sai da página, ou quando
+    o cursor da próxima página muda. É fraca porque a lista pode ser enviada
+    comprimida ou não.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for id, version in versions:
+        digest.update(id.bytes)
+        digest.update(version.to_bytes(8, "big"))
+    if next:
+        digest.update(next.encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Comparação fraca (RFC 9110 13.1.2): o prefixo W/ é ignorado
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def if_match_versions(if_match: str) -> List[int]:
+    """Versões aceitas por um ``If-Match`` com ETags de produto.
+
+    A ETag do produto é fraca e identifica a ``version``, não os bytes
+    enviados, então o prefixo ``W/`` é aceito: o cliente devolve a ETag que
+    recebeu. Valores que não são versões são ignorados; lista vazia significa
+    que nenhuma versão pode satisfazer a pré-condição.
+    """
+    versions = []
+    for candidate in if_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate.startswith('"') and candidate.endswith('"'):
+            value = candidate[1:-1]
+            if value.isdigit():
+                versions.append(int(value))
+    return versions
@@ -8,3 +8,19 @@ class BaseException(Exception):
 
 class NotFoundException(BaseException):
     message = "Not Found"
+
+
+class InvalidCursorException(BaseException):
+    message = "Invalid cursor"
+
+
+class InsufficientStockException(BaseException):
+    message = "Insufficient stock"
+
+
+class VersionConflictException(BaseException):
+    message = "Version conflict"
+
+
+class EmptyUpdateException(BaseException):
+    message = "No fields to update"
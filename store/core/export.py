@@ -0,0 +1,57 @@
+import csv
+import io
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from store.core.config import settings
+from store.core.schemas.product import ProductChange, ProductOut
+
+FIELDS = list(ProductOut.model_fields)
+
+
+async def to_ndjson(batches: AsyncIterator[List[ProductOut]]) -> AsyncIterator[str]:
+    async for batch in batches:
+        yield "".join(f"{product.model_dump_json()}\n" for product in batch)
+
+
+async def to_csv(batches: AsyncIterator[List[ProductOut]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+
+    async for batch in batches:
+        writer.writerows(product.model_dump(mode="json") for product in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Coleção vazia: ainda assim envia o cabeçalho
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def to_sse(
+    changes: AsyncIterator[Tuple[Optional[ProductChange], str]],
+    heartbeat: float = settings.CHANGES_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Formata o feed de alterações como Server-Sent Events.
+
+    O ``id`` de cada evento é o token da alteração, então o ``EventSource``
+    retoma sozinho pelo ``Last-Event-ID`` depois de uma reconexão. Sem
+    alterações, um comentário é enviado a cada ``heartbeat`` segundos para
+    manter a conexão aberta em proxies.
+    """
+    last = time.monotonic()
+    async for change, token in changes:
+        if change is not None:
+            yield f"id: {token}\nevent: {change.op}\ndata: {change.model_dump_json()}\n\n"
+            last = time.monotonic()
+        elif time.monotonic() - last >= heartbeat:
+            yield ": keep-alive\n\n"
+            last = time.monotonic()
+
+
+FORMATS: Dict[str, tuple] = {
+    "ndjson": (to_ndjson, "application/x-ndjson"),
+    "csv": (to_csv, "text/csv"),
+}
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Agrupa chamadas ``load`` concorrentes em uma única ``batch_load``.
+
+    As chaves pedidas na mesma iteração do event loop são acumuladas e
+    despachadas juntas na iteração seguinte (``call_soon``); chaves repetidas
+    compartilham o mesmo future. ``batch_load`` recebe as chaves sem
+    repetição e devolve os valores na mesma ordem; uma exceção dela é
+    propagada para todos que esperavam pelo lote. Nada fica guardado depois
+    do despacho: cache é responsabilidade de quem implementa ``batch_load``.
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[List[V]]],
+        max_batch_size: int,
+    ) -> None:
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[K, asyncio.Future] = {}
+        # O loop só guarda referências fracas das tasks em andamento
+        self._running: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V:
+        # shield: cancelar um dos que esperam não cancela o future dos outros
+        return await asyncio.shield(self._future(key))
+
+    def _future(self, key: K) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        return future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = {
+                key: pending[key] for key in keys[start : start + self.max_batch_size]
+            }
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[K, asyncio.Future]) -> None:
+        try:
+            values = await self.batch_load(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, value in zip(batch.values(), values):
+            # Quem esperava pode ter sido cancelado (timeout, cliente caiu)
+            if not future.done():
+                future.set_result(value)
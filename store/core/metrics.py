@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from store.core.config import settings
+
+# Limites (em segundos) dos buckets dos histogramas de latência
+BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestContext:
+    """Tempo e comandos do MongoDB acumulados durante uma requisição.
+
+    O Motor executa o driver em threads copiando o contexto de quem chamou,
+    então o ``CommandListener`` encontra o mesmo objeto em ``current_request``
+    e soma nele; o lock cobre operações paralelas da mesma requisição.
+    """
+
+    __slots__ = ("db_time", "commands", "lock")
+
+    def __init__(self) -> None:
+        self.db_time = 0.0
+        self.commands: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def add_command(self, name: str, duration: float) -> None:
+        with self.lock:
+            self.db_time += duration
+            self.commands[name] = self.commands.get(name, 0) + 1
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def _labels(labels: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metrics:
+    """Registro das métricas expostas em ``/metrics``.
+
+    Os histogramas são atualizados só pelo middleware, no event loop. Os
+    comandos de fora de uma requisição (startup, CLIs) chegam das threads do
+    driver e ficam em ``background``, protegido por lock.
+
+    ``labels`` entram em todas as séries; com vários workers cada processo
+    tem o próprio registro e se identifica pelo label ``worker``.
+    """
+
+    def __init__(self, labels: Labels = ()) -> None:
+        self.labels = labels
+        self.request_duration: Dict[Labels, Histogram] = {}
+        self.request_db_duration: Dict[Labels, Histogram] = {}
+        self.commands: Dict[Labels, int] = {}
+        self.background = RequestContext()
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        context: RequestContext,
+    ) -> None:
+        key = (("method", method), ("route", route), ("status", str(status)))
+        histogram = self.request_duration.get(key)
+        if histogram is None:
+            histogram = self.request_duration[key] = Histogram()
+        histogram.observe(duration)
+
+        key = (("method", method), ("route", route))
+        histogram = self.request_db_duration.get(key)
+        if histogram is None:
+            histogram = self.request_db_duration[key] = Histogram()
+        histogram.observe(context.db_time)
+
+        for command, count in context.commands.items():
+            key = (("route", route), ("command", command))
+            self.commands[key] = self.commands.get(key, 0) + count
+
+    def reset(self) -> None:
+        self.__init__(self.labels)
+
+    def _command_counts(self) -> Dict[Labels, int]:
+        counts = dict(self.commands)
+        with self.background.lock:
+            background = dict(self.background.commands)
+        for command, count in background.items():
+            counts[(("route", ""), ("command", command))] = count
+        return counts
+
+    def render(self, gauges: Iterable[Tuple[str, str, Dict[str, float]]] = ()) -> str:
+        """Formata as métricas no formato texto do Prometheus.
+
+        ``gauges`` recebe ``(nome, descrição, valores)`` de outras fontes
+        (pool do driver, cache) e vira um gauge por chave de ``valores``.
+        """
+        lines: List[str] = []
+        for name, help, histograms in (
+            (
+                "store_http_request_duration_seconds",
+                "Latência das requisições HTTP por rota.",
+                self.request_duration,
+            ),
+            (
+                "store_http_request_db_duration_seconds",
+                "Tempo gasto em comandos do MongoDB por requisição.",
+                self.request_db_duration,
+            ),
+        ):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in list(histograms.items()):
+                labels = self.labels + key
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                    lines.append(f"{name}_bucket{_labels(labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        name = "store_mongo_commands_total"
+        lines.append(f"# HELP {name} Comandos enviados ao MongoDB por rota.")
+        lines.append(f"# TYPE {name} counter")
+        for labels, count in self._command_counts().items():
+            lines.append(f"{name}{_labels(self.labels + labels)} {count}")
+
+        for prefix, help, values in gauges:
+            for key, value in values.items():
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                name = f"{prefix}_{key}"
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name}{_labels(self.labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics(
+    (("worker", str(os.getpid())),) if settings.METRICS_WORKER_LABEL else ()
+)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede a latência de cada requisição HTTP.
+
+    A rota é identificada pelo template (``/products/{id}``) para manter a
+    cardinalidade baixa; requisições sem rota correspondente caem em
+    ``<unmatched>``. O custo por requisição é um ``perf_counter`` em cada
+    ponta e a atualização de dois histogramas.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Metrics = metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext()
+        token = current_request.set(context)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            current_request.reset(token)
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                status,
+                duration,
+                context,
+            )
@@ -0,0 +1,93 @@
+import base64
+import binascii
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Tuple, Type
+from uuid import UUID
+
+import pymongo
+from bson import Decimal128, json_util
+from bson.binary import UuidRepresentation
+from bson.errors import InvalidBSON
+from bson.json_util import JSONMode, JSONOptions
+
+from store.core.exceptions import InvalidCursorException
+
+Sort = List[Tuple[str, int]]
+
+# Tipo que cada campo de ordenação tem depois de decodificado; ``resume`` é
+# o ``_data`` do resume token do change stream
+FIELD_TYPES: Dict[str, Type] = {
+    "created_at": datetime,
+    "updated_at": datetime,
+    "id": UUID,
+    "name": str,
+    "price": Decimal128,
+    "quantity": int,
+    "resume": str,
+}
+
+JSON_OPTIONS = JSONOptions(
+    json_mode=JSONMode.RELAXED,
+    uuid_representation=UuidRepresentation.STANDARD,
+    tz_aware=True,
+)
+
+
+def encode_cursor(sort: Sort, values: Sequence[Any]) -> str:
+    """Gera um token opaco com os valores da chave de ordenação do último item.
+
+    O extended JSON preserva os tipos BSON (datas, UUIDs, Decimal128), então o
+    valor decodificado compara no banco exatamente como o valor armazenado.
+    """
+    values = [
+        Decimal128(value) if isinstance(value, Decimal) else value for value in values
+    ]
+    raw = json_util.dumps(
+        {"s": [field for field, _ in sort], "v": values},
+        json_options=JSON_OPTIONS,
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort: Sort, cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json_util.loads(raw, json_options=JSON_OPTIONS)
+        fields, values = data["s"], data["v"]
+    except (binascii.Error, InvalidBSON, ValueError, TypeError, KeyError):
+        raise InvalidCursorException(message=f"Invalid cursor: {cursor}")
+
+    # Um cursor só é válido para a mesma ordenação em que foi gerado
+    if fields != [field for field, _ in sort] or len(values) != len(sort):
+        raise InvalidCursorException(message=f"Invalid cursor: {cursor}")
+
+    # Um valor de outro tipo (ou um documento com operadores, como
+    # ``{"$ne": null}``) iria direto para o filtro do keyset
+    for field, value in zip(fields, values):
+        if not _valid_value(field, value):
+            raise InvalidCursorException(message=f"Invalid cursor: {cursor}")
+
+    return values
+
+
+def _valid_value(field: str, value: Any) -> bool:
+    if isinstance(value, (dict, list, bool)):
+        return False
+    expected = FIELD_TYPES.get(field)
+    return expected is None or isinstance(value, expected)
+
+
+def keyset_filter(sort: Sort, values: Sequence[Any]) -> dict:
+    """Monta o filtro que retoma a listagem logo após ``values``.
+
+    Para ``[(a, 1), (b, 1)]`` gera ``a > va OR (a == va AND b > vb)``, que o
+    planner resolve com um range scan no índice composto ``(a, b)``.
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {name: value for (name, _), value in zip(sort, values[:position])}
+        operator = "$gt" if direction == pymongo.ASCENDING else "$lt"
+        clause[field] = {operator: values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
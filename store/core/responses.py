@@ -0,0 +1,40 @@
+import json
+from typing import Any, Callable
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+
+def _dumps_stdlib(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _dumps_orjson(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+dumps: Callable[[Any], bytes] = _dumps_orjson if orjson else _dumps_stdlib
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON que serializa cada representação uma única vez.
+
+    Modelos Pydantic vão direto para bytes pelo serializer do pydantic-core,
+    sem o ``dict`` intermediário do ``jsonable_encoder``; bytes são enviados
+    como estão. O resto (usado como ``default_response_class`` do app) passa
+    pelo ``orjson`` quando instalado, ou pelo ``json`` da biblioteca padrão.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return dumps(content)
@@ -16,6 +16,10 @@ class OutMixin(BaseModel):
 
     @model_validator(mode="before")
     def set_schema(cls, data):
+        # Com from_attributes o validator também recebe instâncias de modelos
+        if not isinstance(data, dict):
+            return data
+
         for key, value in data.items():
             if isinstance(value, Decimal128):
                 data[key] = Decimal(str(value))
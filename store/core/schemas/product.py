@@ -1,8 +1,15 @@
-from typing import Annotated, Optional
+from typing import List, Literal, Optional, Union
+from datetime import datetime
 from decimal import Decimal
-from bson import Decimal128
-from pydantic import AfterValidator, BaseModel, Field
+from pydantic import (
+    UUID4,
+    BaseModel,
+    Field,
+    field_validator,
+    model_validator,
+)
 
+from store.core.config import settings
 from store.core.schemas.base import BaseSchemaMixin, OutMixin
 
 
@@ -20,21 +27,177 @@ class ProductIn(ProductBase, BaseSchemaMixin):
 
 
 class ProductOut(ProductIn, OutMixin):
-    ...
+    # Ajustes de estoque podem zerar a quantidade de um produto existente
+    quantity: int = Field(..., description="The quantity of the product", ge=0)
+    # Documentos anteriores ao campo não têm version; contam como 0
+    version: int = Field(0, description="Incremented on every write")
+
 
+class ProductUpdate(BaseSchemaMixin):
+    # Mesmas regras da criação: estoque nunca negativo (como em POST /stock)
+    # e preço positivo, que ProductOut exige na leitura
+    quantity: Optional[int] = Field(None, description="Product quantity", ge=0)
+    price: Optional[Decimal] = Field(None, description="Product price", gt=0)
+    status: Optional[bool] = Field(None, description="Product status")
 
-def convert_decimal_128(v):
-    return Decimal128(str(v))
 
+class ProductUpdateOut(ProductUpdate, OutMixin):
+    version: int = Field(0, description="Incremented on every write")
 
-Decimal_ = Annotated[Decimal, AfterValidator(convert_decimal_128)]
 
+class ProductBulkUpdate(ProductUpdate):
+    id: UUID4 = Field(..., description="Product id")
 
-class ProductUpdate(BaseSchemaMixin):
-    quantity: Optional[int] = Field(None, description="Product quantity")
-    price: Optional[Decimal_] = Field(None, description="Product price")
+
+class StockAdjustment(BaseModel):
+    delta: int = Field(
+        ..., description="Units to add (positive) or remove (negative) from stock"
+    )
+
+    @field_validator("delta")
+    @classmethod
+    def check_delta(cls, value: int) -> int:
+        if value == 0:
+            raise ValueError("delta must not be zero")
+        return value
+
+
+class ProductStockAdjustment(StockAdjustment):
+    id: UUID4 = Field(..., description="Product id")
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[UUID4] = None
+    status: Literal[
+        "created",
+        "updated",
+        "deleted",
+        "not_found",
+        "insufficient_stock",
+        "error",
+    ]
+    detail: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    items: List[BulkItemResult]
+
+
+class ProductLookupItem(BaseModel):
+    id: UUID4
+    status: Literal["found", "not_found"]
+    product: Optional[ProductOut] = None
+
+
+class ProductLookupResult(BaseModel):
+    # Na mesma ordem dos ids pedidos, repetidos inclusive
+    items: List[ProductLookupItem]
+
+
+class ProductPartialOut(OutMixin, BaseSchemaMixin):
+    id: Optional[UUID4] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    name: Optional[str] = None
+    quantity: Optional[int] = None
+    price: Optional[Decimal] = None
+    status: Optional[bool] = None
+    version: Optional[int] = None
+
+
+ProductField = Literal[
+    "name", "quantity", "price", "status", "id", "created_at", "updated_at", "version"
+]
+
+
+class ProductQuery(BaseModel):
+    min_price: Optional[Decimal] = Field(None, ge=0, description="Minimum price")
+    max_price: Optional[Decimal] = Field(None, ge=0, description="Maximum price")
     status: Optional[bool] = Field(None, description="Product status")
+    min_quantity: Optional[int] = Field(None, ge=0, description="Minimum quantity")
+    name_prefix: Optional[str] = Field(
+        None, min_length=1, max_length=100, description="Product name prefix"
+    )
+    updated_since: Optional[datetime] = Field(
+        None, description="Only products updated at or after this instant"
+    )
+    sort: Literal["created_at", "updated_at", "name", "price", "quantity"] = Field(
+        "created_at", description="Sort field"
+    )
+    order: Literal["asc", "desc"] = Field("asc", description="Sort direction")
+    fields: Optional[List[ProductField]] = Field(
+        None, description="Fields to return (id is always included)"
+    )
+    cursor: Optional[str] = Field(None, description="Continuation token")
+    limit: int = Field(
+        settings.PRODUCTS_PAGE_SIZE, ge=1, le=settings.PRODUCTS_MAX_PAGE_SIZE
+    )
 
+    @model_validator(mode="after")
+    def check_price_range(self):
+        if (
+            self.min_price is not None
+            and self.max_price is not None
+            and self.min_price > self.max_price
+        ):
+            raise ValueError("min_price must be less than or equal to max_price")
+        return self
 
-class ProductUpdateOut(ProductUpdate, OutMixin):
-    ...
+
+class ProductSearch(BaseModel):
+    q: str = Field(..., min_length=1, max_length=100, description="Search terms")
+    mode: Literal["text", "prefix"] = Field(
+        "text",
+        description="text: words ranked by relevance; prefix: name type-ahead",
+    )
+    limit: int = Field(
+        settings.SEARCH_PAGE_SIZE, ge=1, le=settings.SEARCH_MAX_PAGE_SIZE
+    )
+
+
+class ProductPage(BaseModel):
+    items: List[Union[ProductOut, ProductPartialOut]]
+    next: Optional[str] = None
+    etag: Optional[str] = None
+
+
+class ProductChange(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: UUID4
+    at: datetime = Field(..., description="updated_at of the change")
+    product: Optional[ProductOut] = Field(
+        None, description="Product after the change (absent on delete)"
+    )
+    token: str = Field(..., description="Resume token positioned after this change")
+
+
+class ProductChangePage(BaseModel):
+    changes: List[ProductChange]
+    next: Optional[str] = Field(None, description="Token for the next request")
+
+
+class StatusStats(BaseModel):
+    status: bool
+    count: int
+    quantity: int
+    stock_value: Decimal = Field(..., description="Sum of quantity * price")
+
+
+class PriceBucket(BaseModel):
+    min: Decimal = Field(..., description="Inclusive lower bound")
+    max: Optional[Decimal] = Field(None, description="Exclusive upper bound")
+    count: int
+    quantity: int
+
+
+class ProductStats(BaseModel):
+    count: int = 0
+    quantity: int = 0
+    stock_value: Decimal = Field(Decimal(0), description="Sum of quantity * price")
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    avg_price: Optional[Decimal] = None
+    by_status: List[StatusStats] = []
+    price_buckets: List[PriceBucket] = []
+    computed_at: datetime
@@ -0,0 +1,70 @@
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    shared: int = 0
+    timeouts: int = 0
+
+
+class SingleFlight:
+    """Compartilha uma chamada em andamento entre pedidos iguais.
+
+    O primeiro ``do(key, fn)`` executa ``fn`` em uma task; quem chegar com a
+    mesma chave enquanto ela não termina espera o mesmo resultado (ou a mesma
+    exceção) em vez de repetir a consulta. A chave é liberada quando a task
+    termina, então erros não ficam guardados. A task não pertence a nenhum
+    dos que esperam: cancelar um deles não interrompe os outros.
+
+    Quem entra numa chamada já em andamento espera no máximo ``timeout``
+    segundos; depois disso executa ``fn`` por conta própria, para que uma
+    consulta travada não prenda todas as requisições atrás dela.
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = timeout
+        self.stats = SingleFlightStats()
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._flights.get(key)
+        if task is None:
+            self.stats.calls += 1
+            task = self._flights[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._release(key, done))
+            return await asyncio.shield(task)
+
+        self.stats.shared += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            return await fn()
+
+    def forget(self, *keys: Hashable) -> None:
+        """Faz as próximas chamadas ignorarem o que está em andamento.
+
+        Usado depois de escritas: quem chega depois delas não pode receber
+        uma leitura que começou antes.
+        """
+        for key in keys:
+            self._flights.pop(key, None)
+
+    def clear(self) -> None:
+        self._flights.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._flights), **asdict(self.stats)}
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Marca a exceção como lida mesmo que ninguém esteja mais esperando
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,27 @@
+from datetime import timezone
+from decimal import Decimal
+
+from bson import Decimal128
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions, TypeCodec, TypeRegistry
+
+
+class DecimalCodec(TypeCodec):
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value: Decimal) -> Decimal128:
+        return Decimal128(value)
+
+    def transform_bson(self, value: Decimal128) -> Decimal:
+        return value.to_decimal()
+
+
+# UUIDs viram BSON binary (subtipo 4), datas viram BSON date e Decimal vira
+# Decimal128 nos dois sentidos, sem conversões manuais nos usecases.
+CODEC_OPTIONS = CodecOptions(
+    tz_aware=True,
+    tzinfo=timezone.utc,
+    uuid_representation=UuidRepresentation.STANDARD,
+    type_registry=TypeRegistry([DecimalCodec()]),
+)
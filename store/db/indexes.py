@@ -0,0 +1,165 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.collation import Collation, CollationStrength
+
+from store.core.config import settings
+
+PRODUCT_ID_INDEX = "id_unique"
+PRODUCT_TOMBSTONES = "product_tombstones"
+
+# Collation do índice de busca por prefixo; as consultas precisam usar a
+# mesma collation para que o índice seja escolhido
+NAME_COLLATION = Collation(
+    locale=settings.SEARCH_COLLATION_LOCALE, strength=CollationStrength.PRIMARY
+)
+
+# Índices declarados por coleção. Toda consulta feita pelos usecases deve ser
+# coberta por um índice daqui; eles são criados (ou verificados) no startup.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "products": [
+        IndexModel([("id", ASCENDING)], name=PRODUCT_ID_INDEX, unique=True),
+        # Chaves de ordenação da paginação keyset em GET /products/. Cada
+        # filtro de ProductQuery tem um índice que começa pelo campo filtrado.
+        IndexModel(
+            [("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+            name="status_created_at_id",
+        ),
+        IndexModel([("price", ASCENDING), ("id", ASCENDING)], name="price_id"),
+        IndexModel([("quantity", ASCENDING), ("id", ASCENDING)], name="quantity_id"),
+        IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+        # Busca: relevância por texto ("none" desliga stop words e stemming,
+        # que atrapalham nomes como "Iphone 14 pro") e prefixo com collation
+        IndexModel([("name", TEXT)], name="name_text", default_language="none"),
+        IndexModel(
+            [("name", ASCENDING), ("id", ASCENDING)],
+            name="name_id_collated",
+            collation=NAME_COLLATION,
+        ),
+        # updated_since, sort=updated_at e o polling do feed de alterações
+        IndexModel(
+            [("updated_at", ASCENDING), ("id", ASCENDING)], name="updated_at_id"
+        ),
+    ],
+    # Registro das exclusões para o feed de alterações; o TTL limita por
+    # quanto tempo um token antigo ainda vê as exclusões
+    PRODUCT_TOMBSTONES: [
+        IndexModel(
+            [("updated_at", ASCENDING), ("id", ASCENDING)], name="updated_at_id"
+        ),
+        IndexModel(
+            [("updated_at", ASCENDING)],
+            name="updated_at_ttl",
+            expireAfterSeconds=settings.CHANGES_TOMBSTONE_TTL_SECONDS,
+        ),
+    ],
+}
+
+
+@dataclass
+class IndexReport:
+    collection: str
+    missing: List[str] = field(default_factory=list)
+    unused: List[str] = field(default_factory=list)
+
+
+def _key(index: dict) -> tuple:
+    # IndexModel traz a chave como documento; index_information, como lista
+    return tuple(dict(index["key"]).items())
+
+
+def _collation(index: dict) -> Optional[tuple]:
+    # O servidor completa a collation com os defaults (strength 3 inclusive)
+    collation = index.get("collation")
+    if collation is None:
+        return None
+    return collation["locale"], collation.get("strength", 3)
+
+
+def _signature(index: dict) -> tuple:
+    # name_id e name_id_collated têm a mesma chave; só a collation os separa
+    return _key(index), _collation(index)
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """Cria os índices declarados em ``INDEXES``.
+
+    ``create_indexes`` é idempotente: índices que já existem com a mesma
+    especificação são ignorados pelo servidor, e um conflito de opções
+    (ex.: mesmo nome com ``unique`` diferente) levanta ``OperationFailure``.
+    """
+    created = {}
+    for name, models in INDEXES.items():
+        created[name] = await database.get_collection(name).create_indexes(models)
+    return created
+
+
+async def _index_usage(collection: AsyncIOMotorCollection) -> Dict[str, int]:
+    stats = await collection.aggregate([{"$indexStats": {}}]).to_list(length=None)
+    return {stat["name"]: stat["accesses"]["ops"] for stat in stats}
+
+
+async def report_indexes(database: AsyncIOMotorDatabase) -> List[IndexReport]:
+    """Compara os índices declarados com os existentes em cada coleção.
+
+    Um índice é comparado pela chave e pela collation. ``missing`` lista os índices declarados que não existem no banco e
+    ``unused`` os índices existentes sem nenhum acesso desde o último restart
+    do ``mongod`` (segundo ``$indexStats``).
+    """
+    reports = []
+    for name, models in INDEXES.items():
+        collection = database.get_collection(name)
+        existing, usage = await asyncio.gather(
+            collection.index_information(), _index_usage(collection)
+        )
+        existing_signatures = {
+            _signature(info) for info in existing.values() if "key" in info
+        }
+
+        report = IndexReport(collection=name)
+        for model in models:
+            index_name = model.document["name"]
+            # Índices de texto aparecem com a chave interna (_fts, _ftsx), então
+            # o nome com a mesma collation também conta como presença
+            name_found = index_name in existing and _collation(
+                existing[index_name]
+            ) == _collation(model.document)
+            if not name_found and _signature(model.document) not in existing_signatures:
+                report.missing.append(index_name)
+        for index_name, ops in usage.items():
+            if index_name != "_id_" and ops == 0:
+                report.unused.append(index_name)
+
+        reports.append(report)
+    return reports
+
+
+async def main() -> None:
+    import argparse
+
+    from store.db.mongo import db_client
+
+    parser = argparse.ArgumentParser(description="Gerencia os índices do MongoDB.")
+    parser.add_argument(
+        "--create", action="store_true", help="cria os índices que faltam"
+    )
+    args = parser.parse_args()
+
+    database = db_client.get_database()
+    if args.create:
+        await ensure_indexes(database)
+
+    for report in await report_indexes(database):
+        print(f"{report.collection}:")
+        print(f"  missing: {', '.join(report.missing) or '-'}")
+        print(f"  unused:  {', '.join(report.unused) or '-'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
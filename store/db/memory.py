@@ -0,0 +1,1124 @@
+"""Backend em memória com a mesma interface das coleções do Motor.
+
+Os usecases, o feed de alterações, os índices e as migrações falam com o
+banco só pela API de coleção do Motor; este módulo implementa o subconjunto
+dela que o projeto usa, para rodar testes, benchmarks e profiling sem um
+``mongod`` (``DATABASE_BACKEND=memory``).
+
+Semântica preservada:
+
+- documentos passam pelo BSON com ``CODEC_OPTIONS`` na escrita: Decimal,
+  UUID e datas (UTC, milissegundos) voltam exatamente como do driver;
+- filtros, projeções, ordenação, collation, ``$text`` e os estágios de
+  agregação usados aqui seguem as regras do MongoDB, inclusive a ordem de
+  comparação entre tipos do BSON;
+- índices únicos levantam ``DuplicateKeyError``/``BulkWriteError`` com o
+  mesmo formato de ``details``; ``$text`` exige um índice de texto.
+
+Os índices declarados viram índices de verdade: únicos de um campo são
+tabelas hash (busca por ``id`` e ``$in``) e os demais são listas ordenadas,
+usadas quando a ordenação da consulta é um prefixo da chave do índice.
+Índices TTL não expiram documentos e change streams não são suportados (o
+feed cai para polling, como num ``mongod`` standalone).
+"""
+
+import random
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+import bson
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+from store.db.codecs import CODEC_OPTIONS
+from store.models.base import utcnow
+
+Document = Dict[str, Any]
+Key = Callable[[Any], Any]
+
+DUPLICATE_KEY = 11000
+TEXT_INDEX_REQUIRED = 27
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+
+TEXT_SCORE = {"$meta": "textScore"}
+
+# Ordem de comparação entre tipos do BSON
+_NUMBERS = (int, float, Decimal)
+_TYPES = {
+    "null": type(None),
+    "double": float,
+    "string": str,
+    "object": dict,
+    "array": list,
+    "binData": (bytes, UUID),
+    "objectId": ObjectId,
+    "bool": bool,
+    "date": datetime,
+    "int": int,
+    "long": int,
+    "decimal": Decimal,
+}
+
+
+def _normalize(document: Document) -> Document:
+    # Mesma conversão de ida e volta do driver com CODEC_OPTIONS
+    return bson.decode(
+        bson.encode(document, codec_options=CODEC_OPTIONS), codec_options=CODEC_OPTIONS
+    )
+
+
+def _rank(value: Any) -> int:
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, _NUMBERS):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, (bytes, UUID)):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _sort_value(value: Any, key: Key = _identity) -> Tuple[int, Any]:
+    """Chave de ordenação de um valor na ordem do BSON."""
+    rank = _rank(value)
+    if rank == 3:
+        return rank, key(value)
+    if rank == 6 and isinstance(value, UUID):
+        return rank, value.bytes
+    if rank in (4, 5):
+        return rank, repr(value)
+    return rank, value
+
+
+def collation_key(collation: Any) -> Key:
+    """Transforma strings para comparação segundo a ``strength`` da collation."""
+    if collation is None:
+        return _identity
+    document = getattr(collation, "document", collation)
+    strength = document.get("strength", 3)
+    if strength == 1:
+        # Primária: ignora caixa e acentos
+        return lambda value: "".join(
+            char
+            for char in unicodedata.normalize("NFD", value.casefold())
+            if not unicodedata.combining(char)
+        )
+    if strength == 2:
+        return str.casefold
+    return _identity
+
+
+def _get(document: Document, path: str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+class _Top:
+    # Maior que qualquer chave; usado para achar o fim de um range no índice
+    def __lt__(self, other: Any) -> bool:
+        return False
+
+    def __gt__(self, other: Any) -> bool:
+        return True
+
+
+_TOP = _Top()
+
+
+def _compare(left: Any, right: Any, key: Key) -> Optional[int]:
+    # $gt/$lt só comparam valores do mesmo tipo (números entre si)
+    if left is _MISSING or _rank(left) != _rank(right):
+        return None
+    left, right = _sort_value(left, key), _sort_value(right, key)
+    return (left > right) - (left < right)
+
+
+def _equals(value: Any, expected: Any, key: Key) -> bool:
+    if expected is None:
+        return value is None or value is _MISSING
+    if isinstance(value, list) and not isinstance(expected, list):
+        return any(_equals(item, expected, key) for item in value)
+    return _compare(value, expected, key) == 0
+
+
+def _regex(value: Any, condition: dict) -> bool:
+    pattern = condition["$regex"]
+    if isinstance(pattern, str):
+        flags = 0
+        for option in condition.get("$options", ""):
+            flags |= {"i": re.I, "m": re.M, "s": re.S, "x": re.X}[option]
+        pattern = re.compile(pattern, flags)
+    elif isinstance(pattern, bson.Regex):
+        pattern = pattern.try_compile()
+    return isinstance(value, str) and pattern.search(value) is not None
+
+
+def _type(value: Any, names: Any) -> bool:
+    if value is _MISSING:
+        return False
+    for name in names if isinstance(names, list) else [names]:
+        expected = _TYPES[name]
+        if isinstance(value, bool) and expected is int:
+            continue
+        if isinstance(value, expected):
+            return True
+    return False
+
+
+def _matches_condition(value: Any, condition: dict, key: Key) -> bool:
+    for operator, argument in condition.items():
+        if operator == "$eq":
+            ok = _equals(value, argument, key)
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            result = _compare(value, argument, key)
+            ok = (
+                result is not None
+                and {
+                    "$gt": result > 0,
+                    "$gte": result >= 0,
+                    "$lt": result < 0,
+                    "$lte": result <= 0,
+                }[operator]
+            )
+        elif operator == "$in":
+            ok = any(_equals(value, item, key) for item in argument)
+        elif operator == "$exists":
+            ok = (value is not _MISSING) == bool(argument)
+        elif operator == "$regex":
+            ok = _regex(value, condition)
+        elif operator == "$options":
+            continue
+        elif operator == "$type":
+            ok = _type(value, argument)
+        else:
+            raise OperationFailure(f"unknown operator: {operator}", code=2)
+        if not ok:
+            return False
+    return True
+
+
+def _is_operator_document(condition: Any) -> bool:
+    return (
+        isinstance(condition, dict)
+        and bool(condition)
+        and all(name.startswith("$") for name in condition)
+    )
+
+
+def matches(document: Document, filter: dict, key: Key = _identity) -> bool:
+    """Avalia um filtro de consulta do MongoDB sobre ``document``."""
+    for field, condition in filter.items():
+        if field == "$and":
+            ok = all(matches(document, clause, key) for clause in condition)
+        elif field == "$or":
+            ok = any(matches(document, clause, key) for clause in condition)
+        elif field == "$text":
+            # Resolvido pelo cursor, que precisa do índice de texto
+            continue
+        elif field.startswith("$"):
+            raise OperationFailure(f"unknown top level operator: {field}", code=2)
+        elif _is_operator_document(condition):
+            ok = _matches_condition(_get(document, field), condition, key)
+        else:
+            ok = _equals(_get(document, field), condition, key)
+        if not ok:
+            return False
+    return True
+
+
+def _bounds(filter: dict, field: str) -> Tuple[Any, Any]:
+    """Menor e maior valor possíveis de ``field`` segundo o filtro.
+
+    ``_MISSING`` indica ausência de limite. Usado para começar e terminar a
+    leitura de um índice ordenado no trecho que pode conter resultados.
+    """
+    low, high = _MISSING, _MISSING
+
+    def narrow(new_low: Any, new_high: Any) -> None:
+        nonlocal low, high
+        if new_low is not _MISSING and (
+            low is _MISSING or _sort_value(new_low) > _sort_value(low)
+        ):
+            low = new_low
+        if new_high is not _MISSING and (
+            high is _MISSING or _sort_value(new_high) < _sort_value(high)
+        ):
+            high = new_high
+
+    for name, condition in filter.items():
+        if name == "$and":
+            for clause in condition:
+                narrow(*_bounds(clause, field))
+        elif name == "$or":
+            branches = [_bounds(clause, field) for clause in condition]
+            lows = [branch[0] for branch in branches]
+            highs = [branch[1] for branch in branches]
+            narrow(
+                _MISSING if _MISSING in lows else min(lows, key=_sort_value),
+                _MISSING if _MISSING in highs else max(highs, key=_sort_value),
+            )
+        elif name == field:
+            if not _is_operator_document(condition):
+                if condition is not None and not isinstance(condition, list):
+                    narrow(condition, condition)
+                continue
+            for operator, argument in condition.items():
+                if operator in ("$gt", "$gte", "$eq") and argument is not None:
+                    narrow(argument, _MISSING)
+                if operator in ("$lt", "$lte", "$eq") and argument is not None:
+                    narrow(_MISSING, argument)
+    return low, high
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", collation_key({"strength": 1})(text))
+
+
+def _project(document: Document, projection: Optional[dict], score: float) -> Document:
+    if not projection:
+        return dict(document)
+
+    included = [
+        field
+        for field, value in projection.items()
+        if value and not isinstance(value, dict) and field != "_id"
+    ]
+    if included:
+        result = {}
+        if projection.get("_id", True) and "_id" in document:
+            result["_id"] = document["_id"]
+        for field in included:
+            if field in document:
+                result[field] = document[field]
+    else:
+        excluded = {
+            field
+            for field, value in projection.items()
+            if not value and not isinstance(value, dict)
+        }
+        result = {
+            field: value for field, value in document.items() if field not in excluded
+        }
+
+    for field, value in projection.items():
+        if value == TEXT_SCORE:
+            result[field] = score
+    return result
+
+
+class _Index:
+    """Índice declarado por ``create_indexes``."""
+
+    def __init__(self, document: dict) -> None:
+        self.name: str = document["name"]
+        self.fields: List[Tuple[str, Any]] = list(document["key"].items())
+        self.unique: bool = bool(document.get("unique"))
+        self.collation = document.get("collation")
+        self.document = document
+        self.text = any(direction == "text" for _, direction in self.fields)
+        self.key = collation_key(self.collation)
+        # Únicos: valor(es) -> _id; ordenados: [(chave, _id), ...]; texto:
+        # termo -> {_id: score}
+        self.hash: Dict[Any, Any] = {}
+        self.entries: List[Tuple[tuple, Any]] = []
+        self.postings: Dict[str, Dict[Any, float]] = {}
+
+    def hash_key(self, document: Document) -> Any:
+        values = []
+        for field, _ in self.fields:
+            value = _get(document, field)
+            values.append(None if value is _MISSING else value)
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def sort_key(self, document: Document) -> tuple:
+        return tuple(
+            _sort_value(None if value is _MISSING else value, self.key)
+            for value in (_get(document, field) for field, _ in self.fields)
+        )
+
+    def entry(self, document: Document) -> Tuple[tuple, Any]:
+        return self.sort_key(document), _sort_value(document["_id"])
+
+    def term_scores(self, document: Document) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        for field, direction in self.fields:
+            value = _get(document, field)
+            if direction != "text" or not isinstance(value, str):
+                continue
+            tokens = _tokens(value)
+            for term in set(tokens):
+                # Mesma forma do score do MongoDB para um campo de peso 1
+                score = 0.5 * tokens.count(term) / len(tokens) + 0.5
+                scores[term] = scores.get(term, 0.0) + score
+        return scores
+
+    def add(self, document: Document, bulk: bool = False) -> None:
+        """Indexa ``document``; com ``bulk`` quem chama ordena ``entries``."""
+        if self.unique:
+            self.hash[self.hash_key(document)] = document["_id"]
+        if self.text:
+            for term, score in self.term_scores(document).items():
+                self.postings.setdefault(term, {})[document["_id"]] = score
+        elif bulk:
+            self.entries.append(self.entry(document))
+        else:
+            insort(self.entries, self.entry(document))
+
+    def remove(self, document: Document) -> None:
+        if self.unique:
+            self.hash.pop(self.hash_key(document), None)
+        if self.text:
+            for term in self.term_scores(document):
+                postings = self.postings.get(term, {})
+                postings.pop(document["_id"], None)
+                if not postings:
+                    self.postings.pop(term, None)
+        else:
+            entry = self.entry(document)
+            position = bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+
+    def conflict(self, document: Document) -> bool:
+        if not self.unique:
+            return False
+        owner = self.hash.get(self.hash_key(document), _MISSING)
+        return owner is not _MISSING and owner != document["_id"]
+
+
+class MemoryCursor:
+    """Cursor de ``find``/``aggregate``: avaliado no primeiro ``to_list``."""
+
+    def __init__(
+        self,
+        collection: "MemoryCollection",
+        filter: Optional[dict] = None,
+        projection: Optional[dict] = None,
+        documents: Optional[List[Document]] = None,
+    ) -> None:
+        self.collection = collection
+        self.filter = filter or {}
+        self.projection = projection
+        self._documents = documents
+        self._sort: List[Tuple[str, Any]] = []
+        self._skip = 0
+        self._limit = 0
+        self._collation = None
+        self._position = 0
+
+    def sort(self, key_or_list: Any, direction: Any = None) -> "MemoryCursor":
+        if isinstance(key_or_list, str):
+            self._sort = [(key_or_list, direction or 1)]
+        elif isinstance(key_or_list, dict):
+            self._sort = list(key_or_list.items())
+        else:
+            self._sort = list(key_or_list)
+        return self
+
+    def skip(self, skip: int) -> "MemoryCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "MemoryCursor":
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> "MemoryCursor":
+        return self
+
+    def collation(self, collation: Any) -> "MemoryCursor":
+        self._collation = collation
+        return self
+
+    def _evaluate(self) -> List[Document]:
+        if self._documents is None:
+            self._documents = self.collection._find(
+                self.filter,
+                self.projection,
+                self._sort,
+                self._skip,
+                self._limit,
+                self._collation,
+            )
+        return self._documents
+
+    async def to_list(self, length: Optional[int] = None) -> List[Document]:
+        documents = self._evaluate()
+        end = len(documents) if length is None else self._position + length
+        batch = documents[self._position : end]
+        self._position += len(batch)
+        return batch
+
+    def __aiter__(self) -> "MemoryCursor":
+        return self
+
+    async def __anext__(self) -> Document:
+        batch = await self.to_list(1)
+        if not batch:
+            raise StopAsyncIteration
+        return batch[0]
+
+    async def close(self) -> None:
+        self._position = len(self._evaluate())
+
+
+class MemoryChangeStream:
+    # Como num mongod standalone: o erro aparece na primeira leitura
+    resume_token = None
+
+    async def try_next(self) -> None:
+        raise OperationFailure(
+            "The $changeStream stage is only supported on replica sets",
+            code=CHANGE_STREAM_NOT_SUPPORTED,
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCollection:
+    def __init__(self, database: "MemoryDatabase", name: str) -> None:
+        self.database = database
+        self.name = name
+        self.full_name = f"{database.name}.{name}"
+        self._documents: Dict[Any, Document] = {}
+        self._indexes: Dict[str, _Index] = {}
+
+    # Índices
+
+    async def create_indexes(self, indexes: Iterable[Any]) -> List[str]:
+        names = []
+        for model in indexes:
+            document = dict(model.document)
+            current = self._indexes.get(document["name"])
+            if current is not None:
+                if current.document != document:
+                    raise OperationFailure(
+                        f"Index with name: {document['name']} already exists with "
+                        "different options",
+                        code=86,
+                    )
+                names.append(document["name"])
+                continue
+
+            index = _Index(document)
+            for existing in self._documents.values():
+                if index.unique and index.hash_key(existing) in index.hash:
+                    raise self._duplicate(index.name, index.hash_key(existing))
+                index.add(existing, bulk=True)
+            index.entries.sort()
+            self._indexes[index.name] = index
+            names.append(index.name)
+        return names
+
+    async def index_information(self) -> Dict[str, dict]:
+        information = {"_id_": {"v": 2, "key": [("_id", 1)]}}
+        for index in self._indexes.values():
+            information[index.name] = {
+                "v": 2,
+                "key": index.fields,
+                **{
+                    name: value
+                    for name, value in index.document.items()
+                    if name not in ("key", "name")
+                },
+            }
+        return information
+
+    async def drop(self) -> None:
+        self._documents.clear()
+        self._indexes.clear()
+
+    # Escrita
+
+    def _duplicate(self, index: str, key: Any) -> DuplicateKeyError:
+        return DuplicateKeyError(
+            f"E11000 duplicate key error collection: {self.full_name} "
+            f"index: {index} dup key: {key!r}",
+            DUPLICATE_KEY,
+        )
+
+    def _check_unique(self, document: Document) -> None:
+        for index in self._indexes.values():
+            if index.conflict(document):
+                raise self._duplicate(index.name, index.hash_key(document))
+
+    def _insert(self, document: Document) -> Any:
+        # Como o driver, preenche o _id no próprio dicionário recebido
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        stored = _normalize(document)
+        if stored["_id"] in self._documents:
+            raise self._duplicate("_id_", stored["_id"])
+        self._check_unique(stored)
+        self._documents[stored["_id"]] = stored
+        for index in self._indexes.values():
+            index.add(stored)
+        return stored["_id"]
+
+    def _replace(self, old: Document, new: Document) -> None:
+        new = _normalize(new)
+        self._check_unique(new)
+        for index in self._indexes.values():
+            index.remove(old)
+            index.add(new)
+        self._documents[new["_id"]] = new
+
+    def _remove(self, document: Document) -> None:
+        for index in self._indexes.values():
+            index.remove(document)
+        del self._documents[document["_id"]]
+
+    @staticmethod
+    def _apply(document: Document, update: dict) -> Document:
+        if not update or not all(name.startswith("$") for name in update):
+            raise ValueError("update only works with $ operators")
+
+        result = dict(document)
+        for operator, fields in update.items():
+            for field, value in fields.items():
+                if operator == "$set":
+                    result[field] = value
+                elif operator == "$inc":
+                    current = result.get(field, 0)
+                    if not isinstance(current, _NUMBERS) or isinstance(current, bool):
+                        raise OperationFailure(
+                            f"Cannot apply $inc to a value of non-numeric type. "
+                            f"{{_id: {document['_id']!r}}} has the field '{field}' "
+                            "of non-numeric type",
+                            code=14,
+                        )
+                    result[field] = current + value
+                elif operator == "$currentDate":
+                    result[field] = utcnow()
+                else:
+                    raise OperationFailure(f"Unknown modifier: {operator}", code=9)
+        return result
+
+    async def insert_one(self, document: Document, **kwargs: Any) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(
+        self, documents: Iterable[Document], ordered: bool = True, **kwargs: Any
+    ) -> InsertManyResult:
+        inserted, errors = [], []
+        for position, document in enumerate(documents):
+            if "_id" not in document:
+                document["_id"] = ObjectId()
+            stored = _normalize(document)
+            try:
+                if stored["_id"] in self._documents:
+                    raise self._duplicate("_id_", stored["_id"])
+                self._check_unique(stored)
+            except DuplicateKeyError as exc:
+                errors.append(
+                    {
+                        "index": position,
+                        "code": DUPLICATE_KEY,
+                        "errmsg": str(exc),
+                        "op": document,
+                    }
+                )
+                if ordered:
+                    break
+                continue
+
+            self._documents[stored["_id"]] = stored
+            for index in self._indexes.values():
+                index.add(stored, bulk=True)
+            inserted.append(stored["_id"])
+
+        # Um lote reordena cada índice uma única vez, no fim
+        for index in self._indexes.values():
+            index.entries.sort()
+
+        if errors:
+            raise BulkWriteError(
+                {
+                    "writeErrors": errors,
+                    "writeConcernErrors": [],
+                    "nInserted": len(inserted),
+                    "nUpserted": 0,
+                    "nMatched": 0,
+                    "nModified": 0,
+                    "nRemoved": 0,
+                    "upserted": [],
+                }
+            )
+        return InsertManyResult(inserted, True)
+
+    def _update(self, filter: dict, update: dict) -> Tuple[int, int]:
+        found = self._find_documents(filter, limit=1)
+        if not found:
+            return 0, 0
+        updated = self._apply(found[0], update)
+        if updated == found[0]:
+            return 1, 0
+        self._replace(found[0], updated)
+        return 1, 1
+
+    async def update_one(
+        self, filter: dict, update: dict, **kwargs: Any
+    ) -> UpdateResult:
+        matched, modified = self._update(filter, update)
+        return UpdateResult(
+            {"n": matched, "nModified": modified, "updatedExisting": bool(matched)},
+            True,
+        )
+
+    async def find_one_and_update(
+        self,
+        filter: dict,
+        update: dict,
+        projection: Optional[dict] = None,
+        sort: Optional[List[Tuple[str, Any]]] = None,
+        return_document: bool = ReturnDocument.BEFORE,
+        **kwargs: Any,
+    ) -> Optional[Document]:
+        found = self._find_documents(filter, sort=sort or [], limit=1)
+        if not found:
+            return None
+        document = found[0]
+        updated = self._apply(document, update)
+        self._replace(document, updated)
+        result = self._documents[document["_id"]] if return_document else document
+        return _project(result, projection, 0.0)
+
+    async def delete_one(self, filter: dict, **kwargs: Any) -> DeleteResult:
+        found = self._find_documents(filter, limit=1)
+        for document in found:
+            self._remove(document)
+        return DeleteResult({"n": len(found)}, True)
+
+    async def bulk_write(
+        self, requests: Iterable[Any], ordered: bool = True, **kwargs: Any
+    ) -> BulkWriteResult:
+        counts = {"nInserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0}
+        errors = []
+        for position, request in enumerate(requests):
+            try:
+                # Só UpdateOne: é o que os usecases e as migrações enviam
+                if not isinstance(request, UpdateOne):
+                    raise TypeError(f"{request!r} is not a supported request")
+                matched, modified = self._update(request._filter, request._doc)
+                counts["nMatched"] += matched
+                counts["nModified"] += modified
+            except (DuplicateKeyError, OperationFailure) as exc:
+                errors.append(
+                    {
+                        "index": position,
+                        "code": exc.code,
+                        "errmsg": str(exc),
+                        "op": request,
+                    }
+                )
+                if ordered:
+                    break
+
+        result = {
+            **counts,
+            "nUpserted": 0,
+            "upserted": [],
+            "writeErrors": errors,
+            "writeConcernErrors": [],
+        }
+        if errors:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # Leitura
+
+    def find(
+        self, filter: Optional[dict] = None, projection: Optional[dict] = None, **kwargs
+    ) -> MemoryCursor:
+        return MemoryCursor(self, filter, projection)
+
+    async def find_one(
+        self, filter: Optional[dict] = None, projection: Optional[dict] = None, **kwargs
+    ) -> Optional[Document]:
+        result = self._find(filter or {}, projection, kwargs.get("sort") or [], 0, 1)
+        return result[0] if result else None
+
+    async def count_documents(
+        self, filter: dict, limit: int = 0, skip: int = 0, **kwargs: Any
+    ) -> int:
+        return len(self._find_documents(filter, skip=skip, limit=limit))
+
+    def aggregate(self, pipeline: List[dict], **kwargs: Any) -> MemoryCursor:
+        documents = [dict(document) for document in self._documents.values()]
+        return MemoryCursor(self, documents=self._pipeline(documents, pipeline))
+
+    def _text_scores(self, filter: dict) -> Dict[Any, float]:
+        index = next((index for index in self._indexes.values() if index.text), None)
+        if index is None:
+            raise OperationFailure(
+                "text index required for $text query", code=TEXT_INDEX_REQUIRED
+            )
+
+        # Qualquer termo casa; o score soma o de cada termo encontrado
+        scores: Dict[Any, float] = {}
+        for term in set(_tokens(filter["$text"]["$search"])):
+            for id, score in index.postings.get(term, {}).items():
+                scores[id] = scores.get(id, 0.0) + score
+        return scores
+
+    def _index_for(self, sort: List[Tuple[str, Any]], collation: Any) -> Any:
+        """Índice ordenado cuja chave começa pelos campos da ordenação.
+
+        As entradas ficam sempre em ordem crescente de todos os campos, então
+        o índice atende ordenações todas crescentes (lido do início) ou todas
+        decrescentes (lido do fim). Devolve ``(índice, reverso)`` ou None.
+        """
+        directions = {direction for _, direction in sort}
+        if directions not in ({1}, {-1}):
+            return None
+        wanted = collation.document if collation is not None else None
+        fields = [field for field, _ in sort]
+        for index in self._indexes.values():
+            if index.text or index.collation != wanted:
+                continue
+            if [field for field, _ in index.fields[: len(fields)]] == fields:
+                return index, directions == {-1}
+        return None
+
+    def _scan(
+        self, filter: dict, sort: List[Tuple[str, Any]], collation: Any
+    ) -> Tuple[Iterator[Document], bool]:
+        """Escolhe como percorrer a coleção; indica se a saída já está ordenada."""
+        # Igualdade ou $in num índice único de um campo: busca na tabela hash
+        for index in self._indexes.values():
+            if not index.unique or len(index.fields) != 1 or collation is not None:
+                continue
+            condition = filter.get(index.fields[0][0], _MISSING)
+            if condition is _MISSING:
+                continue
+            if _is_operator_document(condition):
+                if set(condition) != {"$in"}:
+                    continue
+                values = condition["$in"]
+            else:
+                values = [condition]
+            ids = []
+            for value in values:
+                try:
+                    owner = index.hash.get(value, _MISSING)
+                except TypeError:
+                    break
+                if owner is not _MISSING and owner not in ids:
+                    ids.append(owner)
+            else:
+                return (self._documents[id] for id in ids), False
+
+        if "_id" in filter and not _is_operator_document(filter["_id"]):
+            document = self._documents.get(filter["_id"])
+            return iter([document] if document else []), False
+
+        # Ordenação coberta por um índice: percorre só o trecho do range
+        if sort:
+            found = self._index_for(sort, collation)
+            if found is not None:
+                index, reverse = found
+                field = index.fields[0][0]
+                low, high = _bounds(filter, field)
+                entries = index.entries
+                start, end = 0, len(entries)
+                if low is not _MISSING:
+                    start = bisect_left(entries, ((_sort_value(low, index.key),),))
+                if high is not _MISSING:
+                    end = bisect_left(entries, ((_sort_value(high, index.key), _TOP),))
+                selected = entries[start:end]
+                if reverse:
+                    selected = reversed(selected)
+                return (self._documents[id[1]] for _, id in selected), True
+
+        return iter(list(self._documents.values())), False
+
+    def _find_documents(
+        self,
+        filter: dict,
+        sort: Optional[List[Tuple[str, Any]]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        collation: Any = None,
+        scores: Optional[Dict[Any, float]] = None,
+    ) -> List[Document]:
+        filter = _normalize(filter) if filter else {}
+        sort = sort or []
+        key = collation_key(collation)
+        text_sort = [field for field, direction in sort if direction == TEXT_SCORE]
+
+        if scores is not None:
+            candidates: Iterator[Document] = (
+                self._documents[id] for id in scores if id in self._documents
+            )
+            ordered = False
+        else:
+            candidates, ordered = self._scan(filter, sort, collation)
+
+        if ordered:
+            # Já vem na ordem do índice: para assim que tiver o suficiente
+            found = []
+            for document in candidates:
+                if matches(document, filter, key):
+                    found.append(document)
+                    if limit and len(found) == skip + limit:
+                        break
+            return found[skip:]
+
+        found = [document for document in candidates if matches(document, filter, key)]
+        for field, direction in reversed(sort):
+            if field in text_sort:
+                found.sort(key=lambda document: scores[document["_id"]], reverse=True)
+            else:
+                found.sort(
+                    key=lambda document, field=field: _sort_value(
+                        None
+                        if _get(document, field) is _MISSING
+                        else _get(document, field),
+                        key,
+                    ),
+                    reverse=direction == -1,
+                )
+        return found[skip : skip + limit if limit else None]
+
+    def _find(
+        self,
+        filter: dict,
+        projection: Optional[dict],
+        sort: List[Tuple[str, Any]],
+        skip: int,
+        limit: int,
+        collation: Any = None,
+    ) -> List[Document]:
+        scores = self._text_scores(filter) if "$text" in filter else None
+        documents = self._find_documents(filter, sort, skip, limit, collation, scores)
+        return [
+            _project(
+                document, projection, scores.get(document["_id"], 0.0) if scores else 0
+            )
+            for document in documents
+        ]
+
+    # Agregação
+
+    def _pipeline(self, documents: List[Document], pipeline: List[dict]) -> list:
+        for stage in pipeline:
+            ((name, spec),) = stage.items()
+            if name == "$match":
+                spec = _normalize(spec)
+                documents = [
+                    document for document in documents if matches(document, spec)
+                ]
+            elif name == "$project":
+                documents = [_project(document, spec, 0.0) for document in documents]
+            elif name == "$sort":
+                for field, direction in reversed(list(spec.items())):
+                    documents.sort(
+                        key=lambda document, field=field: _sort_value(
+                            None
+                            if _get(document, field) is _MISSING
+                            else _get(document, field)
+                        ),
+                        reverse=direction == -1,
+                    )
+            elif name == "$sample":
+                documents = random.sample(documents, min(spec["size"], len(documents)))
+            elif name == "$group":
+                documents = _group(documents, spec["_id"], spec)
+            elif name == "$bucket":
+                documents = _bucket(documents, spec)
+            elif name == "$facet":
+                documents = [
+                    {
+                        field: self._pipeline(
+                            [dict(item) for item in documents], stages
+                        )
+                        for field, stages in spec.items()
+                    }
+                ]
+            elif name == "$indexStats":
+                documents = [
+                    {"name": name, "accesses": {"ops": 0}}
+                    for name in ["_id_", *self._indexes]
+                ]
+            else:
+                raise OperationFailure(
+                    f"Unrecognized pipeline stage name: '{name}'", code=40324
+                )
+        return documents
+
+
+def evaluate(expression: Any, document: Document) -> Any:
+    """Avalia uma expressão de agregação (campo, literal ou operador)."""
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _get(document, expression[1:])
+        return None if value is _MISSING else value
+    if isinstance(expression, dict) and len(expression) == 1:
+        ((operator, arguments),) = expression.items()
+        if operator == "$multiply":
+            values = [evaluate(argument, document) for argument in arguments]
+            if any(value is None for value in values):
+                return None
+            result = values[0]
+            for value in values[1:]:
+                result = result * value
+            return result
+    return expression
+
+
+def _accumulate(operator: str, values: List[Any]) -> Any:
+    numbers = [
+        value
+        for value in values
+        if isinstance(value, _NUMBERS) and not isinstance(value, bool)
+    ]
+    if operator == "$sum":
+        return sum(numbers, 0)
+    if operator == "$avg":
+        return sum(numbers, 0) / len(numbers) if numbers else None
+    present = [value for value in values if value is not None]
+    if operator == "$min":
+        return min(present, key=_sort_value) if present else None
+    if operator == "$max":
+        return max(present, key=_sort_value) if present else None
+    raise OperationFailure(f"Unknown group operator '{operator}'", code=15952)
+
+
+def _outputs(documents: List[Document], output: dict) -> Document:
+    result = {}
+    for field, accumulator in output.items():
+        ((operator, expression),) = accumulator.items()
+        result[field] = _accumulate(
+            operator, [evaluate(expression, document) for document in documents]
+        )
+    return result
+
+
+def _group(documents: List[Document], id: Any, spec: dict) -> List[Document]:
+    groups: Dict[Any, List[Document]] = {}
+    keys: Dict[Any, Any] = {}
+    for document in documents:
+        value = evaluate(id, document)
+        group = repr(_sort_value(value))
+        keys.setdefault(group, value)
+        groups.setdefault(group, []).append(document)
+
+    output = {field: value for field, value in spec.items() if field != "_id"}
+    return [
+        {"_id": keys[group], **_outputs(items, output)}
+        for group, items in groups.items()
+    ]
+
+
+def _bucket(documents: List[Document], spec: dict) -> List[Document]:
+    boundaries = spec["boundaries"]
+    default = spec.get("default", _MISSING)
+    output = spec.get("output", {"count": {"$sum": 1}})
+    buckets: Dict[int, List[Document]] = {}
+    for document in documents:
+        value = evaluate(spec["groupBy"], document)
+        position = len(boundaries)
+        if value is not None and _rank(value) == _rank(boundaries[0]):
+            for candidate, (low, high) in enumerate(zip(boundaries, boundaries[1:])):
+                if low <= value < high:
+                    position = candidate
+                    break
+        if position == len(boundaries) and default is _MISSING:
+            raise OperationFailure(
+                "$bucket could not find a matching branch for an input, and no "
+                "default was specified.",
+                code=40066,
+            )
+        buckets.setdefault(position, []).append(document)
+
+    return [
+        {
+            "_id": default if position == len(boundaries) else boundaries[position],
+            **_outputs(buckets[position], output),
+        }
+        for position in sorted(buckets)
+    ]
+
+
+class MemoryDatabase:
+    def __init__(self, client: "MemoryClient", name: str) -> None:
+        self.client = client
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def get_collection(self, name: str, **kwargs: Any) -> MemoryCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = MemoryCollection(self, name)
+        return collection
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        return self.get_collection(name)
+
+    def watch(self, *args: Any, **kwargs: Any) -> MemoryChangeStream:
+        return MemoryChangeStream()
+
+
+class MemoryClient:
+    """Substituto do ``AsyncIOMotorClient``; cada instância tem seus dados."""
+
+    def __init__(self) -> None:
+        self._databases: Dict[str, MemoryDatabase] = {}
+
+    def get_database(self, name: Optional[str] = None, **kwargs: Any) -> MemoryDatabase:
+        name = name or "store"
+        database = self._databases.get(name)
+        if database is None:
+            database = self._databases[name] = MemoryDatabase(self, name)
+        return database
+
+    def get_default_database(
+        self, default: Optional[str] = None, **kwargs: Any
+    ) -> MemoryDatabase:
+        return self.get_database(default)
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        return self.get_database(name)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict
+from uuid import UUID
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+# Documentos gravados antes do CODEC_OPTIONS: id como string, datas como
+# isoformat e, eventualmente, preço como string ou float
+LEGACY_FILTER = {
+    "$or": [
+        {"id": {"$type": "string"}},
+        {"created_at": {"$type": "string"}},
+        {"updated_at": {"$type": "string"}},
+        {"price": {"$type": ["string", "double"]}},
+    ]
+}
+
+
+def convert_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Retorna os campos de ``document`` que precisam ser regravados."""
+    changes: Dict[str, Any] = {}
+    if isinstance(document.get("id"), str):
+        changes["id"] = UUID(document["id"])
+    for key in ("created_at", "updated_at"):
+        if isinstance(document.get(key), str):
+            changes[key] = datetime.fromisoformat(document[key])
+    if isinstance(document.get("price"), (str, float)):
+        changes["price"] = Decimal(str(document["price"]))
+    return changes
+
+
+async def migrate_products(
+    collection: AsyncIOMotorCollection, batch_size: int = 1000, dry_run: bool = False
+) -> int:
+    """Converte os documentos legados para tipos BSON nativos em lotes.
+
+    Cada lote vira um único ``bulk_write`` não ordenado. Como o filtro só
+    seleciona documentos ainda não convertidos, a migração pode ser
+    interrompida e executada de novo sem repetir trabalho.
+    """
+    migrated = 0
+    cursor = collection.find(LEGACY_FILTER).sort("_id").batch_size(batch_size)
+    while batch := await cursor.to_list(length=batch_size):
+        operations = [
+            UpdateOne({"_id": document["_id"]}, {"$set": convert_document(document)})
+            for document in batch
+        ]
+        if not dry_run:
+            await collection.bulk_write(operations, ordered=False)
+        migrated += len(operations)
+    return migrated
+
+
+async def main() -> None:
+    import argparse
+
+    from store.db.mongo import db_client
+
+    parser = argparse.ArgumentParser(
+        description="Converte produtos legados para tipos BSON nativos."
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="só conta os documentos")
+    args = parser.parse_args()
+
+    collection = db_client.get_database().get_collection("products")
+    migrated = await migrate_products(
+        collection, batch_size=args.batch_size, dry_run=args.dry_run
+    )
+    print(
+        f"products: {migrated} documentos {'a migrar' if args.dry_run else 'migrados'}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
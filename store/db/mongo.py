@@ -1,17 +1,60 @@
+from typing import Any, Dict, Optional
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 from store.core.config import settings
+from store.db.codecs import CODEC_OPTIONS
+from store.db.memory import MemoryClient
+from store.db.monitoring import CommandStats, PoolStats
+
+
+def client_options() -> Dict[str, Any]:
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "compressors": settings.MONGO_COMPRESSORS or None,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+    }
+    # Opções não configuradas ficam com o default do driver (ou da URL)
+    return {key: value for key, value in options.items() if value is not None}
 
 
 class MongoClient:
     def __init__(self) -> None:
-        self.client = AsyncIOMotorClient(settings.MONGO_URL)
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.pool_stats = PoolStats()
+        self.command_stats = CommandStats()
 
-    def get(self) -> AsyncIOMotorClient:
+    def connect(self) -> AsyncIOMotorClient:
+        # O Motor só abre conexões na primeira operação; aqui o client é só
+        # configurado, por isso pode ser chamado fora de um event loop
+        if self.client is None:
+            if settings.DATABASE_BACKEND == "memory":
+                # Mesma interface do Motor; sem pool nem comandos para monitorar
+                self.client = MemoryClient()
+            else:
+                self.client = AsyncIOMotorClient(
+                    settings.MONGO_URL,
+                    event_listeners=[self.pool_stats, self.command_stats],
+                    **client_options(),
+                )
         return self.client
 
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def get(self) -> AsyncIOMotorClient:
+        return self.connect()
+
     def get_database(self) -> AsyncIOMotorDatabase:
-        return self.client.get_database("store")
+        return self.get().get_default_database("store", codec_options=CODEC_OPTIONS)
 
 
 db_client = MongoClient()
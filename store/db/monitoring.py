@@ -0,0 +1,130 @@
+import threading
+from typing import Dict
+
+from pymongo import monitoring
+
+from store.core.metrics import current_request, metrics
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Contadores do pool de conexões alimentados pelos eventos do driver.
+
+    Os eventos chegam das threads do Motor, por isso as atualizações são
+    protegidas por um lock. ``snapshot()`` devolve os valores atuais para
+    dimensionar ``MONGO_MAX_POOL_SIZE``/``MONGO_MIN_POOL_SIZE`` com dados reais.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.pools = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts_started = 0
+        self.checked_out = 0
+        self.checked_in = 0
+        self.checkout_failures = 0
+        self.max_in_use = 0
+        self.max_waiting = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def in_use(self) -> int:
+        return self.checked_out - self.checked_in
+
+    @property
+    def waiting(self) -> int:
+        return self.checkouts_started - self.checked_out - self.checkout_failures
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "pools": self.pools,
+                "connections_open": self.created - self.closed,
+                "connections_in_use": self.in_use,
+                "connections_in_use_max": self.max_in_use,
+                "waiting": self.waiting,
+                "waiting_max": self.max_waiting,
+                "checkouts": self.checked_out,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_ms_avg": (
+                    self.wait_time_total / self.checked_out * 1000
+                    if self.checked_out
+                    else 0.0
+                ),
+                "checkout_wait_ms_max": self.wait_time_max * 1000,
+            }
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        with self._lock:
+            self.pools -= 1
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self.created += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self.closed += 1
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        with self._lock:
+            self.checkouts_started += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        with self._lock:
+            self.checked_out += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            if event.duration is not None:
+                self.wait_time_total += event.duration
+                self.wait_time_max = max(self.wait_time_max, event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self.checked_in += 1
+
+
+class CommandStats(monitoring.CommandListener):
+    """Atribui o tempo e a contagem de comandos à requisição que os causou.
+
+    Os eventos de sucesso e falha já trazem a duração medida pelo driver; o
+    evento de início não é usado. Fora de uma requisição os comandos vão para
+    ``metrics.background``.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def _record(self, event) -> None:
+        context = current_request.get() or metrics.background
+        context.add_command(event.command_name, event.duration_micros / 1e6)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._record(event)
@@ -1,6 +1,73 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-app = FastAPI(title="Store API", version="0.0.1")
+from store.core.admission import AdmissionMiddleware
+from store.core.cache import build_cache
+from store.core.compression import add_compression
+from store.core.config import settings
+from store.core.metrics import MetricsMiddleware
+from store.core.responses import FastJSONResponse
+from store.core.schemas.product import ProductOut, ProductStats
+from store.db.indexes import PRODUCT_TOMBSTONES, ensure_indexes
+from store.db.mongo import db_client
+from store.usecases.changes import ProductChangeFeed
+from store.usecases.product import ProductUseCase
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db_client.connect()
+    database = db_client.get_database()
+    if settings.MONGO_CREATE_INDEXES:
+        await ensure_indexes(database)
+
+    app.state.database = database
+    app.state.product_collection = database.get_collection("products")
+    app.state.product_cache = (
+        build_cache(model=ProductOut, prefix="store:product:")
+        if settings.CACHE_PRODUCTS_ENABLED
+        else None
+    )
+    app.state.stats_cache = build_cache(
+        model=ProductStats,
+        prefix="store:stats:",
+        ttl=settings.STATS_CACHE_TTL_SECONDS,
+    )
+    product_tombstones = database.get_collection(PRODUCT_TOMBSTONES)
+    app.state.product_usecase = ProductUseCase(
+        collection=app.state.product_collection,
+        cache=app.state.product_cache,
+        tombstones=product_tombstones,
+        stats_cache=app.state.stats_cache,
+    )
+    app.state.product_changes = ProductChangeFeed(
+        collection=app.state.product_collection, tombstones=product_tombstones
+    )
+    yield
+
+    for cache in (app.state.product_cache, app.state.stats_cache):
+        if cache is not None:
+            await cache.close()
+    db_client.close()
+
+
+app = FastAPI(
+    title="Store API",
+    version="0.0.1",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+# Adicionado antes das métricas para que a latência medida inclua a compressão
+add_compression(app)
+
+# Dentro das métricas, para que os 503 do controle de admissão sejam medidos
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Importar e incluir as rotas após a criação do app
 try:
@@ -1,22 +1,18 @@
 from datetime import datetime, timezone
-from decimal import Decimal
-from typing import Any
 import uuid
-from bson import Decimal128
-from pydantic import UUID4, BaseModel, Field, model_serializer
+from pydantic import UUID4, BaseModel, Field
 
 
-class CreateBaseModel(BaseModel):
-    id: UUID4 = Field(default_factory=uuid.uuid4)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-    @model_serializer
-    def set_model(self) -> dict[str, Any]:
-        self_dict = dict(self)
+def utcnow() -> datetime:
+    # BSON date tem precisão de milissegundos; truncar aqui mantém o valor
+    # devolvido na criação igual ao lido depois do banco
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
 
-        for key, value in self_dict.items():
-            if isinstance(value, Decimal):
-                self_dict[key] = Decimal128(str(value))
 
-        return self_dict
+class CreateBaseModel(BaseModel):
+    # Sem serializer próprio: Decimal vira Decimal128 no DecimalCodec do
+    # CODEC_OPTIONS, então model_dump() fica todo no pydantic-core
+    id: UUID4 = Field(default_factory=uuid.uuid4)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
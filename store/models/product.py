@@ -1,6 +1,9 @@
+from pydantic import Field
+
 from store.core.schemas.product import ProductIn
 from store.models.base import CreateBaseModel
 
 
 class ProductModel(ProductIn, CreateBaseModel):
-    ...
+    # Incrementada a cada escrita; base do controle de concorrência otimista
+    version: int = Field(default=1)
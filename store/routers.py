@@ -1,5 +1,9 @@
 from fastapi import APIRouter
+from store.controllers.health import router as health
+from store.controllers.metrics import router as metrics
 from store.controllers.product import router as product
 
 api_router = APIRouter()
+api_router.include_router(health)
+api_router.include_router(metrics)
 api_router.include_router(product, prefix="/products")
@@ -0,0 +1,124 @@
+import argparse
+import os
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+
+from store.core.config import settings
+
+APP = "store.main:app"
+
+
+def default_workers() -> int:
+    """Um worker por núcleo disponível para o processo.
+
+    ``sched_getaffinity`` respeita o cpuset do container (``--cpuset-cpus``),
+    ao contrário de ``cpu_count``, que devolve os núcleos da máquina.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS e Windows
+        return os.cpu_count() or 1
+
+
+def _installed(preferred: str, fallback: str) -> str:
+    return preferred if find_spec(preferred) is not None else fallback
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Servidor de produção da Store API.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS or default_workers(),
+        help="processos do servidor (padrão: um por núcleo)",
+    )
+    parser.add_argument(
+        "--loop", choices=["auto", "asyncio", "uvloop"], default=settings.SERVER_LOOP
+    )
+    parser.add_argument(
+        "--http", choices=["auto", "h11", "httptools"], default=settings.SERVER_HTTP
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        help="segundos para terminar as requisições em andamento no shutdown",
+    )
+    parser.add_argument(
+        "--access-log",
+        action=argparse.BooleanOptionalAction,
+        default=settings.SERVER_ACCESS_LOG,
+    )
+    return parser.parse_args(argv)
+
+
+def build_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Argumentos de ``uvicorn.run`` a partir da linha de comando."""
+    workers = max(args.workers, 1)
+    if settings.DATABASE_BACKEND == "memory" and workers > 1:
+        # Cada processo teria o próprio banco: escritas sumiriam entre workers
+        print("⚠️ DATABASE_BACKEND=memory: usando um único worker")
+        workers = 1
+
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": workers,
+        "loop": _installed("uvloop", "asyncio") if args.loop == "auto" else args.loop,
+        "http": (_installed("httptools", "h11") if args.http == "auto" else args.http),
+        "lifespan": "on",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE_SECONDS,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "access_log": args.access_log,
+    }
+
+
+def worker_environment(workers: int) -> Dict[str, str]:
+    """Variáveis de ambiente que os workers herdam do processo principal.
+
+    Os workers importam ``settings`` de novo, então é pelo ambiente que o
+    launcher ajusta o que não funciona com mais de um processo.
+    """
+    if workers == 1:
+        return {}
+    environment = {"METRICS_WORKER_LABEL": "true"}
+    if settings.CACHE_BACKEND == "memory":
+        # Um PATCH em um worker não invalidaria a cópia dos outros: produto e
+        # ETag velhos por até CACHE_TTL_SECONDS, quebrando o If-Match. O cache
+        # de stats não depende de invalidação e continua por worker
+        print("⚠️ CACHE_BACKEND=memory com vários workers: cache de produtos desligado")
+        environment["CACHE_PRODUCTS_ENABLED"] = "false"
+    return environment
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point ``store-server``.
+
+    Com mais de um worker o uvicorn sobe um supervisor que reinicia workers
+    que morrem e, no SIGINT/SIGTERM, repassa o sinal: cada worker para de
+    aceitar conexões e espera as requisições em andamento por até
+    ``--graceful-timeout`` segundos antes de rodar o shutdown do lifespan.
+    """
+    config = build_config(parse_args(argv))
+    os.environ.update(worker_environment(config["workers"]))
+
+    # Os workers são processos novos (spawn) e importam o app de novo, mas
+    # importar aqui primeiro faz erros de import e de configuração aparecerem
+    # antes de subir os workers; com um worker só, o app importado é usado
+    from store.main import app
+
+    print(
+        f"🚀 {APP} em {config['host']}:{config['port']} com "
+        f"{config['workers']} worker(s), loop={config['loop']}, "
+        f"http={config['http']}"
+    )
+    uvicorn.run(app if config["workers"] == 1 else APP, **config)
+
+
+if __name__ == "__main__":
+    main()
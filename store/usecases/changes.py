@@ -0,0 +1,232 @@
+import asyncio
+import heapq
+from contextlib import aclosing
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+import pymongo
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure
+
+from store.core.config import settings
+from store.core.exceptions import InvalidCursorException
+from store.core.pagination import Sort, decode_cursor, encode_cursor, keyset_filter
+from store.core.schemas.product import ProductChange, ProductChangePage, ProductOut
+from store.models.base import utcnow
+
+# Chaves dos tokens de cada backend: o resume token do change stream ou a
+# posição (updated_at, id) do polling
+STREAM_KEY: Sort = [("resume", pymongo.ASCENDING)]
+POLL_KEY: Sort = [("updated_at", pymongo.ASCENDING), ("id", pymongo.ASCENDING)]
+
+# "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+
+Position = Tuple[Optional[ProductChange], str]
+
+
+class ProductChangeFeed:
+    """Feed de criações, alterações e exclusões de produtos.
+
+    Com change streams (replica set ou sharded cluster) os eventos vêm do
+    oplog e o token é o resume token do servidor. Num ``mongod`` standalone o
+    feed consulta ``updated_at`` periodicamente; só são lidas escritas mais
+    antigas que ``CHANGES_POLL_LAG_SECONDS``, para que uma escrita com
+    ``updated_at`` menor, mas confirmada depois, não seja pulada. Criações,
+    tombstones e esse corte usam o relógio da instância da API, então o lag
+    também precisa cobrir a diferença de relógio entre as instâncias e o
+    MongoDB; sem isso, o polling pode pular eventos.
+
+    Exclusões não deixam documento para trás, então os usecases gravam um
+    tombstone ``{id, updated_at}`` em ``tombstones``; os dois backends leem
+    as exclusões de lá.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        tombstones: AsyncIOMotorCollection,
+        backend: str = settings.CHANGES_BACKEND,
+        batch_size: int = settings.PRODUCTS_PAGE_SIZE,
+    ) -> None:
+        self.collection = collection
+        self.tombstones = tombstones
+        self.backend = backend
+        self.batch_size = batch_size
+
+    def parse(self, token: Optional[str]) -> Tuple[str, Optional[list]]:
+        """Identifica o backend de um token; levanta InvalidCursorException."""
+        if not token:
+            return self.backend, None
+        for backend, key in (("change_stream", STREAM_KEY), ("polling", POLL_KEY)):
+            try:
+                values = decode_cursor(key, token)
+            except InvalidCursorException:
+                continue
+            if self.backend in ("auto", backend):
+                return backend, values
+        raise InvalidCursorException(message="Invalid cursor")
+
+    async def changes(self, since: Optional[str] = None) -> AsyncIterator[Position]:
+        """Gera ``(change, token)`` a partir de ``since``, indefinidamente.
+
+        Quando não há nada novo gera ``(None, token)``, para que quem consome
+        possa respeitar prazos e mandar heartbeats.
+        """
+        backend, values = self.parse(since)
+
+        if backend != "polling":
+            stream = self.collection.database.watch(
+                self._pipeline(),
+                full_document="updateLookup",
+                resume_after={"_data": values[0]} if values else None,
+                max_await_time_ms=int(settings.CHANGES_POLL_INTERVAL_SECONDS * 1000),
+            )
+            try:
+                event = await stream.try_next()
+            except OperationFailure as exc:
+                await stream.close()
+                if backend != "auto" or exc.code != CHANGE_STREAM_NOT_SUPPORTED:
+                    raise
+                # Standalone: passa a usar polling nas próximas chamadas
+                self.backend = backend = "polling"
+            else:
+                async with aclosing(self._watch(stream, event, since)) as events:
+                    async for position in events:
+                        yield position
+                return
+
+        async for position in self._poll(values):
+            yield position
+
+    async def read(
+        self, since: Optional[str], limit: int, timeout: float
+    ) -> ProductChangePage:
+        """Long-poll: espera até ``timeout`` segundos pela primeira alteração."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        changes: List[ProductChange] = []
+        token = since
+
+        async with aclosing(self.changes(since)) as positions:
+            async for change, token in positions:
+                if change is not None:
+                    changes.append(change)
+                    if len(changes) >= limit:
+                        break
+                elif changes or loop.time() >= deadline:
+                    break
+
+        return ProductChangePage(changes=changes, next=token)
+
+    def _pipeline(self) -> list:
+        # Alterações em produtos e inserções de tombstones; o delete do
+        # produto em si é ignorado porque não traz o "id" do documento
+        return [
+            {
+                "$match": {
+                    "$or": [
+                        {
+                            "ns.coll": self.collection.name,
+                            "operationType": {"$in": ["insert", "update", "replace"]},
+                        },
+                        {"ns.coll": self.tombstones.name, "operationType": "insert"},
+                    ]
+                }
+            }
+        ]
+
+    async def _watch(self, stream, event: Optional[dict], since: Optional[str]):
+        try:
+            while True:
+                if event is None:
+                    resume_token = stream.resume_token
+                    if resume_token is not None:
+                        since = encode_cursor(STREAM_KEY, [resume_token["_data"]])
+                    yield None, since
+                else:
+                    since = encode_cursor(STREAM_KEY, [event["_id"]["_data"]])
+                    change = self._from_event(event, since)
+                    if change is not None:
+                        yield change, since
+                event = await stream.try_next()
+        finally:
+            await stream.close()
+
+    def _from_event(self, event: dict, token: str) -> Optional[ProductChange]:
+        document = event.get("fullDocument")
+        if document is None:
+            # Produto excluído antes do lookup; o tombstone vem logo depois
+            return None
+        document.pop("_id", None)
+
+        if event["ns"]["coll"] == self.tombstones.name:
+            return ProductChange(
+                op="delete", id=document["id"], at=document["updated_at"], token=token
+            )
+        return ProductChange(
+            op="create" if event["operationType"] == "insert" else "update",
+            id=document["id"],
+            at=document["updated_at"],
+            product=ProductOut(**document),
+            token=token,
+        )
+
+    async def _fetch(self, collection: AsyncIOMotorCollection, filter: dict):
+        return (
+            await collection.find(filter, {"_id": False})
+            .sort(POLL_KEY)
+            .limit(self.batch_size)
+            .to_list(length=self.batch_size)
+        )
+
+    async def _poll(self, values: Optional[list]) -> AsyncIterator[Position]:
+        lag = timedelta(seconds=settings.CHANGES_POLL_LAG_SECONDS)
+        if values is None:
+            values = [utcnow() - lag, UUID(int=0)]
+
+        while True:
+            filter = {
+                "$and": [
+                    keyset_filter(POLL_KEY, values),
+                    {"updated_at": {"$lte": utcnow() - lag}},
+                ]
+            }
+            products, tombstones = await asyncio.gather(
+                self._fetch(self.collection, filter),
+                self._fetch(self.tombstones, filter),
+            )
+
+            # Cada lista traz os batch_size menores da sua coleção, então o
+            # prefixo da intercalação é a ordem global correta
+            rows = heapq.merge(
+                ((False, row) for row in products),
+                ((True, row) for row in tombstones),
+                key=lambda item: (item[1]["updated_at"], item[1]["id"]),
+            )
+            count = 0
+            for deleted, row in rows:
+                if count == self.batch_size:
+                    break
+                count += 1
+                values = [row["updated_at"], row["id"]]
+                token = encode_cursor(POLL_KEY, values)
+                if deleted:
+                    yield ProductChange(
+                        op="delete", id=row["id"], at=row["updated_at"], token=token
+                    ), token
+                else:
+                    yield ProductChange(
+                        op="create"
+                        if row["created_at"] == row["updated_at"]
+                        else "update",
+                        id=row["id"],
+                        at=row["updated_at"],
+                        product=ProductOut(**row),
+                        token=token,
+                    ), token
+
+            if count < self.batch_size:
+                yield None, encode_cursor(POLL_KEY, values)
+                await asyncio.sleep(settings.CHANGES_POLL_INTERVAL_SECONDS)
@@ -1,120 +1,661 @@
-from typing import List
+import asyncio
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
 from uuid import UUID
-from datetime import datetime
-from motor.motor_asyncio import (
-    AsyncIOMotorClient,
-    AsyncIOMotorDatabase,
-    AsyncIOMotorCollection,
-)
+from motor.motor_asyncio import AsyncIOMotorCollection
 import pymongo
+from pymongo.errors import BulkWriteError, WriteError
 
-from store.core.exceptions import NotFoundException
+from store.core.cache import Cache
+from store.core.config import settings
+from store.core.etag import page_etag
+from store.core.exceptions import (
+    EmptyUpdateException,
+    InsufficientStockException,
+    NotFoundException,
+    VersionConflictException,
+)
+from store.core.loader import DataLoader
+from store.core.pagination import Sort, decode_cursor, encode_cursor, keyset_filter
 from store.core.schemas.product import (
+    BulkItemResult,
+    BulkResult,
+    PriceBucket,
+    ProductLookupItem,
+    ProductLookupResult,
+    ProductBulkUpdate,
     ProductIn,
     ProductOut,
+    ProductPage,
+    ProductPartialOut,
+    ProductQuery,
+    ProductSearch,
+    ProductStats,
+    ProductStockAdjustment,
     ProductUpdate,
     ProductUpdateOut,
+    StatusStats,
 )
-from store.db.mongo import db_client
+from store.core.singleflight import SingleFlight
+from store.db.indexes import NAME_COLLATION
+from store.models.base import utcnow
 from store.models.product import ProductModel
 
 
 class ProductUseCase:
-    def __init__(self) -> None:
-        self.client: AsyncIOMotorClient = db_client.get()
-        self.database: AsyncIOMotorDatabase = self.client.get_database()
-        self.collection: AsyncIOMotorCollection = self.database.get_collection(
-            "products"
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        cache: Optional[Cache] = None,
+        tombstones: Optional[AsyncIOMotorCollection] = None,
+        stats_cache: Optional[Cache] = None,
+    ) -> None:
+        self.collection = collection
+        self.cache = cache
+        self.stats_cache = stats_cache
+        # Registro de exclusões lido pelo feed de alterações (store.usecases.changes)
+        self.tombstones = tombstones
+        # get() concorrentes na mesma iteração do loop viram um único $in
+        self.loader: DataLoader[UUID, Optional[ProductOut]] = DataLoader(
+            self.get_many, max_batch_size=settings.BULK_MAX_ITEMS
+        )
+        # Leituras iguais em andamento são compartilhadas (thundering herd);
+        # escritas liberam as chaves afetadas
+        self.get_flights: Optional[SingleFlight] = None
+        self.query_flights: Optional[SingleFlight] = None
+        if settings.SINGLE_FLIGHT_ENABLED:
+            self.get_flights = SingleFlight(settings.SINGLE_FLIGHT_TIMEOUT_SECONDS)
+            self.query_flights = SingleFlight(settings.SINGLE_FLIGHT_TIMEOUT_SECONDS)
+        # Leituras ao banco em andamento por id; _invalidate descarta a marca
+        # para que o resultado de uma leitura anterior à escrita não entre no
+        # cache
+        self._fills: Dict[UUID, object] = {}
+
+    @staticmethod
+    def _id_filter(id: UUID) -> dict:
+        # Toda busca por produto passa pelo índice único em "id"
+        return {"id": id}
+
+    @staticmethod
+    def _to_product_out(
+        item: dict, model: Type[ProductOut | ProductPartialOut] = ProductOut
+    ) -> ProductOut | ProductPartialOut:
+        # UUID, datetime e Decimal já chegam convertidos pelo CODEC_OPTIONS
+        item.pop("_id", None)
+        return model(**item)
+
+    @staticmethod
+    def _query_filter(params: ProductQuery) -> dict:
+        filter: dict = {}
+
+        price = {}
+        if params.min_price is not None:
+            price["$gte"] = params.min_price
+        if params.max_price is not None:
+            price["$lte"] = params.max_price
+        if price:
+            filter["price"] = price
+
+        if params.status is not None:
+            filter["status"] = params.status
+        if params.min_quantity is not None:
+            filter["quantity"] = {"$gte": params.min_quantity}
+        if params.updated_since is not None:
+            # Sincronização incremental: range scan no índice (updated_at, id)
+            filter["updated_at"] = {"$gte": params.updated_since}
+        if params.name_prefix:
+            # Regex ancorada e case-sensitive vira um range scan no índice de name
+            filter["name"] = {"$regex": f"^{re.escape(params.name_prefix)}"}
+
+        return filter
+
+    @staticmethod
+    def _to_document(product_model: ProductModel) -> dict:
+        return product_model.model_dump()
+
+    @staticmethod
+    def _update_document(body: ProductUpdate) -> dict:
+        return body.model_dump(exclude_none=True, exclude={"id"})
+
+    @staticmethod
+    def _set_update(update_data: dict) -> dict:
+        # Toda escrita incrementa version (ETags e If-Match) e avança
+        # updated_at (feed de alterações e updated_since) pelo relógio do
+        # MongoDB. Criações e tombstones ainda usam o relógio da instância da
+        # API (ver CHANGES_POLL_LAG_SECONDS)
+        return {
+            "$set": update_data,
+            "$inc": {"version": 1},
+            "$currentDate": {"updated_at": True},
+        }
+
+    @staticmethod
+    def _version_filter(versions: List[int]) -> dict:
+        # Sem o campo version o documento é tratado como versão 0
+        if 0 in versions:
+            return {"version": {"$in": [*versions, None]}}
+        return {"version": {"$in": versions}}
+
+    @staticmethod
+    def _write_errors(exc: BulkWriteError) -> dict:
+        return {error["index"]: error["errmsg"] for error in exc.details["writeErrors"]}
+
+    @staticmethod
+    def _to_product_model(body: ProductIn) -> ProductModel:
+        # body já foi validado na entrada; model_construct só preenche o id
+        # pelo default_factory, sem validar os campos de novo. created_at e
+        # updated_at iguais marcam a criação no feed de alterações
+        now = utcnow()
+        return ProductModel.model_construct(
+            **dict(body), created_at=now, updated_at=now
         )
 
     async def create(self, body: ProductIn) -> ProductOut:
-        product_model = ProductModel(**body.model_dump())
+        product_model = self._to_product_model(body)
+
+        await self.collection.insert_one(self._to_document(product_model))
+        self._forget_queries()
 
-        # Converter UUID para string e datetime para isoformat para salvar no MongoDB
-        product_data = product_model.model_dump()
-        product_data["id"] = str(product_data["id"])
-        product_data["created_at"] = product_data["created_at"].isoformat()
-        product_data["updated_at"] = product_data["updated_at"].isoformat()
+        # Mesmos campos e valores já validados: nada a converter
+        return ProductOut.model_construct(**dict(product_model))
 
-        await self.collection.insert_one(product_data)
+    def _forget_queries(self) -> None:
+        if self.query_flights is not None:
+            self.query_flights.clear()
 
-        return ProductOut(**product_model.model_dump())
+    async def _invalidate(self, *ids: UUID) -> None:
+        if self.get_flights is not None:
+            self.get_flights.forget(*ids)
+        self._forget_queries()
+        for id in ids:
+            self._fills.pop(id, None)
+        if self.cache is not None:
+            await self.cache.delete(*(str(id) for id in ids))
+
+    async def _record_deletions(self, ids: List[UUID]) -> None:
+        if self.tombstones is not None and ids:
+            now = utcnow()
+            await self.tombstones.insert_many(
+                [{"id": id, "updated_at": now} for id in ids], ordered=False
+            )
 
     async def get(self, id: UUID) -> ProductOut:
-        # Buscar pelo campo "id" (não "_id") e converter UUID para string
-        result = await self.collection.find_one({"id": str(id)})
+        if self.get_flights is not None:
+            product = await self.get_flights.do(id, lambda: self.loader.load(id))
+        else:
+            product = await self.loader.load(id)
 
-        if not result:
+        if product is None:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        # Converter de volta os tipos corretos
-        result["id"] = UUID(result["id"])
-        result["created_at"] = datetime.fromisoformat(result["created_at"])
-        result["updated_at"] = datetime.fromisoformat(result["updated_at"])
+        return product
 
-        # Remover o _id do MongoDB se existir
-        result.pop("_id", None)
+    async def get_many(self, ids: List[UUID]) -> List[Optional[ProductOut]]:
+        """Busca vários produtos com um único ``$in``, na ordem de ``ids``.
+
+        Os que estão no cache não vão ao banco; ids inexistentes viram None.
+        """
+        unique = list(dict.fromkeys(ids))
+        found: dict = {}
+        if self.cache is not None:
+            cached = await self.cache.get_many([str(id) for id in unique])
+            found = {
+                id: product
+                for id, product in zip(unique, cached)
+                if product is not None
+            }
+
+        missing = [id for id in unique if id not in found]
+        if missing:
+            token = object()
+            for id in missing:
+                self._fills[id] = token
+            try:
+                cursor = self.collection.find({"id": {"$in": missing}}, {"_id": False})
+                loaded = [
+                    self._to_product_out(item)
+                    for item in await cursor.to_list(length=len(missing))
+                ]
+                found.update((product.id, product) for product in loaded)
+                if self.cache is not None:
+                    await self._fill_cache(loaded, token)
+            finally:
+                for id in missing:
+                    if self._fills.get(id) is token:
+                        del self._fills[id]
+
+        return [found.get(id) for id in ids]
+
+    async def _fill_cache(self, products: List[ProductOut], token: object) -> None:
+        # Só entra no cache o que nenhuma escrita invalidou durante a leitura
+        fresh = [
+            product for product in products if self._fills.get(product.id) is token
+        ]
+        for product in fresh:
+            await self.cache.set(str(product.id), product)
+        # Uma escrita que chegou durante o set (Redis) apaga o que acabou de entrar
+        stale = [
+            str(product.id)
+            for product in fresh
+            if self._fills.get(product.id) is not token
+        ]
+        if stale:
+            await self.cache.delete(*stale)
+
+    async def lookup(self, ids: List[UUID]) -> ProductLookupResult:
+        products = await self.get_many(ids)
+        return ProductLookupResult(
+            items=[
+                ProductLookupItem.model_construct(
+                    id=id,
+                    status="not_found" if product is None else "found",
+                    product=product,
+                )
+                for id, product in zip(ids, products)
+            ]
+        )
+
+    async def query(self, params: Optional[ProductQuery] = None) -> ProductPage:
+        params = params or ProductQuery()
+        if self.query_flights is None:
+            return await self._query(params)
+        # Parâmetros iguais (inclusive cursor e fields) geram a mesma chave
+        return await self.query_flights.do(
+            params.model_dump_json(), lambda: self._query(params)
+        )
 
-        return ProductOut(**result)
+    async def _query(self, params: ProductQuery) -> ProductPage:
+        direction = pymongo.ASCENDING if params.order == "asc" else pymongo.DESCENDING
+        sort: Sort = [(params.sort, direction), ("id", direction)]
 
-    async def query(self) -> List[ProductOut]:
-        result = await self.collection.find().to_list(length=100)
+        filter = self._query_filter(params)
+        if params.cursor:
+            keyset = keyset_filter(sort, decode_cursor(sort, params.cursor))
+            filter = {"$and": [filter, keyset]} if filter else keyset
 
-        # Converter de volta os tipos corretos para cada item
-        converted_result = []
+        projection = None
+        if params.fields:
+            # Os campos da ordenação são lidos para montar o cursor e a
+            # version para a ETag da página
+            projection = {"_id": False, "id": True, "version": True}
+            projection.update((field, True) for field in params.fields)
+            projection.update((field, True) for field, _ in sort)
+
+        # Busca um item a mais só para saber se existe uma próxima página
+        result = (
+            await self.collection.find(filter, projection)
+            .sort(sort)
+            .limit(params.limit + 1)
+            .to_list(length=params.limit + 1)
+        )
+
+        next_cursor = None
+        if len(result) > params.limit:
+            result = result[: params.limit]
+            next_cursor = encode_cursor(sort, [result[-1][field] for field, _ in sort])
+
+        if params.fields:
+            fields = {"id", *params.fields}
+            items = [
+                self._to_product_out(
+                    {key: value for key, value in item.items() if key in fields},
+                    ProductPartialOut,
+                )
+                for item in result
+            ]
+        else:
+            items = [self._to_product_out(item) for item in result if "id" in item]
+
+        etag = page_etag(
+            ((item["id"], item.get("version", 0)) for item in result if "id" in item),
+            next_cursor,
+        )
+        return ProductPage(items=items, next=next_cursor, etag=etag)
+
+    async def search(self, params: ProductSearch) -> List[ProductOut]:
+        if params.mode == "text":
+            # Ordenado pela relevância calculada pelo índice name_text
+            score = {"$meta": "textScore"}
+            cursor = self.collection.find(
+                {"$text": {"$search": params.q}}, {"_id": False, "score": score}
+            ).sort([("score", score)])
+        else:
+            # Range [q, q + U+FFFF) na collation do índice name_id_collated: o
+            # ICU dá a U+FFFF o maior peso primário, então o range cobre todo
+            # nome que começa com q, sem regex e sem diferenciar caixa e acento
+            cursor = (
+                self.collection.find(
+                    {"name": {"$gte": params.q, "$lt": params.q + "\uffff"}},
+                    {"_id": False},
+                )
+                .collation(NAME_COLLATION)
+                .sort([("name", pymongo.ASCENDING), ("id", pymongo.ASCENDING)])
+            )
+
+        result = await cursor.limit(params.limit).to_list(length=params.limit)
         for item in result:
-            if "id" in item:
-                item["id"] = UUID(item["id"])
-                item["created_at"] = datetime.fromisoformat(item["created_at"])
-                item["updated_at"] = datetime.fromisoformat(item["updated_at"])
-                item.pop("_id", None)
-                converted_result.append(ProductOut(**item))
+            item.pop("score", None)
+        return [self._to_product_out(item) for item in result]
 
-        return converted_result
+    @staticmethod
+    def _stats_pipeline() -> list:
+        bounds = settings.STATS_PRICE_BUCKETS
+        # int * Decimal128 resulta em Decimal128: a soma não perde precisão
+        stock_value = {"$sum": {"$multiply": ["$quantity", "$price"]}}
+        return [
+            {
+                "$project": {
+                    "_id": False,
+                    "status": True,
+                    "quantity": True,
+                    "price": True,
+                }
+            },
+            {
+                "$facet": {
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "count": {"$sum": 1},
+                                "quantity": {"$sum": "$quantity"},
+                                "stock_value": stock_value,
+                                "min_price": {"$min": "$price"},
+                                "max_price": {"$max": "$price"},
+                                "avg_price": {"$avg": "$price"},
+                            }
+                        }
+                    ],
+                    "by_status": [
+                        {
+                            "$group": {
+                                "_id": "$status",
+                                "count": {"$sum": 1},
+                                "quantity": {"$sum": "$quantity"},
+                                "stock_value": stock_value,
+                            }
+                        },
+                        {"$sort": {"_id": pymongo.ASCENDING}},
+                    ],
+                    # Preços acima do último limite caem no bucket "default",
+                    # identificado pelo próprio último limite
+                    "price_buckets": [
+                        {
+                            "$bucket": {
+                                "groupBy": "$price",
+                                "boundaries": bounds,
+                                "default": bounds[-1],
+                                "output": {
+                                    "count": {"$sum": 1},
+                                    "quantity": {"$sum": "$quantity"},
+                                },
+                            }
+                        }
+                    ],
+                }
+            },
+        ]
 
-    async def update(self, id: UUID, body: ProductUpdate) -> ProductUpdateOut:
-        from decimal import Decimal
-        from bson import Decimal128
+    async def stats(self) -> ProductStats:
+        """Estatísticas do catálogo calculadas por uma agregação no banco.
 
-        # Preparar dados para atualização, convertendo Decimal para Decimal128
-        update_data = body.model_dump(exclude_none=True)
-        for key, value in update_data.items():
-            if isinstance(value, Decimal):
-                update_data[key] = Decimal128(str(value))
+        A API recebe um único documento de tamanho fixo, qualquer que seja o
+        tamanho da coleção; o resultado fica em ``stats_cache`` pelo
+        ``STATS_CACHE_TTL_SECONDS`` e não é invalidado pelas escritas.
+        """
+        if self.stats_cache is not None:
+            cached = await self.stats_cache.get("products")
+            if cached is not None:
+                return cached
+
+        result = await self.collection.aggregate(self._stats_pipeline()).to_list(
+            length=1
+        )
+        facets = result[0]
+        bounds = settings.STATS_PRICE_BUCKETS
+
+        totals = facets["totals"][0] if facets["totals"] else {}
+        totals.pop("_id", None)
+        stats = ProductStats(
+            **totals,
+            by_status=[
+                StatusStats(status=item.pop("_id"), **item)
+                for item in facets["by_status"]
+                if item["_id"] is not None
+            ],
+            price_buckets=[
+                PriceBucket(
+                    min=item["_id"],
+                    max=next((bound for bound in bounds if bound > item["_id"]), None),
+                    count=item["count"],
+                    quantity=item["quantity"],
+                )
+                for item in facets["price_buckets"]
+            ],
+            computed_at=utcnow(),
+        )
+
+        if self.stats_cache is not None:
+            await self.stats_cache.set("products", stats)
+        return stats
+
+    async def export(
+        self, batch_size: int = settings.EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[ProductOut]]:
+        """Percorre a coleção inteira entregando um lote por vez.
+
+        Só um lote fica em memória: o próximo ``getMore`` é feito apenas quando
+        o consumidor pede o lote seguinte.
+        """
+        cursor = self.collection.find().batch_size(batch_size)
+        try:
+            while batch := await cursor.to_list(length=batch_size):
+                yield [self._to_product_out(item) for item in batch if "id" in item]
+        finally:
+            await cursor.close()
+
+    async def update(
+        self, id: UUID, body: ProductUpdate, versions: Optional[List[int]] = None
+    ) -> ProductUpdateOut:
+        """Aplica ``body`` ao produto.
+
+        Com ``versions`` a escrita só acontece se a versão atual for uma delas;
+        a checagem e o incremento de version são a mesma operação atômica, sem
+        lock. Se nada casar, levanta VersionConflictException. Um ``body`` sem
+        campos levanta EmptyUpdateException: não muda version nem updated_at,
+        então não invalida ETags nem gera evento no feed.
+        """
+        update_data = self._update_document(body)
+        if not update_data:
+            raise EmptyUpdateException()
+
+        filter = self._id_filter(id)
+        if versions is not None:
+            filter.update(self._version_filter(versions))
 
         result = await self.collection.find_one_and_update(
-            filter={"id": str(id)},
-            update={"$set": update_data},
+            filter=filter,
+            update=self._set_update(update_data),
             return_document=pymongo.ReturnDocument.AFTER,
         )
 
         if not result:
+            # Só no caminho de falha: versão diferente ou produto inexistente
+            if versions is not None and await self.collection.count_documents(
+                self._id_filter(id), limit=1
+            ):
+                raise VersionConflictException(
+                    message=f"Product {id} was modified by another request"
+                )
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        # Converter de volta os tipos corretos
-        result["id"] = UUID(result["id"])
-        result["created_at"] = datetime.fromisoformat(result["created_at"])
-        result["updated_at"] = datetime.fromisoformat(result["updated_at"])
-        # Converter Decimal128 de volta para Decimal
-        for key, value in result.items():
-            if isinstance(value, Decimal128):
-                result[key] = Decimal(str(value))
+        await self._invalidate(id)
         result.pop("_id", None)
 
         return ProductUpdateOut(**result)
 
+    @classmethod
+    def _stock_update(cls, id: UUID, delta: int) -> Tuple[dict, dict]:
+        # A guarda no filtro faz da checagem e do $inc uma única operação
+        # atômica no documento: sem leitura prévia e sem atualização perdida
+        filter = cls._id_filter(id)
+        if delta < 0:
+            filter["quantity"] = {"$gte": -delta}
+        return filter, {
+            "$inc": {"quantity": delta, "version": 1},
+            "$currentDate": {"updated_at": True},
+        }
+
+    async def adjust_stock(self, id: UUID, delta: int) -> ProductOut:
+        filter, update = self._stock_update(id, delta)
+        result = await self.collection.find_one_and_update(
+            filter=filter, update=update, return_document=pymongo.ReturnDocument.AFTER
+        )
+
+        if not result:
+            # Só no caminho de falha: produto inexistente ou estoque insuficiente
+            if await self.collection.count_documents(self._id_filter(id), limit=1):
+                raise InsufficientStockException(
+                    message=f"Insufficient stock for product: {id}"
+                )
+            raise NotFoundException(message=f"Product not found with filter: {id}")
+
+        await self._invalidate(id)
+        return self._to_product_out(result)
+
+    async def adjust_stock_many(
+        self, adjustments: List[ProductStockAdjustment]
+    ) -> BulkResult:
+        # Um update_one por item, em paralelo no pool: o resultado de um
+        # bulk_write só traz contagens e não diria qual guarda falhou
+        results = await asyncio.gather(
+            *(
+                self.collection.update_one(*self._stock_update(item.id, item.delta))
+                for item in adjustments
+            )
+        )
+        adjusted = [result.matched_count > 0 for result in results]
+
+        # Só no caminho de falha, como em adjust_stock: o produto existir
+        # separa estoque insuficiente de produto inexistente
+        failed = list(
+            dict.fromkeys(item.id for item, ok in zip(adjustments, adjusted) if not ok)
+        )
+        counts = await asyncio.gather(
+            *(
+                self.collection.count_documents(self._id_filter(id), limit=1)
+                for id in failed
+            )
+        )
+        existing = {id for id, count in zip(failed, counts) if count}
+        await self._invalidate(
+            *{item.id for item, ok in zip(adjustments, adjusted) if ok}
+        )
+
+        items = []
+        for index, (item, ok) in enumerate(zip(adjustments, adjusted)):
+            if ok:
+                status = "updated"
+            elif item.id in existing:
+                status = "insufficient_stock"
+            else:
+                status = "not_found"
+            items.append(BulkItemResult(index=index, id=item.id, status=status))
+        return BulkResult(items=items)
+
     async def delete(self, id: UUID) -> bool:
-        product = await self.collection.find_one({"id": str(id)})
-        if not product:
+        # Um único delete_one: deleted_count == 0 já significa que o produto
+        # não existe, sem a leitura prévia (e a janela de corrida) do find_one
+        result = await self.collection.delete_one(self._id_filter(id))
+        await self._invalidate(id)
+
+        if not result.deleted_count:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        result = await self.collection.delete_one({"id": str(id)})
+        await self._record_deletions([id])
+        return True
 
-        return True if result.deleted_count > 0 else False
+    async def bulk_create(self, bodies: List[ProductIn]) -> BulkResult:
+        product_models = [self._to_product_model(body) for body in bodies]
 
+        # ordered=False: um documento com erro não interrompe o resto do lote
+        errors = {}
+        try:
+            await self.collection.insert_many(
+                [self._to_document(model) for model in product_models], ordered=False
+            )
+        except BulkWriteError as exc:
+            errors = self._write_errors(exc)
+        self._forget_queries()
 
-def get_usecase() -> ProductUseCase:
-    return ProductUseCase()
+        return BulkResult(
+            items=[
+                BulkItemResult(
+                    index=index,
+                    id=model.id,
+                    status="error" if index in errors else "created",
+                    detail=errors.get(index),
+                )
+                for index, model in enumerate(product_models)
+            ]
+        )
 
+    async def bulk_update(self, bodies: List[ProductBulkUpdate]) -> BulkResult:
+        # Um update_one por item, em paralelo no pool, como em bulk_delete: o
+        # matched_count de cada um diz se o produto existia, sem leitura prévia
+        results = await asyncio.gather(
+            *(self._bulk_update_item(body) for body in bodies)
+        )
 
-usecase = None  # Será inicializado quando necessário
+        updated = {
+            body.id for body, (status, _) in zip(bodies, results) if status == "updated"
+        }
+        if updated:
+            await self._invalidate(*updated)
+
+        return BulkResult(
+            items=[
+                BulkItemResult(index=index, id=body.id, status=status, detail=detail)
+                for index, (body, (status, detail)) in enumerate(zip(bodies, results))
+            ]
+        )
+
+    async def _bulk_update_item(
+        self, body: ProductBulkUpdate
+    ) -> Tuple[str, Optional[str]]:
+        update_data = self._update_document(body)
+        if not update_data:
+            return "error", EmptyUpdateException.message
+        try:
+            result = await self.collection.update_one(
+                self._id_filter(body.id), self._set_update(update_data)
+            )
+        except WriteError as exc:
+            return "error", exc.details["errmsg"]
+        return ("updated" if result.matched_count else "not_found"), None
+
+    async def bulk_delete(self, ids: List[UUID]) -> BulkResult:
+        # Um delete_one por id, em paralelo no pool: o deleted_count de cada
+        # um diz quem apagou, sem leitura prévia. Dois lotes concorrentes com
+        # o mesmo id não reportam (nem registram) a mesma exclusão duas vezes
+        unique = list(dict.fromkeys(ids))
+        results = await asyncio.gather(
+            *(self.collection.delete_one(self._id_filter(id)) for id in unique)
+        )
+        deleted = [id for id, result in zip(unique, results) if result.deleted_count]
+
+        if deleted:
+            await self._invalidate(*deleted)
+            await self._record_deletions(deleted)
+
+        deleted_ids = set(deleted)
+        return BulkResult(
+            items=[
+                BulkItemResult(
+                    index=index,
+                    id=id,
+                    status="deleted" if id in deleted_ids else "not_found",
+                )
+                for index, id in enumerate(ids)
+            ]
+        )
@@ -1,3 +1,9 @@
+import os
+
+# Os testes usam o backend em memória; DATABASE_BACKEND=mongo roda a mesma
+# suíte contra o MONGO_URL
+os.environ.setdefault("DATABASE_BACKEND", "memory")
+
 import pytest
 import pytest_asyncio
 import asyncio
@@ -41,20 +47,34 @@ def product_update(product_id):
     return ProductUpdate(**product_data(), id=product_id)
 
 
-@pytest.fixture
-def isolated_product_usecase():
+@pytest_asyncio.fixture
+async def isolated_product_usecase():
     """Retorna uma nova instância isolada do ProductUseCase para testes"""
-    from motor.motor_asyncio import AsyncIOMotorClient
+    from uuid import uuid4
+
     from store.core.config import settings
+    from store.db.codecs import CODEC_OPTIONS
+    from store.db.indexes import PRODUCT_TOMBSTONES, ensure_indexes
+    from store.db.mongo import MongoClient
     from store.usecases.product import ProductUseCase
 
-    class IsolatedProductUseCase(ProductUseCase):
-        def __init__(self):
-            self.client = AsyncIOMotorClient(settings.MONGO_URL)
-            self.database = self.client.get_database()
-            self.collection = self.database.get_collection("products")
-
-    return IsolatedProductUseCase()
+    # Um client por teste: no backend em memória cada teste tem seus dados;
+    # no MongoDB cada teste usa um banco próprio, apagado no fim
+    client = MongoClient()
+    if settings.DATABASE_BACKEND == "mongo":
+        database = client.get().get_database(
+            f"store_test_{uuid4().hex}", codec_options=CODEC_OPTIONS
+        )
+    else:
+        database = client.get_database()
+    await ensure_indexes(database)
+    yield ProductUseCase(
+        collection=database.get_collection("products"),
+        tombstones=database.get_collection(PRODUCT_TOMBSTONES),
+    )
+    if settings.DATABASE_BACKEND == "mongo":
+        await client.get().drop_database(database.name)
+    client.close()
 
 
 @pytest_asyncio.fixture
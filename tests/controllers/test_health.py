@@ -0,0 +1,38 @@
+import pytest
+from fastapi import status
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from store.main import app
+    from store.core.config import settings
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(settings, "MONGO_CREATE_INDEXES", False)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_controller_health_should_return_pool_stats(client):
+    response = client.get("/health")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "healthy"
+    assert "connections_in_use" in response.json()["mongo"]["pool"]
+
+
+def test_controller_metrics_should_expose_request_latency(client):
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'store_http_request_duration_seconds_count{method="GET",route="/health",'
+        'status="200"}' in response.text
+    )
+    assert "store_mongo_pool_connections_in_use" in response.text
+    assert "store_singleflight_get_shared" in response.text
+    assert "# TYPE store_admission_queued gauge" in response.text
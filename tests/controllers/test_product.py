@@ -23,11 +23,15 @@ def mock_usecase():
 
 
 @pytest.fixture
-def client_with_mock_usecase(mock_usecase):
+def client_with_mock_usecase(mock_usecase, monkeypatch):
     from store.main import app
     from store.controllers.product import get_product_usecase
+    from store.core.config import settings
     from fastapi.testclient import TestClient
 
+    # O usecase é mockado, então o startup não precisa do MongoDB
+    monkeypatch.setattr(settings, "MONGO_CREATE_INDEXES", False)
+
     # Override the dependency
     app.dependency_overrides[get_product_usecase] = lambda: mock_usecase
 
@@ -78,6 +82,7 @@ def test_controller_create_should_return_success(
         "quantity": 10,
         "price": "8.500",
         "status": True,
+        "version": 0,
     }
 
 
@@ -120,6 +125,7 @@ def test_controller_get_should_return_success(client_with_mock_usecase, products
         "quantity": 10,
         "price": "8.500",
         "status": True,
+        "version": 0,
     }
 
 
@@ -146,7 +152,7 @@ def test_controller_query_should_return_success(client_with_mock_usecase, produc
     client, mock_usecase = client_with_mock_usecase
 
     # Arrange
-    from store.core.schemas.product import ProductOut
+    from store.core.schemas.product import ProductOut, ProductPage
     from uuid import UUID
     from datetime import datetime
 
@@ -164,7 +170,7 @@ def test_controller_query_should_return_success(client_with_mock_usecase, produc
         ),
     )
     mock_products = [mock_product, mock_product]
-    mock_usecase.query.return_value = mock_products
+    mock_usecase.query.return_value = ProductPage(items=mock_products)
 
     # Act
     response = client.get(products_url)
@@ -173,6 +179,123 @@ def test_controller_query_should_return_success(client_with_mock_usecase, produc
     assert response.status_code == status.HTTP_200_OK
     assert isinstance(response.json(), List)
     assert len(response.json()) == 2
+    assert "Link" not in response.headers
+
+
+def test_controller_query_should_return_next_cursor(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.schemas.product import ProductPage
+
+    mock_usecase.query.return_value = ProductPage(items=[], next="abc")
+
+    # Act
+    response = client.get(products_url, params={"limit": 2})
+
+    # Assert
+    params = mock_usecase.query.await_args.kwargs["params"]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert 'cursor=abc>; rel="next"' in response.headers["Link"]
+    assert params.limit == 2
+    assert params.cursor is None
+
+
+def test_controller_query_should_parse_filters(client_with_mock_usecase, products_url):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from decimal import Decimal
+    from store.core.schemas.product import ProductPage
+
+    mock_usecase.query.return_value = ProductPage(items=[])
+
+    # Act
+    response = client.get(
+        products_url,
+        params={
+            "min_price": "5.000",
+            "max_price": "9.000",
+            "status": "true",
+            "min_quantity": 5,
+            "name_prefix": "Iphone",
+            "updated_since": "2023-01-01T00:00:00Z",
+            "sort": "price",
+            "order": "desc",
+            "fields": ["name", "price"],
+        },
+    )
+
+    # Assert
+    params = mock_usecase.query.await_args.kwargs["params"]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert params.min_price == Decimal("5.000")
+    assert params.max_price == Decimal("9.000")
+    assert params.status is True
+    assert params.updated_since.isoformat() == "2023-01-01T00:00:00+00:00"
+    assert params.min_quantity == 5
+    assert params.name_prefix == "Iphone"
+    assert (params.sort, params.order) == ("price", "desc")
+    assert params.fields == ["name", "price"]
+
+
+def test_controller_query_should_return_only_selected_fields(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.schemas.product import ProductPage, ProductPartialOut
+
+    mock_usecase.query.return_value = ProductPage(
+        items=[ProductPartialOut(id=MOCK_PRODUCT_OUT["id"], name="Iphone 14 pro Max")]
+    )
+
+    # Act
+    response = client.get(products_url, params={"fields": "name"})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": MOCK_PRODUCT_OUT["id"], "name": "Iphone 14 pro Max"}
+    ]
+
+
+def test_controller_query_should_reject_invalid_price_range(
+    client_with_mock_usecase, products_url
+):
+    client, _ = client_with_mock_usecase
+
+    # Act
+    response = client.get(products_url, params={"min_price": 10, "max_price": 5})
+
+    # Assert
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_controller_query_should_return_bad_request_for_invalid_cursor(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.exceptions import InvalidCursorException
+
+    mock_usecase.query.side_effect = InvalidCursorException(
+        message="Invalid cursor: abc"
+    )
+
+    # Act
+    response = client.get(products_url, params={"cursor": "abc"})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor: abc"}
 
 
 def test_controller_patch_should_return_success(client_with_mock_usecase, products_url):
@@ -215,6 +338,7 @@ def test_controller_patch_should_return_success(client_with_mock_usecase, produc
         "quantity": 10,
         "price": "7.500",
         "status": True,
+        "version": 0,
     }
 
 
@@ -253,3 +377,576 @@ def test_controller_delete_should_return_not_found(
     # Assert
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json() == {"detail": f"Product not found with filter: {product_id}"}
+
+
+def _mock_product_out():
+    from store.core.schemas.product import ProductOut
+    from datetime import datetime
+
+    return ProductOut(
+        id=MOCK_PRODUCT_OUT["id"],
+        name=MOCK_PRODUCT_OUT["name"],
+        quantity=MOCK_PRODUCT_OUT["quantity"],
+        price=MOCK_PRODUCT_OUT["price"],
+        status=MOCK_PRODUCT_OUT["status"],
+        created_at=datetime.fromisoformat(
+            MOCK_PRODUCT_OUT["created_at"].replace("Z", "+00:00")
+        ),
+        updated_at=datetime.fromisoformat(
+            MOCK_PRODUCT_OUT["updated_at"].replace("Z", "+00:00")
+        ),
+    )
+
+
+def _mock_export(*batches):
+    from unittest.mock import MagicMock
+
+    async def export():
+        for batch in batches:
+            yield batch
+
+    return MagicMock(side_effect=export)
+
+
+def test_controller_export_should_stream_ndjson(client_with_mock_usecase, products_url):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    import json
+
+    mock_product = _mock_product_out()
+    mock_usecase.export = _mock_export([mock_product, mock_product], [mock_product])
+
+    # Act
+    response = client.get(f"{products_url}export")
+
+    # Assert
+    lines = response.text.splitlines()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 3
+    assert json.loads(lines[0])["id"] == MOCK_PRODUCT_OUT["id"]
+
+
+def test_controller_export_should_stream_csv(client_with_mock_usecase, products_url):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    mock_usecase.export = _mock_export([_mock_product_out()])
+
+    # Act
+    response = client.get(f"{products_url}export", params={"format": "csv"})
+
+    # Assert
+    lines = response.text.splitlines()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert lines[0] == "id,created_at,updated_at,name,quantity,price,status,version"
+    assert lines[1].endswith(",Iphone 14 pro Max,10,8.500,True,0")
+
+
+def test_controller_bulk_post_should_return_items(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.schemas.product import BulkItemResult, BulkResult
+
+    mock_usecase.bulk_create.return_value = BulkResult(
+        items=[
+            BulkItemResult(index=0, id=MOCK_PRODUCT_OUT["id"], status="created"),
+            BulkItemResult(index=1, status="error", detail="duplicate key"),
+        ]
+    )
+
+    # Act
+    response = client.post(f"{products_url}bulk", json=[product_data()] * 2)
+
+    # Assert
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [item["status"] for item in response.json()["items"]] == [
+        "created",
+        "error",
+    ]
+    assert len(mock_usecase.bulk_create.await_args.kwargs["bodies"]) == 2
+
+
+def test_controller_bulk_post_should_limit_batch_size(
+    client_with_mock_usecase, products_url
+):
+    client, _ = client_with_mock_usecase
+
+    # Act
+    from store.core.config import settings
+
+    response = client.post(
+        f"{products_url}bulk", json=[product_data()] * (settings.BULK_MAX_ITEMS + 1)
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_controller_patch_should_reject_empty_body(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.exceptions import EmptyUpdateException
+
+    mock_usecase.update.side_effect = EmptyUpdateException()
+
+    # Act
+    response = client.patch(f"{products_url}{MOCK_PRODUCT_OUT['id']}", json={})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "No fields to update"}
+
+
+def test_controller_patch_should_reject_negative_quantity(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+    product_id = MOCK_PRODUCT_OUT["id"]
+
+    # Act
+    response = client.patch(f"{products_url}{product_id}", json={"quantity": -5})
+    bulk_response = client.patch(
+        f"{products_url}bulk", json=[{"id": product_id, "quantity": -5}]
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert bulk_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_usecase.update.assert_not_awaited()
+    mock_usecase.bulk_update.assert_not_awaited()
+
+
+@pytest.mark.parametrize("price", ["-1", "0"])
+def test_controller_patch_should_reject_non_positive_price(
+    client_with_mock_usecase, products_url, price
+):
+    client, mock_usecase = client_with_mock_usecase
+    product_id = MOCK_PRODUCT_OUT["id"]
+
+    # Act
+    response = client.patch(f"{products_url}{product_id}", json={"price": price})
+    bulk_response = client.patch(
+        f"{products_url}bulk", json=[{"id": product_id, "price": price}]
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert bulk_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_usecase.update.assert_not_awaited()
+    mock_usecase.bulk_update.assert_not_awaited()
+
+
+def test_controller_bulk_patch_should_return_items(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.schemas.product import BulkItemResult, BulkResult
+
+    mock_usecase.bulk_update.return_value = BulkResult(
+        items=[BulkItemResult(index=0, id=MOCK_PRODUCT_OUT["id"], status="updated")]
+    )
+
+    # Act
+    response = client.patch(
+        f"{products_url}bulk", json=[{"id": MOCK_PRODUCT_OUT["id"], "quantity": 5}]
+    )
+
+    # Assert
+    body = mock_usecase.bulk_update.await_args.kwargs["bodies"][0]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["status"] == "updated"
+    assert str(body.id) == MOCK_PRODUCT_OUT["id"]
+    assert body.quantity == 5
+
+
+def test_controller_bulk_delete_should_return_items(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    # Arrange
+    from store.core.schemas.product import BulkItemResult, BulkResult
+
+    mock_usecase.bulk_delete.return_value = BulkResult(
+        items=[BulkItemResult(index=0, id=MOCK_PRODUCT_OUT["id"], status="not_found")]
+    )
+
+    # Act
+    response = client.request(
+        "DELETE", f"{products_url}bulk", json=[MOCK_PRODUCT_OUT["id"]]
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["status"] == "not_found"
+
+
+def test_get_product_usecase_should_reuse_app_state_usecase(monkeypatch):
+    from unittest.mock import MagicMock
+    from store.main import app
+    from store.controllers.product import get_product_usecase
+    from store.core.config import settings
+    from store.usecases.product import ProductUseCase
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(settings, "MONGO_CREATE_INDEXES", False)
+
+    with TestClient(app):
+        request = MagicMock(app=app)
+        usecase = get_product_usecase(request)
+
+        assert isinstance(usecase, ProductUseCase)
+        assert get_product_usecase(request) is usecase
+        assert usecase.collection is app.state.product_collection
+
+
+def test_controller_get_should_return_not_modified_when_etag_matches(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+    mock_usecase.get.return_value = _mock_product_out()
+    url = f"{products_url}{MOCK_PRODUCT_OUT['id']}"
+
+    etag = client.get(url).headers["ETag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert etag == 'W/"0"'
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert client.get(url, headers={"If-None-Match": '"0"'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": 'W/"1"'}).status_code == 200
+
+
+def test_controller_query_should_return_not_modified_when_etag_matches(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    from store.core.schemas.product import ProductPage
+
+    mock_usecase.query.return_value = ProductPage(
+        items=[_mock_product_out()], etag='W/"abc"'
+    )
+
+    response = client.get(products_url, headers={"If-None-Match": '"abc", "def"'})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert client.get(products_url).headers["ETag"] == 'W/"abc"'
+
+
+def test_controller_query_should_compress_large_responses(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    from store.core.schemas.product import ProductPage
+
+    mock_usecase.query.return_value = ProductPage(items=[_mock_product_out()] * 50)
+
+    response = client.get(products_url, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 50
+
+
+@pytest.fixture
+def mock_change_feed():
+    from unittest.mock import MagicMock
+    from store.main import app
+    from store.controllers.product import get_product_changes
+
+    feed = MagicMock()
+    feed.read = AsyncMock()
+    app.dependency_overrides[get_product_changes] = lambda: feed
+    yield feed
+    app.dependency_overrides.pop(get_product_changes, None)
+
+
+def _mock_change(op="update", token="t1"):
+    from store.core.schemas.product import ProductChange
+
+    product = _mock_product_out()
+    return ProductChange(
+        op=op,
+        id=product.id,
+        at=product.updated_at,
+        product=product if op != "delete" else None,
+        token=token,
+    )
+
+
+def test_controller_changes_should_long_poll(
+    client_with_mock_usecase, mock_change_feed, products_url
+):
+    client, _ = client_with_mock_usecase
+
+    from store.core.schemas.product import ProductChangePage
+
+    mock_change_feed.read.return_value = ProductChangePage(
+        changes=[_mock_change()], next="t1"
+    )
+
+    response = client.get(f"{products_url}changes", params={"since": "t0"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["next"] == "t1"
+    assert response.json()["changes"][0]["op"] == "update"
+    assert mock_change_feed.read.await_args.kwargs["since"] == "t0"
+
+
+def test_controller_changes_should_stream_server_sent_events(
+    client_with_mock_usecase, mock_change_feed, products_url
+):
+    client, _ = client_with_mock_usecase
+
+    async def changes(since):
+        yield _mock_change("update", "t1"), "t1"
+        yield None, "t1"
+        yield _mock_change("delete", "t2"), "t2"
+
+    mock_change_feed.changes = changes
+
+    response = client.get(
+        f"{products_url}changes",
+        headers={"Accept": "text/event-stream", "Last-Event-ID": "t0"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = response.text.strip().split("\n\n")
+    assert len(events) == 2
+    assert events[0].startswith("id: t1\nevent: update\ndata: {")
+    assert events[1].startswith("id: t2\nevent: delete\n")
+    mock_change_feed.parse.assert_called_once_with("t0")
+
+
+def test_controller_changes_should_reject_invalid_token(
+    client_with_mock_usecase, mock_change_feed, products_url
+):
+    client, _ = client_with_mock_usecase
+
+    from store.core.exceptions import InvalidCursorException
+
+    mock_change_feed.parse.side_effect = InvalidCursorException(
+        message="Invalid cursor"
+    )
+
+    response = client.get(f"{products_url}changes", params={"since": "bad"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_controller_search_should_return_products(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+    mock_usecase.search.return_value = [_mock_product_out()]
+
+    response = client.get(
+        f"{products_url}search", params={"q": "iph", "mode": "prefix", "limit": 5}
+    )
+
+    params = mock_usecase.search.await_args.kwargs["params"]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["name"] == MOCK_PRODUCT_OUT["name"]
+    assert (params.q, params.mode, params.limit) == ("iph", "prefix", 5)
+
+
+def test_controller_search_should_require_query(client_with_mock_usecase, products_url):
+    client, mock_usecase = client_with_mock_usecase
+
+    response = client.get(f"{products_url}search")
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_usecase.search.assert_not_awaited()
+
+
+def test_controller_stats_should_return_aggregates(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    from datetime import datetime, timezone
+    from decimal import Decimal
+    from store.core.schemas.product import PriceBucket, ProductStats
+
+    mock_usecase.stats.return_value = ProductStats(
+        count=2,
+        quantity=20,
+        stock_value=Decimal("170.000"),
+        price_buckets=[
+            PriceBucket(min=Decimal(0), max=Decimal(10), count=2, quantity=20)
+        ],
+        computed_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
+    )
+
+    response = client.get(f"{products_url}stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["stock_value"] == "170.000"
+    assert response.json()["price_buckets"][0] == {
+        "min": "0",
+        "max": "10",
+        "count": 2,
+        "quantity": 20,
+    }
+
+
+def test_controller_adjust_stock_should_return_conflict_when_insufficient(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    from store.core.exceptions import InsufficientStockException
+
+    mock_usecase.adjust_stock.side_effect = InsufficientStockException()
+    url = f"{products_url}{MOCK_PRODUCT_OUT['id']}/stock"
+
+    response = client.post(url, json={"delta": -50})
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {"detail": "Insufficient stock"}
+    assert mock_usecase.adjust_stock.await_args.kwargs["delta"] == -50
+    assert client.post(url, json={"delta": 0}).status_code == 422
+
+
+def test_controller_adjust_stock_should_return_product(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+    mock_usecase.adjust_stock.return_value = _mock_product_out()
+
+    response = client.post(
+        f"{products_url}{MOCK_PRODUCT_OUT['id']}/stock", json={"delta": 2}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["quantity"] == MOCK_PRODUCT_OUT["quantity"]
+
+
+def test_controller_bulk_adjust_stock_should_return_results(
+    client_with_mock_usecase, products_url
+):
+    client, mock_usecase = client_with_mock_usecase
+
+    from store.core.schemas.product import BulkItemResult, BulkResult
+
+    mock_usecase.adjust_stock_many.return_value = BulkResult(
+        items=[
+            BulkItemResult(
+                index=0, id=MOCK_PRODUCT_OUT["id"], status="insufficient_stock"
+            )
+        ]
+    )
+
+    response = client.post(
+        f"{products_url}stock", json=[{"id": MOCK_PRODUCT_OUT["id"], "delta": -3}]
+    )
+
+    adjustments = mock_usecase.adjust_stock_many.await_args.kwargs["adjustments"]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["status"] == "insufficient_stock"
+    assert adjustments[0].delta == -3
+
+
+def test_controller_patch_should_forward_if_match_versions(
+    client_with_mock_usecase, products_url
+):
+    from uuid import UUID
+    from store.core.schemas.product import ProductUpdateOut
+
+    client, mock_usecase = client_with_mock_usecase
+    mock_usecase.update.return_value = ProductUpdateOut.model_construct(
+        id=UUID(MOCK_PRODUCT_OUT["id"]), quantity=3, version=4
+    )
+
+    # O cliente devolve a ETag (fraca) que recebeu no GET
+    response = client.patch(
+        f"{products_url}{MOCK_PRODUCT_OUT['id']}",
+        json={"quantity": 3},
+        headers={"If-Match": 'W/"3"'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == 'W/"4"'
+    assert mock_usecase.update.call_args.kwargs["versions"] == [3]
+
+
+def test_controller_patch_should_return_precondition_failed_on_conflict(
+    client_with_mock_usecase, products_url
+):
+    from store.core.exceptions import VersionConflictException
+
+    client, mock_usecase = client_with_mock_usecase
+    mock_usecase.update.side_effect = VersionConflictException()
+    url = f"{products_url}{MOCK_PRODUCT_OUT['id']}"
+
+    response = client.patch(url, json={"quantity": 3}, headers={"If-Match": 'W/"3"'})
+    invalid = client.patch(url, json={"quantity": 3}, headers={"If-Match": '"abc"'})
+
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert response.json() == {"detail": "Version conflict"}
+    assert invalid.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert invalid.json() == {"detail": "If-Match must contain product ETags"}
+    assert mock_usecase.update.await_count == 1
+
+
+def test_controller_lookup_should_return_items_in_request_order(
+    client_with_mock_usecase, products_url
+):
+    from store.core.schemas.product import ProductLookupItem, ProductLookupResult
+
+    client, mock_usecase = client_with_mock_usecase
+    missing = "5f9b3c1e-8f1d-4b7a-9c1e-2d3f4a5b6c7d"
+    mock_usecase.lookup.return_value = ProductLookupResult(
+        items=[
+            ProductLookupItem(id=missing, status="not_found"),
+            ProductLookupItem(
+                id=MOCK_PRODUCT_OUT["id"], status="found", product=_mock_product_out()
+            ),
+        ]
+    )
+
+    response = client.post(
+        f"{products_url}lookup", json=[missing, MOCK_PRODUCT_OUT["id"]]
+    )
+
+    items = response.json()["items"]
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["status"] for item in items] == ["not_found", "found"]
+    assert items[0]["product"] is None
+    assert items[1]["product"]["name"] == MOCK_PRODUCT_OUT["name"]
+    assert [str(id) for id in mock_usecase.lookup.call_args.kwargs["ids"]] == [
+        missing,
+        MOCK_PRODUCT_OUT["id"],
+    ]
+
+
+def test_controller_lookup_should_reject_empty_body(
+    client_with_mock_usecase, products_url
+):
+    client, _ = client_with_mock_usecase
+
+    response = client.post(f"{products_url}lookup", json=[])
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
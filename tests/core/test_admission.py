@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from store.core.admission import AdmissionControl, AdmissionMiddleware, Limiter
+
+
+@pytest.mark.asyncio
+async def test_limiter_should_queue_in_order_and_reject_when_queue_is_full():
+    limiter = Limiter(limit=1, max_queue=1)
+
+    assert await limiter.acquire(timeout=1) is True
+    waiter = asyncio.ensure_future(limiter.acquire(timeout=1))
+    await asyncio.sleep(0)
+
+    assert limiter.queued == 1
+    assert await limiter.acquire(timeout=1) is False
+
+    limiter.release()
+    assert await waiter is True
+    limiter.release()
+
+    assert limiter.snapshot() == {
+        "limit": 1,
+        "active": 0,
+        "queued": 0,
+        "admitted": 2,
+        "rejected": 1,
+        "timeouts": 0,
+        "queued_max": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_limiter_should_give_up_after_timeout_without_leaking_slots():
+    limiter = Limiter(limit=1, max_queue=2)
+    await limiter.acquire(timeout=1)
+
+    assert await limiter.acquire(timeout=0.01) is False
+    cancelled = asyncio.ensure_future(limiter.acquire(timeout=1))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+    assert limiter.stats.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_middleware_should_shed_load_with_retry_after():
+    control = AdmissionControl(
+        max_concurrency=1,
+        max_queue=0,
+        timeout=1,
+        retry_after=3,
+        exempt=["/health"],
+    )
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, control=control)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    @app.get("/slow")
+    async def slow():
+        started.set()
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.ensure_future(client.get("/slow"))
+        await started.wait()
+
+        rejected = await client.get("/slow")
+        exempt = await client.get("/health")
+        missing = await client.get("/missing")
+        release.set()
+        accepted = await first
+
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "3"
+    assert exempt.status_code == 200
+    assert missing.status_code == 404
+    assert accepted.status_code == 200
+    assert list(control.limiters) == ["GET /slow"]
+    assert control.limiters["GET /slow"].active == 0
+    text = control.render()
+    assert 'store_admission_rejected_total{method="GET",route="/slow"} 1' in text
+    assert 'store_admission_queued{method="GET",route="/slow"} 0' in text
@@ -0,0 +1,61 @@
+import pytest
+
+from store.core.cache import MemoryCache
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_should_count_hits_and_misses():
+    cache = MemoryCache(ttl=60, max_entries=10)
+
+    assert await cache.get("a") is None
+    await cache.set("a", 1)
+
+    assert await cache.get("a") == 1
+    assert cache.snapshot() == {
+        "backend": "MemoryCache",
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_should_evict_least_recently_used():
+    cache = MemoryCache(ttl=60, max_entries=2)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_should_expire_entries(monkeypatch):
+    import store.core.cache
+
+    now = 1000.0
+    monkeypatch.setattr(store.core.cache.time, "monotonic", lambda: now)
+    cache = MemoryCache(ttl=30, max_entries=10)
+    await cache.set("a", 1)
+
+    now += 31
+
+    assert await cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_should_delete_keys():
+    cache = MemoryCache(ttl=60, max_entries=10)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+
+    await cache.delete("a", "b", "c")
+
+    assert len(cache) == 0
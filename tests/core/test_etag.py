@@ -0,0 +1,33 @@
+from uuid import uuid4
+
+from store.core.etag import etag_matches, if_match_versions, page_etag, product_etag
+
+
+def test_product_etag_should_be_weak_and_change_with_version():
+    assert product_etag(3) == 'W/"3"'
+    assert product_etag(3) != product_etag(4)
+
+
+def test_page_etag_should_change_when_items_or_cursor_change():
+    first, second = uuid4(), uuid4()
+
+    etag = page_etag([(first, 1), (second, 1)], None)
+
+    assert etag == page_etag([(first, 1), (second, 1)], None)
+    assert etag != page_etag([(first, 1), (second, 2)], None)
+    assert etag != page_etag([(first, 1)], None)
+    assert etag != page_etag([(first, 1), (second, 1)], "abc")
+
+
+def test_etag_matches_should_use_weak_comparison():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('W/"x"', 'W/"abc"')
+
+
+def test_if_match_versions_should_accept_weak_and_ignore_invalid_etags():
+    assert if_match_versions('W/"3"') == [3]
+    assert if_match_versions('"1", W/"2"') == [1, 2]
+    assert if_match_versions('"abc", W/"-1", W/3') == []
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from store.core.loader import DataLoader
+
+
+@pytest.mark.asyncio
+async def test_data_loader_should_batch_concurrent_loads():
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(keys)
+        return [key * 10 for key in keys]
+
+    loader = DataLoader(batch_load, max_batch_size=2)
+
+    result = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(1), loader.load(3)
+    )
+
+    assert result == [10, 20, 10, 30]
+    assert calls == [[1, 2], [3]]
+    assert await asyncio.gather(loader.load(4), loader.load(4)) == [40, 40]
+    assert calls[-1] == [4]
+
+
+@pytest.mark.asyncio
+async def test_data_loader_should_propagate_errors_to_every_waiter():
+    async def batch_load(keys):
+        raise RuntimeError("boom")
+
+    loader = DataLoader(batch_load, max_batch_size=10)
+
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+
+@pytest.mark.asyncio
+async def test_data_loader_cancelled_waiter_should_not_cancel_others():
+    release = asyncio.Event()
+
+    async def batch_load(keys):
+        await release.wait()
+        return keys
+
+    loader = DataLoader(batch_load, max_batch_size=10)
+    first = asyncio.ensure_future(loader.load(1))
+    second = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    assert await second == 1
+    assert first.cancelled()
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+from store.core.metrics import Metrics, RequestContext, current_request, metrics
+from store.db.monitoring import CommandStats
+
+
+def test_metrics_should_render_histograms_in_prometheus_format():
+    registry = Metrics()
+    context = RequestContext()
+    context.add_command("find", 0.003)
+
+    registry.observe_request("GET", "/products/{id}", 200, 0.02, context)
+    registry.observe_request("GET", "/products/{id}", 200, 2.0, RequestContext())
+
+    text = registry.render([("store_cache", "Cache.", {"hits": 3, "backend": "x"})])
+
+    assert "# TYPE store_http_request_duration_seconds histogram" in text
+    labels = 'method="GET",route="/products/{id}",status="200"'
+    assert (
+        f'store_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    )
+    assert f'store_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"store_http_request_duration_seconds_count{{{labels}}} 2" in text
+    assert 'store_mongo_commands_total{route="/products/{id}",command="find"} 1' in text
+    assert "store_cache_hits 3" in text
+    assert "store_cache_backend" not in text
+
+
+def test_metrics_should_label_every_series_with_the_worker():
+    registry = Metrics(labels=(("worker", "42"),))
+    registry.observe_request("GET", "/health", 200, 0.01, RequestContext())
+
+    text = registry.render([("store_cache", "Cache.", {"hits": 3})])
+
+    assert (
+        'store_http_request_duration_seconds_count{worker="42",method="GET",'
+        'route="/health",status="200"} 1' in text
+    )
+    assert 'store_cache_hits{worker="42"} 3' in text
+    registry.reset()
+    assert registry.labels == (("worker", "42"),)
+
+
+def test_command_stats_should_attribute_commands_to_current_request():
+    listener = CommandStats()
+    context = RequestContext()
+    event = MagicMock(command_name="find", duration_micros=1500)
+
+    token = current_request.set(context)
+    try:
+        listener.succeeded(event)
+        listener.failed(event)
+    finally:
+        current_request.reset(token)
+
+    assert context.commands == {"find": 2}
+    assert context.db_time == 0.003
+    assert "find" not in metrics.background.commands
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from store.core.exceptions import InvalidCursorException
+from store.core.pagination import decode_cursor, encode_cursor, keyset_filter
+
+SORT = [("created_at", 1), ("id", 1)]
+
+
+def test_cursor_should_round_trip_bson_values():
+    values = [
+        datetime(2023, 1, 1, tzinfo=timezone.utc),
+        UUID("fce6cc37-10b9-4a8e-a8b2-977df327001a"),
+    ]
+
+    assert decode_cursor(SORT, encode_cursor(SORT, values)) == values
+
+
+def test_cursor_should_raise_for_invalid_token():
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(SORT, "not-a-cursor")
+
+
+def test_cursor_should_raise_for_other_sort():
+    cursor = encode_cursor([("price", -1), ("id", 1)], ["8.5", "a"])
+
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(SORT, cursor)
+
+
+def test_keyset_filter_should_resume_after_values():
+    assert keyset_filter([("price", -1), ("id", 1)], ["8.5", "a"]) == {
+        "$or": [
+            {"price": {"$lt": "8.5"}},
+            {"price": "8.5", "id": {"$gt": "a"}},
+        ]
+    }
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [{"$ne": None}, UUID("fce6cc37-10b9-4a8e-a8b2-977df327001a")],
+        [datetime(2023, 1, 1, tzinfo=timezone.utc), ["a"]],
+        ["2023-01-01", UUID("fce6cc37-10b9-4a8e-a8b2-977df327001a")],
+        [datetime(2023, 1, 1, tzinfo=timezone.utc), "fce6cc37"],
+    ],
+)
+def test_cursor_should_raise_for_values_of_other_types(values):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(SORT, encode_cursor(SORT, values))
+
+
+def test_cursor_should_accept_each_sort_field_type():
+    for field, value in (
+        ("name", "Iphone 14 pro Max"),
+        ("price", Decimal("8.5")),
+        ("quantity", 10),
+    ):
+        sort = [(field, 1), ("id", 1)]
+        values = [value, UUID("fce6cc37-10b9-4a8e-a8b2-977df327001a")]
+
+        assert decode_cursor(sort, encode_cursor(sort, values))[1] == values[1]
+
+    with pytest.raises(InvalidCursorException):
+        sort = [("quantity", 1), ("id", 1)]
+        decode_cursor(sort, encode_cursor(sort, [True, values[1]]))
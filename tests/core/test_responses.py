@@ -0,0 +1,27 @@
+from decimal import Decimal
+from uuid import UUID
+
+from store.core.responses import FastJSONResponse
+from store.core.schemas.product import ProductIn
+from store.usecases.product import ProductUseCase
+from tests.factories import product_data
+
+
+def test_fast_json_response_should_render_models_bytes_and_dicts():
+    product = ProductIn(**product_data())
+
+    assert FastJSONResponse(product).body == product.model_dump_json().encode()
+    assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
+    assert FastJSONResponse({"a": [1, None]}).body == b'{"a":[1,null]}'
+
+
+def test_to_product_model_should_fill_defaults_without_revalidating():
+    body = ProductIn(**product_data())
+
+    product_model = ProductUseCase._to_product_model(body)
+    document = product_model.model_dump()
+
+    assert isinstance(document["id"], UUID)
+    assert document["price"] == Decimal("8.500")
+    assert document["name"] == body.name
+    assert document["created_at"].tzinfo is not None
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from store.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_should_share_concurrent_calls():
+    flights = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(flights.do("a", fetch) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flights.snapshot() == {
+        "in_flight": 0,
+        "calls": 1,
+        "shared": 9,
+        "timeouts": 0,
+    }
+    await flights.do("a", fetch)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_should_propagate_errors_without_keeping_them():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flights.do("a", fail), flights.do("a", fail), return_exceptions=True
+    )
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_should_bound_the_wait_of_followers():
+    flights = SingleFlight(timeout=0.01)
+    release = asyncio.Event()
+
+    async def stuck():
+        await release.wait()
+        return "stuck"
+
+    async def fast():
+        return "fast"
+
+    leader = asyncio.ensure_future(flights.do("a", stuck))
+    await asyncio.sleep(0)
+
+    assert await flights.do("a", fast) == "fast"
+    assert flights.stats.timeouts == 1
+
+    # Cancelar quem iniciou a chamada não a interrompe para os outros
+    follower = asyncio.ensure_future(flights.do("a", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+    assert await follower == "stuck"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_forget_should_start_a_new_call():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def old():
+        await release.wait()
+        return "old"
+
+    async def new():
+        return "new"
+
+    first = asyncio.ensure_future(flights.do("a", old))
+    await asyncio.sleep(0)
+    flights.forget("a")
+
+    assert await flights.do("a", new) == "new"
+    release.set()
+    assert await first == "old"
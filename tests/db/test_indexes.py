@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from store.db.indexes import INDEXES, PRODUCT_ID_INDEX, ensure_indexes, report_indexes
+
+
+@pytest.fixture
+def mock_collection():
+    collection = MagicMock()
+    collection.create_indexes = AsyncMock(return_value=[PRODUCT_ID_INDEX])
+    collection.index_information = AsyncMock(
+        return_value={
+            "_id_": {"key": [("_id", 1)]},
+            "legacy_name": {"key": [("name", 1)]},
+        }
+    )
+    collection.aggregate.return_value.to_list = AsyncMock(
+        return_value=[
+            {"name": "_id_", "accesses": {"ops": 10}},
+            {"name": "legacy_name", "accesses": {"ops": 0}},
+        ]
+    )
+    return collection
+
+
+@pytest.fixture
+def mock_database(mock_collection):
+    database = MagicMock()
+    database.get_collection.return_value = mock_collection
+    return database
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_should_create_declared_indexes(
+    mock_database, mock_collection
+):
+    result = await ensure_indexes(mock_database)
+
+    mock_collection.create_indexes.assert_any_await(INDEXES["products"])
+    assert mock_collection.create_indexes.await_count == len(INDEXES)
+    assert result["products"] == [PRODUCT_ID_INDEX]
+
+
+@pytest.mark.asyncio
+async def test_report_indexes_should_return_missing_and_unused(mock_database):
+    reports = await report_indexes(mock_database)
+
+    assert len(reports) == len(INDEXES)
+    assert reports[0].collection == "products"
+    assert PRODUCT_ID_INDEX in reports[0].missing
+    assert reports[0].unused == ["legacy_name"]
+
+
+@pytest.mark.asyncio
+async def test_report_indexes_should_compare_collation(mock_database, mock_collection):
+    mock_collection.index_information.return_value = {
+        "_id_": {"key": [("_id", 1)]},
+        "name_id": {"key": [("name", 1), ("id", 1)]},
+        "other_name_id": {
+            "key": [("name", 1), ("id", 1)],
+            "collation": {"locale": "en", "strength": 1, "caseLevel": False},
+        },
+    }
+
+    reports = await report_indexes(mock_database)
+
+    assert "name_id" not in reports[0].missing
+    assert "name_id_collated" in reports[0].missing
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from bson import Decimal128
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+from store.core.pagination import keyset_filter
+from store.db.indexes import NAME_COLLATION, ensure_indexes
+from store.db.memory import MemoryClient
+
+
+@pytest.fixture
+def database():
+    return MemoryClient().get_database("test")
+
+
+@pytest_asyncio.fixture
+async def products(database):
+    await ensure_indexes(database)
+    return database.get_collection("products")
+
+
+def _product(number: int, **fields) -> dict:
+    return {
+        "id": uuid4(),
+        "name": f"Product {number:03d}",
+        "quantity": number,
+        "price": Decimal(number) / 10,
+        "status": number % 2 == 0,
+        "created_at": datetime(2023, 1, 1, tzinfo=timezone.utc)
+        + timedelta(minutes=number // 2),
+        **fields,
+    }
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_should_store_like_the_driver(products):
+    naive = datetime(2023, 1, 1, 12, 0, 0, 123456)
+    document = _product(1, price=Decimal128("8.500"), created_at=naive)
+
+    await products.insert_one(document)
+    stored = await products.find_one({"id": document["id"]}, {"_id": False})
+
+    assert "_id" in document
+    assert stored["price"] == Decimal("8.500")
+    assert isinstance(stored["price"], Decimal)
+    assert stored["created_at"] == datetime(
+        2023, 1, 1, 12, 0, 0, 123000, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_should_follow_query_semantics(products):
+    await products.insert_many(
+        [_product(1), _product(2), _product(3, price=None), {"name": "legacy"}]
+    )
+
+    async def names(filter: dict) -> list:
+        cursor = products.find(filter).sort("name")
+        return [item["name"] for item in await cursor.to_list(None)]
+
+    assert await names({"price": {"$gte": Decimal("0.2")}}) == ["Product 002"]
+    assert await names({"price": None}) == ["Product 003", "legacy"]
+    assert await names({"quantity": {"$in": [1, 3]}, "status": False}) == [
+        "Product 001",
+        "Product 003",
+    ]
+    assert await names({"name": {"$regex": "^Product 00[12]"}}) == [
+        "Product 001",
+        "Product 002",
+    ]
+    assert await names({"quantity": {"$exists": False}}) == ["legacy"]
+    assert await names({"$or": [{"quantity": 2}, {"name": {"$type": "string"}}]}) == [
+        "Product 001",
+        "Product 002",
+        "Product 003",
+        "legacy",
+    ]
+    # Operadores fora do subconjunto implementado falham em vez de não casar
+    with pytest.raises(OperationFailure):
+        await names({"$nor": [{"quantity": 1}]})
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_should_enforce_unique_indexes(products):
+    document = _product(1)
+    await products.insert_one(dict(document))
+
+    with pytest.raises(DuplicateKeyError):
+        await products.insert_one({**document, "_id": None})
+    with pytest.raises(BulkWriteError) as exc:
+        await products.insert_many(
+            [_product(2), {**document, "_id": None}, _product(3)], ordered=False
+        )
+
+    assert [error["index"] for error in exc.value.details["writeErrors"]] == [1]
+    assert exc.value.details["nInserted"] == 2
+    assert await products.count_documents({}) == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_should_update_and_report_not_found(products):
+    document = _product(1)
+    await products.insert_one(document)
+
+    updated = await products.find_one_and_update(
+        {"id": document["id"]},
+        {
+            "$inc": {"quantity": 4},
+            "$set": {"name": "New"},
+            "$currentDate": {"at": True},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    missing = await products.find_one_and_update(
+        {"id": uuid4()}, {"$set": {"name": "x"}}
+    )
+    result = await products.bulk_write(
+        [UpdateOne({"id": document["id"]}, {"$set": {"quantity": 0}})]
+    )
+    deleted = await products.delete_one({"id": uuid4()})
+
+    assert updated["quantity"] == 5
+    assert updated["name"] == "New"
+    assert updated["at"].tzinfo is not None
+    assert missing is None
+    assert result.matched_count == 1
+    assert deleted.deleted_count == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_indexed_reads_should_match_full_scans(
+    database, products
+):
+    documents = [_product(number) for number in range(200)]
+    await products.insert_many([dict(document) for document in documents])
+    unindexed = database.get_collection("unindexed")
+    await unindexed.insert_many([dict(document) for document in documents])
+
+    for direction in (1, -1):
+        sort = [("created_at", direction), ("id", direction)]
+        middle = sorted(documents, key=lambda item: (item["created_at"], item["id"]))
+        values = [middle[100]["created_at"], middle[100]["id"]]
+        filter = {"$and": [{"status": True}, keyset_filter(sort, values)]}
+
+        expected = await unindexed.find(filter).sort(sort).limit(20).to_list(None)
+        result = await products.find(filter).sort(sort).limit(20).to_list(None)
+
+        assert [item["id"] for item in result] == [item["id"] for item in expected]
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_should_search_text_and_collation(database, products):
+    await products.insert_many(
+        [_product(1, name="Café Pilão"), _product(2, name="cafeteira café café")]
+    )
+
+    text = (
+        await products.find(
+            {"$text": {"$search": "cafe"}}, {"score": {"$meta": "textScore"}}
+        )
+        .sort([("score", {"$meta": "textScore"})])
+        .to_list(None)
+    )
+    prefix = (
+        await products.find({"name": {"$gte": "CAFE", "$lt": "CAFE\uffff"}})
+        .collation(NAME_COLLATION)
+        .sort([("name", 1), ("id", 1)])
+        .to_list(None)
+    )
+
+    assert [item["name"] for item in text] == ["cafeteira café café", "Café Pilão"]
+    assert [item["name"] for item in prefix] == ["Café Pilão", "cafeteira café café"]
+    with pytest.raises(OperationFailure):
+        await database["other"].find({"$text": {"$search": "cafe"}}).to_list(None)
+
+
+@pytest.mark.asyncio
+async def test_memory_collection_should_aggregate(products):
+    await products.insert_many([_product(1), _product(2), _product(20)])
+
+    result = await products.aggregate(
+        [
+            {
+                "$facet": {
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "value": {
+                                    "$sum": {"$multiply": ["$quantity", "$price"]}
+                                },
+                                "avg": {"$avg": "$price"},
+                            }
+                        }
+                    ],
+                    "buckets": [
+                        {
+                            "$bucket": {
+                                "groupBy": "$price",
+                                "boundaries": [Decimal(0), Decimal(1)],
+                                "default": Decimal(1),
+                            }
+                        }
+                    ],
+                }
+            }
+        ]
+    ).to_list(1)
+
+    assert result[0]["totals"] == [
+        {
+            "_id": None,
+            "value": Decimal("40.5"),
+            "avg": Decimal("0.7666666666666666666666666667"),
+        }
+    ]
+    assert result[0]["buckets"] == [
+        {"_id": Decimal(0), "count": 2},
+        {"_id": Decimal(1), "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_memory_database_should_not_support_change_streams(database):
+    stream = database.watch([])
+
+    with pytest.raises(OperationFailure) as exc:
+        await stream.try_next()
+
+    assert exc.value.code == 40573
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from bson import Decimal128
+
+from store.db.migrations import convert_document, migrate_products
+
+
+def test_convert_document_should_return_native_types():
+    document = {
+        "_id": 1,
+        "id": "fce6cc37-10b9-4a8e-a8b2-977df327001a",
+        "name": "Iphone 14 pro Max",
+        "price": Decimal128("8.500"),
+        "created_at": "2023-01-01T00:00:00+00:00",
+        "updated_at": datetime(2023, 1, 2, tzinfo=timezone.utc),
+    }
+
+    assert convert_document(document) == {
+        "id": UUID("fce6cc37-10b9-4a8e-a8b2-977df327001a"),
+        "created_at": datetime(2023, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+def test_convert_document_should_convert_legacy_price():
+    assert convert_document({"price": "8.500"}) == {"price": Decimal("8.500")}
+
+
+@pytest.mark.asyncio
+async def test_migrate_products_should_convert_legacy_documents(
+    isolated_product_usecase,
+):
+    collection = isolated_product_usecase.collection
+    legacy_id = "4fd7cd35-a3a0-4c1f-a78d-d24aa81e7dca"
+    for id in (legacy_id, UUID(legacy_id)):
+        await collection.delete_one({"id": id})
+    await collection.insert_one(
+        {
+            "id": legacy_id,
+            "name": "Iphone 14 pro Max",
+            "quantity": 10,
+            "price": Decimal128("8.500"),
+            "status": True,
+            "created_at": "2023-01-01T00:00:00+00:00",
+            "updated_at": "2023-01-01T00:00:00+00:00",
+        }
+    )
+
+    migrated = await migrate_products(collection, batch_size=2)
+    product = await isolated_product_usecase.get(id=UUID(legacy_id))
+
+    assert migrated >= 1
+    assert product.created_at == datetime(2023, 1, 1, tzinfo=timezone.utc)
+    assert await migrate_products(collection) == 0
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+from store.core.config import settings
+from store.db.memory import MemoryClient
+from store.db.mongo import MongoClient, client_options
+from store.db.monitoring import PoolStats
+
+
+def test_client_options_should_use_settings(monkeypatch):
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", 50)
+    monkeypatch.setattr(settings, "MONGO_MAX_IDLE_TIME_MS", 60000)
+    monkeypatch.setattr(settings, "MONGO_COMPRESSORS", "zstd,zlib")
+
+    options = client_options()
+
+    assert options["maxPoolSize"] == 50
+    assert options["maxIdleTimeMS"] == 60000
+    assert options["compressors"] == "zstd,zlib"
+    assert "socketTimeoutMS" not in options
+
+
+def test_mongo_client_should_connect_and_close(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "mongo")
+    mongo = MongoClient()
+
+    client = mongo.connect()
+
+    assert mongo.connect() is client
+    assert client.options.pool_options.max_pool_size == settings.MONGO_MAX_POOL_SIZE
+
+    mongo.close()
+
+    assert mongo.client is None
+
+
+def test_mongo_client_should_use_memory_backend(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "memory")
+    mongo = MongoClient()
+
+    database = mongo.get_database()
+
+    assert isinstance(mongo.client, MemoryClient)
+    assert database.name == "store"
+    assert mongo.get_database() is database
+
+
+def test_pool_stats_should_count_checkouts():
+    stats = PoolStats()
+
+    stats.connection_created(MagicMock())
+    stats.connection_check_out_started(MagicMock())
+    stats.connection_checked_out(MagicMock(duration=0.002))
+    stats.connection_check_out_started(MagicMock())
+    stats.connection_checked_out(MagicMock(duration=0.004))
+    stats.connection_checked_in(MagicMock())
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["connections_open"] == 1
+    assert snapshot["connections_in_use"] == 1
+    assert snapshot["connections_in_use_max"] == 2
+    assert snapshot["checkouts"] == 2
+    assert snapshot["waiting"] == 0
+    assert snapshot["checkout_wait_ms_avg"] == 3.0
+    assert snapshot["checkout_wait_ms_max"] == 4.0
@@ -14,3 +14,16 @@ def products_data():
         {"name": "Iphone 10 pro Max", "quantity": 10, "price": "4.500", "status": True},
         {"name": "Iphone 9 pro Max", "quantity": 10, "price": "3.500", "status": True},
     ]
+
+
+def products_factory(count, start=0):
+    """Gera ``count`` produtos determinísticos (para seeds grandes e benchmarks)."""
+    return [
+        {
+            "name": f"Product {index:07d}",
+            "quantity": 1 + index % 100,
+            "price": f"{1 + index % 1000}.{index % 100:02d}",
+            "status": index % 5 != 0,
+        }
+        for index in range(start, start + count)
+    ]
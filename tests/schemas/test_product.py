@@ -25,3 +25,35 @@ def test_schemas_return_raise():
         "input": {"name": "Iphone 14 Pro Max", "quantity": 10, "price": 8.5},
         "url": "https://errors.pydantic.dev/2.11/v/missing",
     }
+
+
+def test_schemas_update_out_should_serialize_price():
+    from datetime import datetime, timezone
+    from decimal import Decimal
+    from uuid import uuid4
+    from store.core.schemas.product import ProductUpdateOut
+
+    product = ProductUpdateOut(
+        id=uuid4(),
+        quantity=10,
+        price=Decimal("7.500"),
+        status=True,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+    assert product.model_dump(mode="json")["price"] == "7.500"
+
+
+def test_schemas_update_should_keep_price_as_decimal():
+    import warnings
+    from decimal import Decimal
+    from store.core.schemas.product import ProductUpdate
+
+    # O DecimalCodec converte para Decimal128 só na escrita
+    update = ProductUpdate(price="7.500")
+
+    assert update.price == Decimal("7.500")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert update.model_dump_json(exclude_none=True) == '{"price":"7.500"}'
@@ -0,0 +1,78 @@
+import os
+
+import uvicorn
+
+from store import server
+from store.core.config import settings
+
+
+def test_server_should_size_workers_and_fall_back_to_stdlib_loop(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "mongo")
+    monkeypatch.setattr(server, "find_spec", lambda name: None)
+
+    config = server.build_config(server.parse_args([]))
+
+    assert config["workers"] == server.default_workers()
+    assert config["loop"] == "asyncio"
+    assert config["http"] == "h11"
+    assert config["lifespan"] == "on"
+    assert (
+        config["timeout_graceful_shutdown"] == settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
+    )
+
+
+def test_server_should_prefer_uvloop_and_httptools_when_installed(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "mongo")
+    monkeypatch.setattr(server, "find_spec", lambda name: object())
+
+    args = server.parse_args(["--workers", "3", "--graceful-timeout", "5"])
+    config = server.build_config(args)
+
+    assert config["workers"] == 3
+    assert config["loop"] == "uvloop"
+    assert config["http"] == "httptools"
+    assert config["timeout_graceful_shutdown"] == 5
+
+
+def test_server_should_run_memory_backend_in_a_single_preloaded_worker(monkeypatch):
+    from store.main import app
+
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "memory")
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda target, **config: calls.append(target))
+
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    server.main(["--workers", "4"])
+    assert "METRICS_WORKER_LABEL" not in os.environ
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "mongo")
+    server.main(["--workers", "4"])
+
+    assert calls == [app, server.APP]
+    assert os.environ["METRICS_WORKER_LABEL"] == "true"
+
+
+def test_server_should_disable_process_local_product_cache_with_many_workers(
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+
+    assert server.worker_environment(1) == {}
+    assert server.worker_environment(2) == {
+        "METRICS_WORKER_LABEL": "true",
+        "CACHE_PRODUCTS_ENABLED": "false",
+    }
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    assert "CACHE_PRODUCTS_ENABLED" not in server.worker_environment(2)
+
+
+def test_app_should_keep_stats_cache_without_product_cache(monkeypatch):
+    from fastapi.testclient import TestClient
+    from store.main import app
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "CACHE_PRODUCTS_ENABLED", False)
+
+    with TestClient(app):
+        assert app.state.product_cache is None
+        assert app.state.stats_cache is not None
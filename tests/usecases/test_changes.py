@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from store.core.config import settings
+from store.core.exceptions import InvalidCursorException
+from store.core.schemas.product import ProductUpdate
+from store.core.pagination import encode_cursor
+from store.usecases.changes import POLL_KEY, ProductChangeFeed
+
+
+@pytest.fixture
+def change_feed(isolated_product_usecase, monkeypatch):
+    # Sem atraso de leitura: as escritas do teste aparecem no próximo poll
+    monkeypatch.setattr(settings, "CHANGES_POLL_LAG_SECONDS", 0)
+    monkeypatch.setattr(settings, "CHANGES_POLL_INTERVAL_SECONDS", 0.01)
+    return ProductChangeFeed(
+        collection=isolated_product_usecase.collection,
+        tombstones=isolated_product_usecase.tombstones,
+        backend="polling",
+    )
+
+
+@pytest.mark.asyncio
+async def test_change_feed_should_poll_creates_updates_and_deletes(
+    change_feed, isolated_product_usecase, products_in
+):
+    start = await change_feed.read(since=None, limit=10, timeout=0)
+
+    first = await isolated_product_usecase.create(body=products_in[0])
+    await asyncio.sleep(0.002)
+    second = await isolated_product_usecase.create(body=products_in[1])
+    await asyncio.sleep(0.002)
+    third = await isolated_product_usecase.create(body=products_in[2])
+    await asyncio.sleep(0.002)
+    await isolated_product_usecase.update(id=second.id, body=ProductUpdate(quantity=1))
+    await asyncio.sleep(0.002)
+    await isolated_product_usecase.delete(id=first.id)
+    await asyncio.sleep(0.002)
+
+    page = await change_feed.read(since=start.next, limit=10, timeout=1)
+
+    assert [(change.op, change.id) for change in page.changes] == [
+        ("create", third.id),
+        ("update", second.id),
+        ("delete", first.id),
+    ]
+    assert page.changes[1].product.quantity == 1
+    assert page.next == page.changes[-1].token
+
+    resumed = await change_feed.read(since=page.changes[0].token, limit=10, timeout=0)
+
+    assert [change.id for change in resumed.changes] == [second.id, first.id]
+
+
+@pytest.mark.asyncio
+async def test_change_feed_should_reject_foreign_tokens(change_feed):
+    with pytest.raises(InvalidCursorException):
+        change_feed.parse("not-a-token")
+
+    # Token de polling com um operador no lugar de updated_at
+    token = encode_cursor(POLL_KEY, [{"$gt": None}, {"$gt": None}])
+    with pytest.raises(InvalidCursorException):
+        change_feed.parse(token)
+
+
+def test_change_feed_should_map_change_stream_events(product_id):
+    from datetime import datetime, timezone
+    from decimal import Decimal
+    from unittest.mock import MagicMock
+
+    collection, tombstones = MagicMock(), MagicMock()
+    collection.name, tombstones.name = "products", "product_tombstones"
+    feed = ProductChangeFeed(collection=collection, tombstones=tombstones)
+    now = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    product = {
+        "_id": "oid",
+        "id": product_id,
+        "name": "Iphone 14 pro Max",
+        "quantity": 10,
+        "price": Decimal("8.500"),
+        "status": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+    created = feed._from_event(
+        {
+            "operationType": "insert",
+            "ns": {"coll": "products"},
+            "fullDocument": product,
+        },
+        "token",
+    )
+    deleted = feed._from_event(
+        {
+            "operationType": "insert",
+            "ns": {"coll": "product_tombstones"},
+            "fullDocument": {"id": product_id, "updated_at": now},
+        },
+        "token",
+    )
+    vanished = feed._from_event(
+        {"operationType": "update", "ns": {"coll": "products"}, "fullDocument": None},
+        "token",
+    )
+
+    assert (created.op, created.id, created.product.name) == (
+        "create",
+        product_id,
+        "Iphone 14 pro Max",
+    )
+    assert (deleted.op, deleted.id, deleted.product) == ("delete", product_id, None)
+    assert vanished is None
@@ -2,17 +2,25 @@ from typing import List
 import pytest
 from uuid import UUID
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient
 
-from store.core.exceptions import NotFoundException
-from store.core.schemas.product import ProductOut, ProductUpdateOut
-from store.core.config import settings
+from store.core.exceptions import InvalidCursorException, NotFoundException
+from store.core.schemas.product import (
+    BulkResult,
+    ProductBulkUpdate,
+    ProductOut,
+    ProductPage,
+    ProductQuery,
+    ProductUpdate,
+    ProductUpdateOut,
+)
+from store.db.mongo import MongoClient
 
 
 class ProductUseCaseForTesting:
     def __init__(self) -> None:
-        # Criar um cliente MongoDB completamente novo para cada instância
-        self.client = AsyncIOMotorClient(settings.MONGO_URL)
+        # Criar um cliente completamente novo para cada instância, no backend
+        # de DATABASE_BACKEND
+        self.client = MongoClient()
         self.database = self.client.get_database()
         self.collection = self.database.get_collection("products")
 
@@ -22,29 +30,16 @@ class ProductUseCaseForTesting:
 
         product_model = ProductModel(**body.model_dump())
 
-        # Converter UUID para string e datetime para isoformat para salvar no MongoDB
-        product_data = product_model.model_dump()
-        product_data["id"] = str(product_data["id"])
-        product_data["created_at"] = product_data["created_at"].isoformat()
-        product_data["updated_at"] = product_data["updated_at"].isoformat()
-
-        await self.collection.insert_one(product_data)
+        # UUID, datetime e Decimal são gravados como tipos BSON nativos
+        await self.collection.insert_one(product_model.model_dump())
         return ProductOut(**product_model.model_dump())
 
     async def get(self, id: UUID):
-        from datetime import datetime
-
-        # Buscar pelo campo "id" (não "_id") e converter UUID para string
-        result = await self.collection.find_one({"id": str(id)})
+        result = await self.collection.find_one({"id": id})
 
         if not result:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        # Converter de volta os tipos corretos
-        result["id"] = UUID(result["id"])
-        result["created_at"] = datetime.fromisoformat(result["created_at"])
-        result["updated_at"] = datetime.fromisoformat(result["updated_at"])
-
         # Remover o _id do MongoDB se existir
         result.pop("_id", None)
 
@@ -53,13 +48,9 @@ class ProductUseCaseForTesting:
     async def query(self):
         result = await self.collection.find().to_list(length=100)
 
-        # Converter de volta os tipos corretos para cada item
         converted_result = []
         for item in result:
             if "id" in item:
-                item["id"] = UUID(item["id"])
-                item["created_at"] = datetime.fromisoformat(item["created_at"])
-                item["updated_at"] = datetime.fromisoformat(item["updated_at"])
                 item.pop("_id", None)
                 converted_result.append(ProductOut(**item))
 
@@ -70,11 +61,9 @@ class ProductUseCaseForTesting:
 
         # Preparar os dados para atualização
         update_data = body.model_dump(exclude_none=True)
-        if "updated_at" in update_data:
-            update_data["updated_at"] = update_data["updated_at"].isoformat()
 
         result = await self.collection.find_one_and_update(
-            filter={"id": str(id)},
+            filter={"id": id},
             update={"$set": update_data},
             return_document=pymongo.ReturnDocument.AFTER,
         )
@@ -82,10 +71,6 @@ class ProductUseCaseForTesting:
         if not result:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        # Converter de volta os tipos corretos
-        result["id"] = UUID(result["id"])
-        result["created_at"] = datetime.fromisoformat(result["created_at"])
-        result["updated_at"] = datetime.fromisoformat(result["updated_at"])
         result.pop("_id", None)
 
         return ProductUpdateOut(**result)
@@ -139,7 +124,110 @@ async def test_usecases_get_should_not_found(product_id, isolated_product_usecas
 async def test_usecases_query_should_return_success(isolated_product_usecase):
     result = await isolated_product_usecase.query()
 
-    assert isinstance(result, List)
+    assert isinstance(result, ProductPage)
+    assert isinstance(result.items, List)
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_should_paginate_with_cursor(
+    products_inserted, isolated_product_usecase
+):
+    seen = []
+    page = await isolated_product_usecase.query(params=ProductQuery(limit=2))
+    while True:
+        assert len(page.items) <= 2
+        seen.extend(product.id for product in page.items)
+        if not page.next:
+            break
+        page = await isolated_product_usecase.query(
+            params=ProductQuery(limit=2, cursor=page.next)
+        )
+
+    assert len(seen) == len(set(seen))
+    assert {product.id for product in products_inserted} <= set(seen)
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_should_raise_for_invalid_cursor(
+    isolated_product_usecase,
+):
+    with pytest.raises(InvalidCursorException):
+        await isolated_product_usecase.query(params=ProductQuery(cursor="not-a-cursor"))
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_should_filter_sort_and_project(
+    products_inserted, isolated_product_usecase
+):
+    params = ProductQuery(
+        min_price="4.000",
+        max_price="7.000",
+        name_prefix="Iphone 1",
+        sort="price",
+        order="desc",
+        fields=["name"],
+    )
+
+    result = await isolated_product_usecase.query(params=params)
+
+    names = [product.name for product in result.items]
+    inserted = {product.id for product in products_inserted}
+
+    assert {product.id for product in result.items} & inserted
+    assert "Iphone 9 pro Max" not in names
+    assert names.index("Iphone 12 pro Max") < names.index("Iphone 10 pro Max")
+    assert all(product.price is None for product in result.items)
+
+
+@pytest.mark.asyncio
+async def test_usecases_search_should_rank_text_matches(
+    products_inserted, isolated_product_usecase
+):
+    from store.core.schemas.product import ProductSearch
+
+    result = await isolated_product_usecase.search(
+        params=ProductSearch(q="iphone 12", mode="text")
+    )
+
+    assert result[0].name == "Iphone 12 pro Max"
+    assert all(isinstance(product, ProductOut) for product in result)
+
+
+@pytest.mark.asyncio
+async def test_usecases_search_should_match_prefix_ignoring_case(
+    products_inserted, isolated_product_usecase
+):
+    from store.core.schemas.product import ProductSearch
+
+    result = await isolated_product_usecase.search(
+        params=ProductSearch(q="IPHONE 1", mode="prefix", limit=10)
+    )
+
+    names = [product.name for product in result]
+    assert "Iphone 12 pro Max" in names
+    assert "Iphone 9 pro Max" not in names
+    assert names == sorted(names)
+
+
+@pytest.mark.asyncio
+async def test_usecases_stats_should_aggregate_in_database(
+    products_inserted, isolated_product_usecase
+):
+    from decimal import Decimal
+    from store.core.cache import MemoryCache
+
+    isolated_product_usecase.stats_cache = MemoryCache(ttl=60, max_entries=1)
+
+    stats = await isolated_product_usecase.stats()
+
+    assert stats.count >= len(products_inserted)
+    assert stats.stock_value >= sum(
+        product.quantity * product.price for product in products_inserted
+    )
+    assert isinstance(stats.stock_value, Decimal)
+    assert sum(item.count for item in stats.by_status) == stats.count
+    assert sum(bucket.count for bucket in stats.price_buckets) == stats.count
+    assert await isolated_product_usecase.stats() is stats
 
 
 @pytest.mark.asyncio
@@ -155,6 +243,138 @@ async def test_usecases_update_should_return_success(
     )
 
     assert isinstance(result, ProductUpdateOut)
+    assert result.updated_at >= product_inserted.updated_at
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_should_reject_stale_version(
+    product_inserted, isolated_product_usecase
+):
+    from store.core.exceptions import VersionConflictException
+
+    # Duas escritas concorrentes a partir da mesma leitura: só uma vence
+    version = product_inserted.version
+    first = await isolated_product_usecase.update(
+        id=product_inserted.id, body=ProductUpdate(quantity=3), versions=[version]
+    )
+
+    with pytest.raises(VersionConflictException):
+        await isolated_product_usecase.update(
+            id=product_inserted.id, body=ProductUpdate(quantity=4), versions=[version]
+        )
+
+    product = await isolated_product_usecase.get(id=product_inserted.id)
+
+    assert first.version == version + 1
+    assert product.quantity == 3
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_should_reject_empty_body(
+    product_inserted, isolated_product_usecase
+):
+    from store.core.exceptions import EmptyUpdateException
+
+    with pytest.raises(EmptyUpdateException):
+        await isolated_product_usecase.update(
+            id=product_inserted.id, body=ProductUpdate()
+        )
+
+    product = await isolated_product_usecase.get(id=product_inserted.id)
+
+    assert product.version == product_inserted.version
+    assert product.updated_at == product_inserted.updated_at
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_should_filter_by_updated_since(
+    products_inserted, product_update, isolated_product_usecase
+):
+    updated = await isolated_product_usecase.update(
+        id=products_inserted[0].id, body=ProductUpdate(quantity=3)
+    )
+
+    result = await isolated_product_usecase.query(
+        params=ProductQuery(updated_since=updated.updated_at, sort="updated_at")
+    )
+
+    ids = [product.id for product in result.items]
+    assert updated.id in ids
+    assert not set(ids) & {product.id for product in products_inserted[1:]}
+    assert updated.updated_at > products_inserted[0].updated_at
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_etag_should_change_after_update(
+    product_inserted, product_update, isolated_product_usecase
+):
+    from store.core.schemas.product import ProductQuery
+
+    params = ProductQuery(fields=["name"])
+    before = await isolated_product_usecase.query(params=params)
+    again = await isolated_product_usecase.query(params=params)
+
+    product_update.quantity = 99
+    await isolated_product_usecase.update(id=product_inserted.id, body=product_update)
+    after = await isolated_product_usecase.query(params=params)
+
+    assert before.etag == again.etag
+    assert before.etag != after.etag
+
+
+@pytest.mark.asyncio
+async def test_usecases_adjust_stock_should_never_go_negative(
+    product_inserted, isolated_product_usecase
+):
+    import asyncio
+    from store.core.exceptions import InsufficientStockException
+
+    # 10 em estoque e 15 pedidos simultâneos de uma unidade
+    results = await asyncio.gather(
+        *(
+            isolated_product_usecase.adjust_stock(id=product_inserted.id, delta=-1)
+            for _ in range(15)
+        ),
+        return_exceptions=True,
+    )
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    product = await isolated_product_usecase.get(id=product_inserted.id)
+
+    assert len(failures) == 5
+    assert all(isinstance(exc, InsufficientStockException) for exc in failures)
+    assert product.quantity == 0
+
+
+@pytest.mark.asyncio
+async def test_usecases_adjust_stock_many_should_report_each_item(
+    product_inserted, product_id, isolated_product_usecase
+):
+    from store.core.schemas.product import ProductStockAdjustment
+
+    result = await isolated_product_usecase.adjust_stock_many(
+        adjustments=[
+            ProductStockAdjustment(id=product_inserted.id, delta=5),
+            ProductStockAdjustment(id=product_inserted.id, delta=-100),
+            ProductStockAdjustment(id=product_id, delta=-1),
+        ]
+    )
+    product = await isolated_product_usecase.get(id=product_inserted.id)
+
+    assert [item.status for item in result.items] == [
+        "updated",
+        "insufficient_stock",
+        "not_found",
+    ]
+    assert product.quantity == product_inserted.quantity + 5
+
+
+@pytest.mark.asyncio
+async def test_usecases_adjust_stock_should_not_found(
+    product_id, isolated_product_usecase
+):
+    with pytest.raises(NotFoundException):
+        await isolated_product_usecase.adjust_stock(id=product_id, delta=1)
 
 
 @pytest.mark.asyncio
@@ -172,3 +392,279 @@ async def test_usecases_delete_should_not_found(product_id, isolated_product_use
         await isolated_product_usecase.delete(id=product_id)
 
     assert err.value.message == f"Product not found with filter: {product_id}"
+
+
+@pytest.mark.asyncio
+async def test_usecases_export_should_return_batches(
+    products_inserted, isolated_product_usecase
+):
+    exported = []
+    async for batch in isolated_product_usecase.export(batch_size=2):
+        assert len(batch) <= 2
+        exported.extend(product.id for product in batch)
+
+    assert {product.id for product in products_inserted} <= set(exported)
+
+
+@pytest.mark.asyncio
+async def test_usecases_bulk_create_should_return_success(
+    products_in, isolated_product_usecase
+):
+    result = await isolated_product_usecase.bulk_create(bodies=products_in)
+
+    assert isinstance(result, BulkResult)
+    assert [item.status for item in result.items] == ["created"] * len(products_in)
+
+    product = await isolated_product_usecase.get(id=result.items[0].id)
+    assert product.name == products_in[0].name
+
+
+@pytest.mark.asyncio
+async def test_usecases_bulk_update_should_report_not_found(
+    product_inserted, product_id, isolated_product_usecase
+):
+    result = await isolated_product_usecase.bulk_update(
+        bodies=[
+            ProductBulkUpdate(id=product_inserted.id, quantity=42),
+            ProductBulkUpdate(id=product_id, quantity=42),
+        ]
+    )
+
+    assert [item.status for item in result.items] == ["updated", "not_found"]
+
+    product = await isolated_product_usecase.get(id=product_inserted.id)
+    assert product.quantity == 42
+
+
+@pytest.mark.asyncio
+async def test_usecases_bulk_update_should_trust_each_matched_count(product_id):
+    from unittest.mock import AsyncMock, MagicMock
+    from uuid import uuid4
+    from pymongo.errors import WriteError
+    from store.usecases.product import ProductUseCase
+
+    other, invalid = uuid4(), uuid4()
+    collection = MagicMock()
+    # O outro id foi apagado por um lote concorrente entre o pedido e a escrita
+    collection.update_one = AsyncMock(
+        side_effect=[
+            MagicMock(matched_count=1),
+            MagicMock(matched_count=0),
+            WriteError("rejected", 121, {"errmsg": "Document failed validation"}),
+        ]
+    )
+    usecase = ProductUseCase(collection=collection)
+
+    result = await usecase.bulk_update(
+        bodies=[
+            ProductBulkUpdate(id=product_id, quantity=1),
+            ProductBulkUpdate(id=other, quantity=1),
+            ProductBulkUpdate(id=invalid, quantity=1),
+            ProductBulkUpdate(id=product_id),
+        ]
+    )
+
+    assert [(item.status, item.detail) for item in result.items] == [
+        ("updated", None),
+        ("not_found", None),
+        ("error", "Document failed validation"),
+        ("error", "No fields to update"),
+    ]
+    assert collection.update_one.await_count == 3
+    collection.find.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_usecases_bulk_delete_should_report_not_found(
+    product_inserted, product_id, isolated_product_usecase
+):
+    result = await isolated_product_usecase.bulk_delete(
+        ids=[product_inserted.id, product_id]
+    )
+
+    assert [item.status for item in result.items] == ["deleted", "not_found"]
+
+    with pytest.raises(NotFoundException):
+        await isolated_product_usecase.get(id=product_inserted.id)
+
+
+@pytest.mark.asyncio
+async def test_usecases_bulk_delete_should_trust_each_deleted_count(product_id):
+    from unittest.mock import AsyncMock, MagicMock
+    from uuid import uuid4
+    from store.usecases.product import ProductUseCase
+
+    other = uuid4()
+    collection, tombstones = MagicMock(), MagicMock()
+    # O outro id foi apagado por um lote concorrente entre o pedido e a escrita
+    collection.delete_one = AsyncMock(
+        side_effect=[MagicMock(deleted_count=1), MagicMock(deleted_count=0)]
+    )
+    tombstones.insert_many = AsyncMock()
+    usecase = ProductUseCase(collection=collection, tombstones=tombstones)
+
+    result = await usecase.bulk_delete(ids=[product_id, other, product_id])
+
+    assert [item.status for item in result.items] == [
+        "deleted",
+        "not_found",
+        "deleted",
+    ]
+    assert collection.delete_one.await_count == 2
+    collection.find.assert_not_called()
+    documents = tombstones.insert_many.await_args.args[0]
+    assert [document["id"] for document in documents] == [product_id]
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_use_cache_and_invalidate_on_update(
+    product_inserted, isolated_product_usecase
+):
+    from store.core.cache import MemoryCache
+    from store.core.schemas.product import ProductUpdate
+
+    isolated_product_usecase.cache = MemoryCache(ttl=60, max_entries=10)
+
+    first = await isolated_product_usecase.get(id=product_inserted.id)
+    second = await isolated_product_usecase.get(id=product_inserted.id)
+
+    assert second is first
+    assert isolated_product_usecase.cache.stats.hits == 1
+
+    await isolated_product_usecase.update(
+        id=product_inserted.id, body=ProductUpdate(quantity=99)
+    )
+    result = await isolated_product_usecase.get(id=product_inserted.id)
+
+    assert result.quantity == 99
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_not_cache_a_read_started_before_a_write(
+    product_inserted, isolated_product_usecase
+):
+    import asyncio
+    from unittest.mock import patch
+
+    from store.core.cache import MemoryCache
+
+    usecase = isolated_product_usecase
+    usecase.cache = MemoryCache(ttl=60, max_entries=10)
+    find = usecase.collection.find
+    read, write = asyncio.Event(), asyncio.Event()
+
+    class SlowCursor:
+        # A leitura termina no banco antes da escrita, mas só volta depois
+        def __init__(self, cursor):
+            self.cursor = cursor
+
+        async def to_list(self, length):
+            items = await self.cursor.to_list(length=length)
+            read.set()
+            await write.wait()
+            return items
+
+    with patch.object(
+        usecase.collection, "find", side_effect=lambda *args: SlowCursor(find(*args))
+    ):
+        stale = asyncio.ensure_future(usecase.get(id=product_inserted.id))
+        await read.wait()
+        await usecase.update(id=product_inserted.id, body=ProductUpdate(quantity=99))
+        write.set()
+        assert (await stale).quantity == product_inserted.quantity
+
+    result = await usecase.get(id=product_inserted.id)
+
+    assert result.quantity == 99
+    assert result.version == 2
+
+
+@pytest.mark.asyncio
+async def test_usecases_lookup_should_keep_request_order(
+    products_inserted, product_id, isolated_product_usecase
+):
+    ids = [products_inserted[1].id, product_id, products_inserted[0].id]
+
+    result = await isolated_product_usecase.lookup(ids=ids)
+
+    assert [item.id for item in result.items] == ids
+    assert [item.status for item in result.items] == ["found", "not_found", "found"]
+    assert result.items[0].product.name == products_inserted[1].name
+    assert result.items[1].product is None
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_coalesce_concurrent_calls(
+    products_inserted, isolated_product_usecase
+):
+    import asyncio
+    from unittest.mock import patch
+
+    find = isolated_product_usecase.collection.find
+    ids = [product.id for product in products_inserted]
+
+    with patch.object(
+        isolated_product_usecase.collection, "find", side_effect=find
+    ) as spy:
+        products = await asyncio.gather(
+            *(isolated_product_usecase.get(id=id) for id in ids + ids)
+        )
+
+    assert [product.id for product in products] == ids + ids
+    assert spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_should_share_identical_concurrent_calls(
+    products_inserted, isolated_product_usecase
+):
+    import asyncio
+    from unittest.mock import patch
+
+    find = isolated_product_usecase.collection.find
+
+    with patch.object(
+        isolated_product_usecase.collection, "find", side_effect=find
+    ) as spy:
+        pages = await asyncio.gather(
+            *(isolated_product_usecase.query(params=ProductQuery()) for _ in range(5)),
+            isolated_product_usecase.query(params=ProductQuery(status=False)),
+        )
+
+    assert all(page is pages[0] for page in pages[:5])
+    assert pages[5] is not pages[0]
+    assert spy.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_not_share_reads_started_before_a_write(
+    product_inserted, isolated_product_usecase
+):
+    import asyncio
+
+    # Leitura em andamento quando a escrita termina
+    stale = asyncio.ensure_future(isolated_product_usecase.get(id=product_inserted.id))
+    await asyncio.sleep(0)
+    await isolated_product_usecase.update(
+        id=product_inserted.id, body=ProductUpdate(quantity=42)
+    )
+    fresh = await isolated_product_usecase.get(id=product_inserted.id)
+    await stale
+
+    assert fresh.quantity == 42
+
+
+@pytest.mark.asyncio
+async def test_usecases_delete_should_use_single_round_trip(product_id):
+    from unittest.mock import AsyncMock, MagicMock
+    from store.usecases.product import ProductUseCase
+
+    collection = MagicMock()
+    collection.delete_one = AsyncMock(return_value=MagicMock(deleted_count=0))
+    collection.find_one = AsyncMock()
+
+    with pytest.raises(NotFoundException):
+        await ProductUseCase(collection=collection).delete(id=product_id)
+
+    collection.delete_one.assert_awaited_once_with({"id": product_id})
+    collection.find_one.assert_not_awaited()